@@ -0,0 +1,498 @@
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from Classes import BulkImport
+from Classes.Course import Course
+from Classes.Database import page_rows, unique_columns
+from Classes.Person import Instructor, Student
+from Classes.Schema import initialize_database
+
+# ADDRESS THE SERVER LISTENS ON (only this machine by default: the kiosks run next to the database)
+HOST = '127.0.0.1'
+PORT = 8435
+
+# NUMBER OF CONNECTIONS SERVED AT THE SAME TIME; a kept-alive connection holds its worker until it
+# closes or stays idle for KEEP_ALIVE_TIMEOUT seconds. The server accepts no more connections than
+# it has free workers, so the other clients wait in the listen queue (of LISTEN_QUEUE connections)
+WORKERS = 16
+KEEP_ALIVE_TIMEOUT = 15
+LISTEN_QUEUE = 128
+
+# HOW LONG (IN SECONDS) THE SERVER WAITS FOR A FREE WORKER BEFORE CHECKING WHETHER IT MUST SHUT DOWN
+ACCEPT_POLL = 0.5
+
+# DEFAULT AND LARGEST NUMBER OF ROWS OF ONE PAGE OF A LISTING
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# LARGEST REQUEST BODY ACCEPTED, IN BYTES
+MAX_BODY = 16 * 1024 * 1024
+
+# THE COLLECTIONS BACKED BY A MODEL CLASS: the model, its key, the fields of a new row, the
+# function creating it, and the fields a PATCH can change
+RESOURCES = {
+    'students': {
+        'model': Student,
+        'key': 'studentID',
+        'fields': ('name', 'age', 'email', 'studentID'),
+        'create': Student.create_student,
+        'updates': ('name', 'age', 'email'),
+        'role': 'Student',
+    },
+    'instructors': {
+        'model': Instructor,
+        'key': 'instructorID',
+        'fields': ('name', 'age', 'email', 'instructorID'),
+        'create': Instructor.create_instructor,
+        'updates': ('name', 'age', 'email'),
+        'role': 'Instructor',
+    },
+    'courses': {
+        'model': Course,
+        'key': 'courseID',
+        'fields': ('courseID', 'courseName'),
+        'create': Course.create_course,
+        'updates': ('courseName', 'instructor'),
+    },
+}
+
+# ERRORS OF THE MODELS MEANING THAT A ROW WITH THE SAME ID OR EMAIL ALREADY EXISTS
+TAKEN = {*Student.TAKEN.values(), *Instructor.TAKEN.values(), *Course.TAKEN.values()}
+
+# THIS CLASS IS AN ERROR RETURNED TO THE CLIENT WITH ITS HTTP STATUS
+class ApiError(Exception):
+    """
+    Error answered to the client as `{"error": message}` with the given status.
+
+    Parameters:
+    ----------
+        status (HTTPStatus): The status of the response.
+        message (str): The message of the error.
+    """
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# THIS FUNCTION TURNS THE FOREIGN KEY ERROR OF A COURSE INTO A READABLE ERROR
+@contextmanager
+def _instructor_errors(kind):
+    try:
+        yield
+    except sqlite3.IntegrityError as e:
+        # the only foreign key of a course is its instructor
+        if kind == 'courses' and not unique_columns(e):
+            raise ApiError(HTTPStatus.NOT_FOUND, "Instructor email not found")
+        raise
+
+# THIS FUNCTION RETURNS ONE FIELD OF A JSON BODY
+def _field(body, name, default=KeyError):
+    if not isinstance(body, dict):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "The body must be a JSON object")
+    if name not in body:
+        if default is KeyError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Missing field {name}")
+        return default
+    return body[name]
+
+# THIS FUNCTION RETURNS ONE PARAMETER OF THE QUERY STRING
+def _param(query, name, default=None):
+    values = query.get(name)
+    return values[-1] if values else default
+
+# THIS FUNCTION READS THE PAGING PARAMETERS OF A LISTING
+def _paging(query, page_keys, default_order):
+    order_by = _param(query, 'order_by', default_order)
+    if order_by not in page_keys:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Cannot order by {order_by}")
+    try:
+        limit = min(int(_param(query, 'limit', PAGE_SIZE)), MAX_PAGE_SIZE)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid limit parameter")
+    if limit < 1:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid limit parameter")
+    # the key of the last row of the previous page, as the "next" of that page returned it: one
+    # number, string or null per ordering column
+    after = _param(query, 'after')
+    last_key = None
+    if after:
+        try:
+            last_key = json.loads(after)
+        except ValueError:
+            last_key = None
+        if (not isinstance(last_key, list) or len(last_key) != len(page_keys[order_by])
+                or not all(value is None or isinstance(value, (int, float, str)) for value in last_key)):
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid after parameter: expected the next key of a page ordered by {order_by}")
+        last_key = tuple(last_key)
+    descending = _param(query, 'descending', 'false').lower() in ('1', 'true', 'yes')
+    return last_key, limit, order_by, descending
+
+# THIS FUNCTION RETURNS A LISTING PAGE WITH THE KEY OF THE NEXT ONE
+def _page(items, next_key, limit):
+    # a page shorter than the limit is the last one
+    return {'items': items, 'next': list(next_key) if len(items) == limit else None}
+
+# THIS FUNCTION RETURNS THE ROW OF A MODEL OBJECT, OR A 404 ERROR
+def _get(kind, id):
+    item = RESOURCES[kind]['model'].get_by_id(id)
+    if item is None:
+        raise ApiError(HTTPStatus.NOT_FOUND, f"No {kind[:-1]} with ID {id}")
+    return item
+
+# --------------------------------------------------------------------------------------------------------
+# THE ENDPOINTS: each one takes the query string, the JSON body and the IDs of the path, and returns
+# the status and the JSON payload of the response
+
+# THIS FUNCTION LISTS ONE PAGE OF STUDENTS, INSTRUCTORS OR COURSES
+def list_items(kind, query, body):
+    resource = RESOURCES[kind]
+    model = resource['model']
+    last_key, limit, order_by, descending = _paging(query, model.PAGE_KEYS, resource['key'])
+    items = model.page_after(last_key, limit, order_by, descending)
+    next_key = model.page_key(items[-1], order_by) if items else ()
+    return HTTPStatus.OK, _page([item.as_row() for item in items], next_key, limit)
+
+# THIS FUNCTION CREATES A STUDENT, INSTRUCTOR OR COURSE
+def create_item(kind, query, body):
+    resource = RESOURCES[kind]
+    values = [_field(body, field) for field in resource['fields']]
+    if kind == 'courses':
+        values.append(_field(body, 'instructor', None))
+    with _instructor_errors(kind):
+        item = resource['create'](*values)
+    return HTTPStatus.CREATED, item.as_row()
+
+# THIS FUNCTION RETURNS ONE STUDENT, INSTRUCTOR OR COURSE
+def get_item(kind, query, body, id):
+    return HTTPStatus.OK, _get(kind, id).as_row()
+
+# THIS FUNCTION CHANGES SOME FIELDS OF A STUDENT, INSTRUCTOR OR COURSE
+def update_item(kind, query, body, id):
+    resource = RESOURCES[kind]
+    _get(kind, id)
+    if not isinstance(body, dict):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "The body must be a JSON object")
+    changes = {field: body[field] for field in resource['updates'] if field in body}
+    unknown = set(body) - set(resource['updates'])
+    if unknown:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Cannot change {', '.join(sorted(unknown))}")
+    if kind == 'courses':
+        # the instructor first: an unknown email is refused before the course is renamed
+        if 'instructor' in changes:
+            with _instructor_errors(kind):
+                Course.assign_instructor(id, changes['instructor'])
+        Course.update_in_db(id, changes.get('courseName'))
+    else:
+        # the same rules as a new row: the constructor refuses an invalid value
+        current = _get(kind, id).as_row()
+        resource['model'](*(changes.get(field, current[field]) for field in resource['fields']))
+        resource['model'].update_in_db(id, **changes)
+    return HTTPStatus.OK, _get(kind, id).as_row()
+
+# THIS FUNCTION DELETES A STUDENT, INSTRUCTOR OR COURSE
+def delete_item(kind, query, body, id):
+    _get(kind, id)
+    RESOURCES[kind]['model'].delete_from_db(id)
+    return HTTPStatus.NO_CONTENT, None
+
+# THIS FUNCTION IMPORTS MANY STUDENTS, INSTRUCTORS, COURSES OR REGISTRATIONS AT ONCE
+def import_items(kind, query, body):
+    rows = _field(body, 'rows')
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "rows must be a list of JSON objects")
+    # the importer reads the rows as the text of CSV cells
+    report = BulkImport.import_rows(kind, ((index, {column: str(value) for column, value in row.items()
+                                                    if value is not None})
+                                           for index, row in enumerate(rows)))
+    return HTTPStatus.OK, {
+        'processed': report.processed,
+        'inserted': report.inserted,
+        'rejects': [{'index': index, 'reason': reason} for index, reason in report.rejects],
+    }
+
+# THIS FUNCTION LISTS THE COURSES OF A STUDENT OR INSTRUCTOR
+def person_courses(kind, query, body, id):
+    person = _get(kind, id)
+    courses = Course.registered_courses_for(person.email, RESOURCES[kind]['role'])
+    return HTTPStatus.OK, {'items': [{'courseID': courseID, 'courseName': courseName}
+                                     for courseID, courseName in courses]}
+
+# THIS FUNCTION LISTS THE STUDENTS OF A COURSE
+def course_students(kind, query, body, id):
+    _get(kind, id)
+    return HTTPStatus.OK, {'items': Course.get_students_for_courses([id])[id]}
+
+# THIS FUNCTION LISTS ONE PAGE OF REGISTRATIONS, IN THE ORDER THEY WERE MADE
+def list_registrations(query, body):
+    last_key, limit, _, descending = _paging(query, {'id': ('id',)}, 'id')
+    rows = page_rows('registrations', ('id', 'studentEmail', 'courseID'), ('id',), last_key, limit, descending)
+    items = [{'studentEmail': email, 'courseID': courseID} for _, email, courseID in rows]
+    return HTTPStatus.OK, _page(items, (rows[-1][0],) if rows else (), limit)
+
+# THIS FUNCTION REGISTERS A STUDENT TO A COURSE
+def register(query, body):
+    courseID, email = _field(body, 'courseID'), _field(body, 'studentEmail')
+    if not isinstance(courseID, int) or not isinstance(email, str):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid courseID or studentEmail")
+    try:
+        Course.register_student(courseID, email)
+    except sqlite3.IntegrityError as e:
+        if unique_columns(e):
+            raise ApiError(HTTPStatus.CONFLICT, "Student already registered")
+        raise ApiError(HTTPStatus.NOT_FOUND, "Student email or course ID not found")
+    return HTTPStatus.CREATED, {'studentEmail': email, 'courseID': courseID}
+
+# THIS FUNCTION REGISTERS MANY STUDENTS TO MANY COURSES AT ONCE
+def register_many(query, body):
+    course_ids, emails = _field(body, 'courseIDs'), _field(body, 'studentEmails')
+    if not (isinstance(course_ids, list) and all(isinstance(courseID, int) for courseID in course_ids)
+            and isinstance(emails, list) and all(isinstance(email, str) for email in emails)):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "courseIDs and studentEmails must be lists")
+    try:
+        count = Course.register_students(course_ids, emails)
+    except sqlite3.IntegrityError:
+        # the whole batch is rolled back
+        raise ApiError(HTTPStatus.NOT_FOUND, "Student email or course ID not found")
+    return HTTPStatus.OK, count._asdict()
+
+# THIS FUNCTION UNREGISTERS A STUDENT FROM A COURSE
+def unregister(query, body):
+    email = _param(query, 'studentEmail')
+    try:
+        courseID = int(_param(query, 'courseID'))
+    except (TypeError, ValueError):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Missing or invalid courseID parameter")
+    if not email:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Missing studentEmail parameter")
+    Course.unregister_student(courseID, email)
+    return HTTPStatus.NO_CONTENT, None
+
+# THE ROUTES OF THE API: method, path pattern, and endpoint (called with the captured name of the
+# collection when the pattern has one, then with the integer ID of the path when it has one)
+_KINDS = '(students|instructors|courses)'
+ROUTES = [
+    ('GET', '/registrations', list_registrations),
+    ('POST', '/registrations', register),
+    ('DELETE', '/registrations', unregister),
+    ('POST', '/registrations/bulk', register_many),
+    ('POST', '/(registrations)/import', import_items),
+    ('GET', f'/{_KINDS}', list_items),
+    ('POST', f'/{_KINDS}', create_item),
+    ('POST', f'/{_KINDS}/import', import_items),
+    ('GET', f'/{_KINDS}/(-?\\d+)', get_item),
+    ('PATCH', f'/{_KINDS}/(-?\\d+)', update_item),
+    ('DELETE', f'/{_KINDS}/(-?\\d+)', delete_item),
+    ('GET', '/(students|instructors)/(-?\\d+)/courses', person_courses),
+    ('GET', '/(courses)/(-?\\d+)/students', course_students),
+]
+ROUTES = [(method, re.compile(pattern + '$'), endpoint) for method, pattern, endpoint in ROUTES]
+
+# THIS FUNCTION FINDS THE ENDPOINT OF A REQUEST
+def route(method, path):
+    """
+    Finds the endpoint answering a request.
+
+    Parameters:
+    ----------
+        method (str): The HTTP method of the request.
+        path (str): The path of the URL, without the query string.
+
+    Returns:
+    -------
+        tuple: The endpoint and the arguments taken from the path.
+
+    Raises:
+    ------
+        ApiError: 404 if no route has this path, 405 if none of its routes has this method.
+    """
+    found = False
+    for route_method, pattern, endpoint in ROUTES:
+        match = pattern.match(path.rstrip('/') or '/')
+        if match:
+            found = True
+            if route_method == method:
+                return endpoint, [int(value) if value.lstrip('-').isdigit() else value for value in match.groups()]
+    if found:
+        raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not allowed on {path}")
+    raise ApiError(HTTPStatus.NOT_FOUND, f"No such resource: {path}")
+
+# --------------------------------------------------------------------------------------------------------
+
+# THIS CLASS ANSWERS THE REQUESTS OF ONE CONNECTION
+class ApiHandler(BaseHTTPRequestHandler):
+    """
+    Answers the JSON requests of one client connection.
+
+    HTTP/1.1 is used, so a client can send many requests on the same connection; every
+    response has a Content-Length for that. The answers of GET requests carry an ETag (a
+    hash of their body): a client sending it back in If-None-Match gets an empty
+    `304 Not Modified` when the data didn't change.
+    """
+    protocol_version = 'HTTP/1.1'
+    server_version = 'SchoolManagement/1.0'
+    # idle kept-alive connections are closed after this many seconds, freeing their worker
+    timeout = KEEP_ALIVE_TIMEOUT
+    # the headers and the body are two writes: without TCP_NODELAY the body of a kept-alive
+    # connection waits for the delayed ACK of the client
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._answer('GET')
+
+    def do_POST(self):
+        self._answer('POST')
+
+    def do_PATCH(self):
+        self._answer('PATCH')
+
+    def do_PUT(self):
+        self._answer('PUT')
+
+    def do_DELETE(self):
+        self._answer('DELETE')
+
+    # THIS METHOD READS THE JSON BODY OF THE REQUEST
+    def _body(self):
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY:
+            # the body can't be skipped safely, so the connection can't serve another request
+            self.close_connection = True
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE if length > 0 else HTTPStatus.BAD_REQUEST,
+                           "Invalid request body length")
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "The body is not valid JSON")
+
+    # THIS METHOD RUNS THE ENDPOINT OF THE REQUEST AND SENDS ITS ANSWER
+    def _answer(self, method):
+        url = urlsplit(self.path)
+        try:
+            body = self._body()
+            endpoint, arguments = route(method, url.path)
+            status, payload = endpoint(*arguments[:1], parse_qs(url.query), body, *arguments[1:])
+        except ApiError as e:
+            status, payload = e.status, {'error': str(e)}
+        except ValueError as e:
+            # the validation errors of the models
+            status = HTTPStatus.CONFLICT if str(e) in TAKEN else HTTPStatus.BAD_REQUEST
+            payload = {'error': str(e)}
+        except sqlite3.IntegrityError as e:
+            status, payload = HTTPStatus.CONFLICT, {'error': str(e)}
+        except Exception as e:
+            self.log_error("%s %s failed: %r", method, self.path, e)
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': "Internal server error"}
+        self._send(method, status, payload)
+
+    # THIS METHOD SENDS A JSON RESPONSE (OR 304 WHEN THE CLIENT ALREADY HAS IT)
+    def _send(self, method, status, payload):
+        body = b'' if payload is None else json.dumps(payload, separators=(',', ':')).encode()
+        etag = None
+        if method == 'GET' and status == HTTPStatus.OK:
+            etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+            known = self.headers.get('If-None-Match', '')
+            if known.strip() == '*' or etag in (tag.strip().removeprefix('W/') for tag in known.split(',')):
+                status, body = HTTPStatus.NOT_MODIFIED, b''
+        self.send_response(status)
+        if etag:
+            self.send_header('ETag', etag)
+            # the client may keep the answer but must check it is still current before using it
+            self.send_header('Cache-Control', 'no-cache')
+        # 204 and 304 answers have no body, and must not announce one
+        if status not in (HTTPStatus.NO_CONTENT, HTTPStatus.NOT_MODIFIED):
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+# THIS CLASS SERVES THE CONNECTIONS OF THE API ON A FIXED POOL OF WORKER THREADS
+class ApiServer(HTTPServer):
+    """
+    HTTP server handing every accepted connection to a pool of `workers` threads.
+
+    Unlike `ThreadingHTTPServer`, which starts one thread per connection, the number of
+    threads (and of pooled SQLite connections, one per thread) stays bounded however many
+    clients connect. A connection is only accepted once a worker is free, so the extra
+    ones wait in the listen queue of the kernel instead of in the server. Each worker
+    keeps its SQLite connection between requests.
+
+    Parameters:
+    ----------
+        address (tuple): The (host, port) to listen on.
+        workers (int): The number of connections served at the same time (default is `WORKERS`).
+    """
+    request_queue_size = LISTEN_QUEUE
+    allow_reuse_address = True
+
+    def __init__(self, address, workers=WORKERS):
+        super().__init__(address, ApiHandler)
+        self._workers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='api')
+        # one per free worker: the next connection is accepted once one is taken back
+        self._free_workers = threading.BoundedSemaphore(workers)
+
+    def get_request(self):
+        # wait for a free worker before accepting the next connection; without one, serve_forever
+        # drops the OSError, checks for a shutdown and comes back
+        if not self._free_workers.acquire(timeout=ACCEPT_POLL):
+            raise OSError("No free worker")
+        try:
+            return super().get_request()
+        except BaseException:
+            self._free_workers.release()
+            raise
+
+    def process_request(self, request, client_address):
+        self._workers.submit(self._serve_connection, request, client_address)
+
+    # THIS METHOD SERVES ONE CONNECTION ON A WORKER THREAD
+    def _serve_connection(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._free_workers.release()
+
+    def server_close(self):
+        super().server_close()
+        self._workers.shutdown(wait=True)
+
+# THIS FUNCTION RUNS THE API SERVER UNTIL IT IS INTERRUPTED
+def serve(host=HOST, port=PORT, workers=WORKERS):
+    """
+    Creates/upgrades the database and serves the JSON API until Ctrl+C.
+
+    Parameters:
+    ----------
+        host (str): The address to listen on (default is `HOST`, this machine only).
+        port (int): The port to listen on (default is `PORT`).
+        workers (int): The number of connections served at the same time (default is `WORKERS`).
+    """
+    initialize_database()
+    with ApiServer((host, port), workers) as server:
+        print(f"Serving the School Management API on http://{host}:{server.server_port} ({workers} workers)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    # usage: python ApiServer.py [port] [workers] [host]
+    serve(sys.argv[3] if len(sys.argv) > 3 else HOST,
+          int(sys.argv[1]) if len(sys.argv) > 1 else PORT,
+          int(sys.argv[2]) if len(sys.argv) > 2 else WORKERS)
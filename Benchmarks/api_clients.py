@@ -0,0 +1,80 @@
+import http.client
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from ApiServer import ApiServer
+from Classes import Database
+from Classes.Schema import initialize_database
+
+# NUMBER OF CLIENTS SENDING REQUESTS AT THE SAME TIME, AND REQUESTS SENT BY EACH
+CLIENTS = 16
+REQUESTS = 200
+
+# SIZE OF THE BENCHMARK DATABASE AND OF THE PAGES READ
+STUDENTS = 10000
+LIMIT = 50
+
+# THIS FUNCTION FILLS A NEW DATABASE WITH STUDENTS
+def fill_database(path):
+    Database.DATABASE = path
+    initialize_database()
+    with Database.connection() as conn:
+        conn.executemany("INSERT INTO students (name, age, email, studentID) VALUES (?, ?, ?, ?)",
+                         ((f"Student {i}", 18 + i % 10, f"student{i}@mail.aub.edu", i) for i in range(1, STUDENTS + 1)))
+    Database.close_connections()
+
+# THIS FUNCTION PAGES THROUGH THE STUDENTS, ON ONE CONNECTION OR ON A NEW ONE PER REQUEST
+def client(port, requests, keep_alive, conditional):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    # a conditional client reads every page twice: the second time it sends the ETag it got
+    # and the server answers 304, so it keeps the page (and the key of the next one) it has
+    pages = {}
+    after = None
+    for i in range(requests):
+        if conditional and i == requests // 2:
+            after = None
+        path = f'/students?limit={LIMIT}' + (f'&after={quote(json.dumps(after))}' if after else '')
+        headers = {'If-None-Match': pages[path][0]} if conditional and path in pages else {}
+        conn.request('GET', path, headers=headers)
+        response = conn.getresponse()
+        body = response.read()
+        if response.status == 200:
+            pages[path] = (response.getheader('ETag'), json.loads(body)['next'])
+        elif response.status != 304:
+            raise RuntimeError(f"{path} answered {response.status}")
+        after = pages[path][1]
+        if not keep_alive:
+            conn.close()
+    conn.close()
+
+# THIS FUNCTION RUNS THE CLIENTS AGAINST THE SERVER AND PRINTS THE REQUESTS PER SECOND
+def run(clients=CLIENTS, requests=REQUESTS):
+    with tempfile.TemporaryDirectory() as directory:
+        fill_database(os.path.join(directory, "api.db"))
+        server = ApiServer(('127.0.0.1', 0), workers=clients)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"{clients} clients x {requests} requests, pages of {LIMIT} of {STUDENTS} students")
+        for label, keep_alive, conditional in (("new connection per request", False, False),
+                                               ("kept-alive connection", True, False),
+                                               ("kept-alive + If-None-Match", True, True)):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(clients) as pool:
+                for result in [pool.submit(client, server.server_port, requests, keep_alive, conditional)
+                               for _ in range(clients)]:
+                    result.result()
+            elapsed = time.perf_counter() - start
+            print(f"{label:<30} {clients * requests / elapsed:10.0f} requests/s")
+        server.shutdown()
+        server.server_close()
+        Database.close_connections()
+
+if __name__ == '__main__':
+    # usage: python -m Benchmarks.api_clients [clients] [requests]
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else CLIENTS,
+        int(sys.argv[2]) if len(sys.argv) > 2 else REQUESTS)
@@ -0,0 +1,70 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from Classes import Database
+from Classes import AsyncModels
+from Classes.AsyncModels import AsyncStudents, DatabaseExecutor
+from Classes.Person import Student
+from Classes.Schema import initialize_database
+
+# NUMBER OF STUDENTS IN THE BENCHMARK DATABASE
+STUDENTS = 20000
+
+# NUMBER OF STUDENTS LOOKED UP ONE AT A TIME
+LOOKUPS = 2000
+
+# THIS FUNCTION FILLS A NEW DATABASE WITH STUDENTS
+def fill_database(path, count):
+    Database.DATABASE = path
+    initialize_database()
+    with Database.connection() as conn:
+        conn.executemany("INSERT INTO students (name, age, email, studentID) VALUES (?, ?, ?, ?)",
+                         ((f"Student {i}", 18 + i % 10, f"student{i}@mail.aub.edu", i) for i in range(1, count + 1)))
+
+# THIS FUNCTION TIMES A FUNCTION, WITH THE ENTITY CACHE EMPTIED FIRST
+def timed(label, function):
+    Student.cache.clear()
+    start = time.perf_counter()
+    result = function()
+    print(f"{label:<40} {time.perf_counter() - start:8.3f} s")
+    return result
+
+def sync_lookups(ids):
+    return [Student.get_by_id(i) for i in ids]
+
+async def async_lookups(ids):
+    return await asyncio.gather(*(AsyncStudents.get(i) for i in ids))
+
+def sync_iterate():
+    return sum(1 for _ in Student.iter_from_db())
+
+async def async_iterate():
+    count = 0
+    async for _ in AsyncStudents.iterate():
+        count += 1
+    return count
+
+# THIS FUNCTION COMPARES THE SYNCHRONOUS MODEL CALLS WITH THE ASYNC FACADE
+def run(count=STUDENTS, concurrency=AsyncModels.MAX_CONCURRENCY):
+    AsyncModels.executor = DatabaseExecutor(concurrency)
+    ids = [1 + (i * 7919) % count for i in range(min(LOOKUPS, count))]
+    print(f"{count} students, {len(ids)} lookups, {concurrency} concurrent queries")
+    timed("sync   load_from_db", Student.load_from_db)
+    timed("async  AsyncStudents.load", lambda: asyncio.run(AsyncStudents.load()))
+    timed("sync   iter_from_db", sync_iterate)
+    timed("async  AsyncStudents.iterate", lambda: asyncio.run(async_iterate()))
+    timed("sync   get_by_id (one after the other)", lambda: sync_lookups(ids))
+    timed("async  AsyncStudents.get (gathered)", lambda: asyncio.run(async_lookups(ids)))
+    AsyncModels.executor.shutdown()
+
+if __name__ == '__main__':
+    # usage: python -m Benchmarks.async_vs_sync [students] [concurrency]
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else STUDENTS
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else AsyncModels.MAX_CONCURRENCY
+    with tempfile.TemporaryDirectory() as directory:
+        fill_database(os.path.join(directory, "benchmark.db"), count)
+        run(count, concurrency)
+        Database.close_connections()
@@ -0,0 +1,67 @@
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from Classes import Database
+from Classes.Person import Student
+from Classes.Schema import initialize_database
+
+# NUMBER OF PROCESSES CREATING STUDENTS AT THE SAME TIME
+PROCESSES = 4
+
+# NUMBER OF STUDENT IDS EVERY PROCESS TRIES TO CREATE (THE SAME IDS IN EVERY PROCESS)
+STUDENTS = 500
+
+# THIS FUNCTION POINTS A WORKER PROCESS TO THE TEST DATABASE
+def use_database(path):
+    Database.DATABASE = path
+
+# THIS FUNCTION CREATES THE STUDENTS OF ONE PROCESS AND COUNTS WHAT HAPPENED
+def create_students(worker, count):
+    outcomes = Counter()
+    for i in range(1, count + 1):
+        # every process tries the same ID and email, then a new ID with an email already used
+        for studentID, email in ((i, f"student{i}@mail.aub.edu"),
+                                 (i + 1000000 * (worker + 1), f"student{i}@mail.aub.edu")):
+            try:
+                Student.create_student(f"Student {i}", 20, email, studentID)
+                outcomes['created'] += 1
+            except ValueError as e:
+                outcomes[str(e)] += 1
+            except Exception as e:
+                outcomes[f"unexpected {type(e).__name__}: {e}"] += 1
+    Database.close_connections()
+    return outcomes
+
+# THIS FUNCTION CREATES THE SAME STUDENTS FROM MANY PROCESSES AND CHECKS THAT EACH WAS CREATED ONCE
+def run(processes=PROCESSES, count=STUDENTS):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "concurrent.db")
+        use_database(path)
+        initialize_database()
+        Database.close_connections()
+        start = time.perf_counter()
+        with Pool(processes, initializer=use_database, initargs=(path,)) as pool:
+            results = pool.starmap(create_students, [(worker, count) for worker in range(processes)])
+        elapsed = time.perf_counter() - start
+        outcomes = sum(results, Counter())
+        with Database.connection() as conn:
+            rows, emails = conn.execute('SELECT count(*), count(DISTINCT email) FROM students').fetchone()
+        Database.close_connections()
+    print(f"{processes} processes x {2 * count} creates in {elapsed:.2f} s")
+    for outcome, times in sorted(outcomes.items()):
+        print(f"  {outcome:<40} {times}")
+    # one create per email must succeed, every other one must be refused with a readable error
+    expected = {'created', "Student ID already taken", "Student email already taken"}
+    ok = rows == emails == count == outcomes['created'] and set(outcomes) <= expected
+    print(f"{rows} students in the table: {'OK' if ok else 'FAILED'}")
+    return ok
+
+if __name__ == '__main__':
+    # usage: python -m Benchmarks.concurrent_creates [processes] [students]
+    ok = run(int(sys.argv[1]) if len(sys.argv) > 1 else PROCESSES,
+             int(sys.argv[2]) if len(sys.argv) > 2 else STUDENTS)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,161 @@
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+from Classes import Database, Schema
+
+# SIZE OF THE BENCHMARK DATABASE
+STUDENTS = 200000
+INSTRUCTORS = 500
+COURSES = 2000
+COURSES_PER_STUDENT = 5
+
+# NUMBER OF LOOKUPS TIMED FOR EACH QUERY RUN ONCE PER COURSE OR STUDENT
+LOOKUPS = 2000
+
+# THE SAME QUERIES ON THE EMAIL KEYS OF VERSION 4 AND ON THE ROW ID KEYS OF VERSION 5
+QUERIES = {
+    'students roster': ('''
+        SELECT s.name, s.email, group_concat(c.courseName, ', ')
+        FROM students s
+        LEFT JOIN registrations r ON r.studentEmail = s.email
+        LEFT JOIN courses c ON c.courseID = r.courseID
+        GROUP BY s.id
+    ''', '''
+        SELECT s.name, s.email, group_concat(c.courseName, ', ')
+        FROM students s
+        LEFT JOIN enrollments e ON e.studentRowID = s.id
+        LEFT JOIN courses c ON c.courseID = e.courseID
+        GROUP BY s.id
+    '''),
+    'courses roster': ('''
+        SELECT c.courseName, c.instructor, group_concat(r.studentEmail, ', ')
+        FROM courses c
+        LEFT JOIN registrations r ON r.courseID = c.courseID
+        GROUP BY c.courseID
+    ''', '''
+        SELECT c.courseName, i.email, group_concat(s.email, ', ')
+        FROM courses c
+        LEFT JOIN instructors i ON i.id = c.instructorRowID
+        LEFT JOIN enrollments e ON e.courseID = c.courseID
+        LEFT JOIN students s ON s.id = e.studentRowID
+        GROUP BY c.courseID
+    '''),
+}
+
+# THE LOOKUPS OF ONE COURSE OR ONE STUDENT, WITH THE KIND OF KEY THEY ARE RUN FOR
+LOOKUP_QUERIES = {
+    'students of a course': ('course', '''
+        SELECT studentEmail FROM registrations WHERE courseID = ?
+    ''', '''
+        SELECT s.email FROM enrollments e JOIN students s ON s.id = e.studentRowID WHERE e.courseID = ?
+    '''),
+    'courses of a student': ('student', '''
+        SELECT c.courseID, c.courseName
+        FROM registrations r JOIN courses c ON c.courseID = r.courseID
+        WHERE r.studentEmail = ?
+    ''', '''
+        SELECT c.courseID, c.courseName
+        FROM enrollments e JOIN courses c ON c.courseID = e.courseID
+        WHERE e.studentRowID = (SELECT id FROM students WHERE email = ?)
+    '''),
+}
+
+# THIS FUNCTION CREATES A DATABASE AT VERSION 4 (EMAIL KEYS) AND FILLS IT
+def fill_database(path, students):
+    Database.DATABASE = path
+    migrations = Schema.MIGRATIONS
+    Schema.MIGRATIONS = [migration for migration in migrations if migration[0] <= 4]
+    try:
+        Schema.initialize_database()
+    finally:
+        Schema.MIGRATIONS = migrations
+    rng = random.Random(435)
+    with Database.connection() as conn:
+        conn.executemany("INSERT INTO students (name, age, email, studentID) VALUES (?, ?, ?, ?)",
+                         ((f"Student {i}", rng.randint(17, 35), f"student{i}@mail.aub.edu", i)
+                          for i in range(1, students + 1)))
+        conn.executemany("INSERT INTO instructors (name, age, email, instructorID) VALUES (?, ?, ?, ?)",
+                         ((f"Instructor {i}", rng.randint(28, 70), f"instructor{i}@mail.aub.edu", i)
+                          for i in range(1, INSTRUCTORS + 1)))
+        conn.executemany("INSERT INTO courses (courseID, courseName, instructor) VALUES (?, ?, ?)",
+                         ((i, f"Course {i}", f"instructor{rng.randint(1, INSTRUCTORS)}@mail.aub.edu")
+                          for i in range(1, COURSES + 1)))
+        conn.executemany("INSERT INTO registrations (studentEmail, courseID) VALUES (?, ?)",
+                         ((f"student{i}@mail.aub.edu", course) for i in range(1, students + 1)
+                          for course in rng.sample(range(1, COURSES + 1), COURSES_PER_STUDENT)))
+    Database.close_connections()
+
+# THIS FUNCTION RETURNS THE SIZE IN BYTES OF THE REGISTRATION AND COURSE INDEXES
+def index_sizes(path):
+    conn = sqlite3.connect(path)
+    try:
+        names = [name for name, in conn.execute('''
+            SELECT name FROM sqlite_master
+            WHERE type = 'index' AND tbl_name IN ('registrations', 'enrollments', 'courses')
+            ORDER BY name
+        ''')]
+        try:
+            return {name: conn.execute('SELECT sum(pgsize) FROM dbstat WHERE name = ?', (name,)).fetchone()[0]
+                    for name in names}
+        except sqlite3.OperationalError:
+            # SQLite built without the dbstat table: only the size of the whole file is known
+            page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+            return {'(whole database)': page_size * conn.execute('PRAGMA page_count').fetchone()[0]}
+    finally:
+        conn.close()
+
+# THIS FUNCTION RETURNS THE TIME IN MILLISECONDS OF A FUNCTION
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return 1000 * (time.perf_counter() - start)
+
+# THIS FUNCTION TIMES THE QUERIES OF ONE VERSION OF THE SCHEMA
+def time_queries(path, version, courses, emails):
+    conn = sqlite3.connect(path)
+    try:
+        times = {label: timed(lambda: conn.execute(queries[version]).fetchall())
+                 for label, queries in QUERIES.items()}
+        for label, (key, *queries) in LOOKUP_QUERIES.items():
+            keys = courses if key == 'course' else emails
+            times[label] = timed(lambda: [conn.execute(queries[version], (k,)).fetchall() for k in keys])
+        return times
+    finally:
+        conn.close()
+
+# THIS FUNCTION COMPARES THE EMAIL KEYS WITH THE ROW ID KEYS ON THE SAME DATA
+def run(students=STUDENTS):
+    rng = random.Random(4)
+    courses = [rng.randint(1, COURSES) for _ in range(LOOKUPS)]
+    emails = [f"student{rng.randint(1, students)}@mail.aub.edu" for _ in range(LOOKUPS)]
+    with tempfile.TemporaryDirectory() as directory:
+        before, after = os.path.join(directory, "v4.db"), os.path.join(directory, "v5.db")
+        fill_database(before, students)
+        shutil.copyfile(before, after)
+        migration = timed(lambda: Schema.migrate(after))
+        Database.close_connections()
+        for path in (before, after):
+            conn = sqlite3.connect(path)
+            conn.execute('VACUUM')
+            conn.execute('ANALYZE')
+            conn.close()
+        print(f"{students} students, {COURSES} courses, {students * COURSES_PER_STUDENT} registrations")
+        print(f"migration to version 5: {migration:.0f} ms")
+        old, new = time_queries(before, 0, courses, emails), time_queries(after, 1, courses, emails)
+        print(f"{'':<40} {'email keys':>12} {'row ids':>12}")
+        for label in old:
+            count = f" x{LOOKUPS}" if label in LOOKUP_QUERIES else ""
+            print(f"{label + count:<40} {old[label]:9.1f} ms {new[label]:9.1f} ms")
+        for label, path in (("email keys", before), ("row ids", after)):
+            print(f"indexes with {label}:")
+            for name, size in index_sizes(path).items():
+                print(f"  {name:<40} {size / 1024:10.0f} KiB")
+
+if __name__ == '__main__':
+    # usage: python -m Benchmarks.integer_keys [students]
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else STUDENTS)
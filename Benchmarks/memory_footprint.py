@@ -0,0 +1,61 @@
+import sys
+import tracemalloc
+
+from Classes.Course import Course
+from Classes.Person import Student
+
+# NUMBER OF OBJECTS BUILT FOR EACH MEASURE
+OBJECTS = 200000
+
+# NUMBER OF DIFFERENT COURSE NAMES AND INSTRUCTORS SHARED BY THE COURSES
+DISTINCT = 50
+
+# THIS CLASS IS A STUDENT AS IT WAS STORED BEFORE THE SLOTS: A DICTIONARY PER OBJECT
+class DictStudent:
+    def __init__(self, name, age, email, studentID, registered_courses=[]):
+        self.name = name
+        self.age = age
+        self.email = email
+        self.studentID = studentID
+        self.registered_courses = registered_courses
+
+# THIS CLASS IS A COURSE AS IT WAS STORED BEFORE THE SLOTS: A DICTIONARY PER OBJECT
+class DictCourse:
+    def __init__(self, courseID, courseName, instructor="", enrolledStudents=[]):
+        self.courseID = courseID
+        self.courseName = courseName
+        self.instructor = instructor
+        self.enrolledStudents = enrolledStudents
+
+# THESE FUNCTIONS YIELD THE ROWS AS SQLITE RETURNS THEM: A NEW STRING FOR EVERY VALUE
+def student_rows(count):
+    return ((f"Student {i}", 18 + i % 10, f"student{i}@mail.aub.edu", i) for i in range(1, count + 1))
+
+def course_rows(count):
+    return ((i, f"Course {i % DISTINCT}", f"instructor{i % DISTINCT}@mail.aub.edu") for i in range(1, count + 1))
+
+# THIS FUNCTION RETURNS THE MEMORY KEPT BY THE OBJECTS BUILT FROM SOME ROWS
+def measure(cls, rows):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # the rows are dropped once read, so only the strings the objects keep are counted
+    objects = [cls(*row) for row in rows]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return size
+
+# THIS FUNCTION COMPARES THE SLOTTED MODELS WITH DICTIONARY-BACKED OBJECTS
+def run(count=OBJECTS):
+    print(f"{count} objects, {DISTINCT} distinct course names and instructors")
+    for label, old, new, rows in (("students", DictStudent, Student, student_rows),
+                                  ("courses", DictCourse, Course, course_rows)):
+        old_size = measure(old, rows(count))
+        new_size = measure(new, rows(count))
+        print(f"{label:<10} dict: {old_size / count:7.1f} bytes/object   "
+              f"slots: {new_size / count:7.1f} bytes/object   "
+              f"saved: {100 * (old_size - new_size) / old_size:5.1f}%")
+
+if __name__ == '__main__':
+    # usage: python -m Benchmarks.memory_footprint [objects]
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else OBJECTS)
@@ -0,0 +1,75 @@
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from Classes import Database
+from Classes.Course import Course
+from Classes.Person import Student
+from Classes.Schema import initialize_database
+from Classes.Snapshot import load_snapshot
+
+# SIZE OF THE BENCHMARK DATABASE
+STUDENTS = 100000
+INSTRUCTORS = 500
+COURSES = 2000
+COURSES_PER_STUDENT = 5
+
+# THIS FUNCTION FILLS A NEW DATABASE WITH STUDENTS, INSTRUCTORS, COURSES AND REGISTRATIONS
+def fill_database(path, students):
+    Database.DATABASE = path
+    initialize_database()
+    rng = random.Random(435)
+    with Database.connection() as conn:
+        conn.executemany("INSERT INTO students (name, age, email, studentID) VALUES (?, ?, ?, ?)",
+                         ((f"Student {i}", rng.randint(17, 35), f"student{i}@mail.aub.edu", i)
+                          for i in range(1, students + 1)))
+        conn.executemany("INSERT INTO instructors (name, age, email, instructorID) VALUES (?, ?, ?, ?)",
+                         ((f"Instructor {i}", rng.randint(28, 70), f"instructor{i}@mail.aub.edu", i)
+                          for i in range(1, INSTRUCTORS + 1)))
+        # the students and instructors were inserted in ID order, so their row id is their ID
+        conn.executemany("INSERT INTO courses (courseID, courseName, instructorRowID) VALUES (?, ?, ?)",
+                         ((i, f"Course {i}", rng.randint(1, INSTRUCTORS)) for i in range(1, COURSES + 1)))
+        conn.executemany("INSERT INTO enrollments (studentRowID, courseID) VALUES (?, ?)",
+                         ((i, course) for i in range(1, students + 1)
+                          for course in rng.sample(range(1, COURSES + 1), COURSES_PER_STUDENT)))
+
+# THIS FUNCTION TIMES A FUNCTION
+def timed(label, function):
+    start = time.perf_counter()
+    result = function()
+    print(f"{label:<45} {1000 * (time.perf_counter() - start):10.1f} ms")
+    return result
+
+# THE SAME AGGREGATIONS COMPUTED BY LOOPING OVER THE MODEL OBJECTS
+def objects_aggregations():
+    students = {student.email: student for student in Student.load_from_db()}
+    courses = Course.load_from_db()
+    enrolled = Course.get_students_for_courses([course.courseID for course in courses])
+    enrollment = {courseID: len(emails) for courseID, emails in enrolled.items()}
+    mean_age = {courseID: sum(students[email].age for email in emails) / len(emails)
+                for courseID, emails in enrolled.items() if emails}
+    load = Counter(course.instructor for course in courses)
+    return enrollment, mean_age, load
+
+def snapshot_aggregations(snapshot):
+    return (snapshot.enrollment_per_course(), snapshot.mean_age_per_course(),
+            snapshot.age_distribution_per_course(), snapshot.instructor_load())
+
+# THIS FUNCTION COMPARES THE SNAPSHOT WITH THE MODEL OBJECTS
+def run(students=STUDENTS):
+    print(f"{students} students, {COURSES} courses, {students * COURSES_PER_STUDENT} registrations")
+    timed("objects   load + aggregate", objects_aggregations)
+    snapshot = timed("snapshot  load_snapshot", load_snapshot)
+    timed("snapshot  aggregate", lambda: snapshot_aggregations(snapshot))
+    print(snapshot)
+
+if __name__ == '__main__':
+    # usage: python -m Benchmarks.snapshot_analytics [students]
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else STUDENTS
+    with tempfile.TemporaryDirectory() as directory:
+        fill_database(os.path.join(directory, "benchmark.db"), count)
+        run(count)
+        Database.close_connections()
@@ -0,0 +1,392 @@
+import asyncio
+import threading
+import weakref
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError
+from functools import partial
+from itertools import islice
+
+from Classes.Course import Course
+from Classes.Database import close_connections
+from Classes.Person import Instructor, Student
+
+# MAXIMUM NUMBER OF QUERIES RUN AT THE SAME TIME FOR ASYNCIO CODE
+MAX_CONCURRENCY = 4
+
+# NUMBER OF OBJECTS HANDED OVER AT A TIME WHEN ITERATING ASYNCHRONOUSLY
+STREAM_BATCH = 500
+
+# NUMBER OF BATCHES READ AHEAD OF THE ASYNC CONSUMER
+STREAM_PREFETCH = 2
+
+# HOW OFTEN (IN SECONDS) A STREAM WAITING FOR ITS CONSUMER CHECKS THAT THE CONSUMER IS STILL THERE
+STREAM_POLL = 0.1
+
+# marks the end of an asynchronous stream
+_END = object()
+
+# THIS CLASS RUNS THE BLOCKING MODEL CALLS OF ASYNCIO CODE ON ITS OWN THREADS
+class DatabaseExecutor:
+    """
+    Runs blocking model calls (sqlite3) for asyncio code on a dedicated thread pool.
+
+    At most `max_concurrency` calls run at once; the other callers wait on an asyncio
+    semaphore instead of piling up in the queue of the pool. Every thread of the pool
+    keeps its own pooled connection (see `Database.get_connection`).
+
+    Parameters:
+    ----------
+        max_concurrency (int): The maximum number of calls run at the same time (default is `MAX_CONCURRENCY`).
+    """
+    def __init__(self, max_concurrency=MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="async-db")
+        # asyncio semaphores belong to one event loop, so each loop gets its own
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _semaphore(self, loop):
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+            return semaphore
+
+    # THIS METHOD RUNS A BLOCKING FUNCTION WITHOUT BLOCKING THE EVENT LOOP
+    async def run(self, function, *args, **kwargs):
+        """
+        Runs a blocking function on the pool and waits for its result.
+
+        Parameters:
+        ----------
+            function (callable): The function to call (e.g. a model method).
+            *args, **kwargs: The arguments of the call.
+
+        Returns:
+        -------
+            The result of the function.
+
+        Raises:
+        ------
+            Exception: Whatever the function raised.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._semaphore(loop):
+            return await loop.run_in_executor(self._executor, partial(function, *args, **kwargs))
+
+    # THIS METHOD ITERATES ASYNCHRONOUSLY OVER A BLOCKING GENERATOR
+    async def iterate(self, function, *args, batch_size=STREAM_BATCH, **kwargs):
+        """
+        Iterates asynchronously over the items of a blocking generator (e.g. `Student.iter_from_db`).
+
+        The generator runs on a thread of its own from start to end, since it keeps a cursor
+        open between two items, and hands its items over `batch_size` at a time. It only
+        takes one of the `max_concurrency` slots while it reads a batch, not while it waits
+        for the consumer, so a consumer can make other calls of the executor inside its loop
+        however many iterations are running. It reads at most `STREAM_PREFETCH` batches ahead
+        of the consumer, and stops as soon as the consumer stops iterating.
+
+        Parameters:
+        ----------
+            function (callable): The function returning the generator.
+            *args, **kwargs: The arguments of the call.
+            batch_size (int): The number of items handed over at a time (default is `STREAM_BATCH`).
+
+        Yields:
+        ------
+            The items of the generator.
+
+        Raises:
+        ------
+            Exception: Whatever the generator raised.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore(loop)
+        batches = asyncio.Queue()
+        room = threading.Semaphore(STREAM_PREFETCH)
+        stop = threading.Event()
+        finished = loop.create_future()
+
+        # the consumer may be gone without its `finally` having run (e.g. `asyncio.run` cancels
+        # the closing of the iteration and closes the loop), so the thread checks that the loop
+        # is still there before every call to it, and never waits on it without a timeout
+        def gone():
+            return stop.is_set() or loop.is_closed()
+
+        def call_in_loop(callback, *args):
+            try:
+                loop.call_soon_threadsafe(callback, *args)
+            except RuntimeError:
+                # the loop is closed
+                return False
+            return True
+
+        def hand_over(item):
+            while not room.acquire(timeout=STREAM_POLL):
+                if gone():
+                    return False
+            return not gone() and call_in_loop(batches.put_nowait, item)
+
+        def acquire_slot():
+            # wait for a free slot as the calls of `run` do
+            if gone():
+                return False
+            acquire = semaphore.acquire()
+            try:
+                slot = asyncio.run_coroutine_threadsafe(acquire, loop)
+            except RuntimeError:
+                acquire.close()
+                return False
+            while True:
+                try:
+                    slot.result(STREAM_POLL)
+                    return True
+                except CancelledError:
+                    return False
+                except TimeoutError:
+                    if gone():
+                        # a slot taken in the meantime is given back
+                        slot.add_done_callback(lambda slot: slot.cancelled() or call_in_loop(semaphore.release))
+                        slot.cancel()
+                        return False
+
+        def read_batch(items):
+            if not acquire_slot():
+                return None
+            try:
+                return list(islice(items, batch_size))
+            finally:
+                # the slot is given back before the batch is handed over
+                call_in_loop(semaphore.release)
+
+        def set_finished():
+            if not finished.done():
+                finished.set_result(None)
+
+        def produce():
+            items = None
+            try:
+                items = iter(function(*args, **kwargs))
+                while True:
+                    batch = read_batch(items)
+                    if batch is None or batch and not hand_over(batch):
+                        return
+                    if len(batch) < batch_size:
+                        break
+                hand_over(_END)
+            except Exception as e:
+                hand_over(e)
+            finally:
+                # close the cursor of the generator and the connection of the thread
+                if hasattr(items, 'close'):
+                    items.close()
+                close_connections()
+                call_in_loop(set_finished)
+
+        threading.Thread(target=produce, name="async-db-stream", daemon=True).start()
+        try:
+            while True:
+                batch = await batches.get()
+                room.release()
+                if batch is _END:
+                    break
+                if isinstance(batch, Exception):
+                    raise batch
+                for item in batch:
+                    yield item
+        finally:
+            # wake up the producer if it waits for room, then wait for it to stop
+            stop.set()
+            room.release()
+            await finished
+
+    # THIS METHOD STOPS THE THREADS OF THE EXECUTOR
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+# THE EXECUTOR USED BY THE ASYNC FACADES
+executor = DatabaseExecutor()
+
+# THIS CLASS IS THE ASYNC FACADE SHARED BY THE STUDENTS, INSTRUCTORS AND COURSES
+class _AsyncEntities:
+    """
+    Async versions of the model methods common to the students, instructors and courses.
+    The subclasses name the model class they wrap.
+    """
+    model = None
+
+    # THIS METHOD LOADS EVERY OBJECT OF THE TABLE
+    @classmethod
+    async def load(cls):
+        """
+        Returns every object of the table (see `load_from_db`).
+        """
+        return await executor.run(cls.model.load_from_db)
+
+    # THIS METHOD ITERATES OVER THE TABLE WITHOUT LOADING IT AT ONCE
+    @classmethod
+    def iterate(cls, batch_size=STREAM_BATCH):
+        """
+        Returns an async iterator over the objects of the table, read `batch_size` at a time
+        (see `iter_from_db`). Close it (e.g. with `contextlib.aclosing`) when leaving the loop
+        early, so the thread reading the table stops right away.
+        """
+        return executor.iterate(cls.model.iter_from_db, batch_size, batch_size=batch_size)
+
+    # THIS METHOD RETURNS THE OBJECT OF A PRIMARY KEY
+    @classmethod
+    async def get(cls, key):
+        """
+        Returns the object with the given primary key, or None (see `get_by_id`).
+        """
+        return await executor.run(cls.model.get_by_id, key)
+
+    # THIS METHOD RETURNS ONE PAGE OF THE TABLE
+    @classmethod
+    async def page(cls, last_key=None, limit=50, order_by=None, descending=False):
+        """
+        Returns the page of objects following `last_key` (see `page_after`).
+        """
+        if order_by is None:
+            return await executor.run(cls.model.page_after, last_key, limit, descending=descending)
+        return await executor.run(cls.model.page_after, last_key, limit, order_by, descending)
+
+    # THIS METHOD DELETES THE OBJECT OF A PRIMARY KEY
+    @classmethod
+    async def delete(cls, key):
+        """
+        Deletes the object with the given primary key (see `delete_from_db`).
+        """
+        return await executor.run(cls.model.delete_from_db, key)
+
+# THIS CLASS GIVES ASYNCIO CODE ACCESS TO THE STUDENTS
+class AsyncStudents(_AsyncEntities):
+    """
+    Async facade of `Student`: every method runs the blocking model method on `executor`.
+    """
+    model = Student
+
+    @classmethod
+    async def create(cls, name, age, email, studentID):
+        """
+        Creates a student and adds it to the database (see `Student.create_student`).
+        """
+        return await executor.run(Student.create_student, name, age, email, studentID)
+
+    @classmethod
+    async def update(cls, studentID, name=None, age=None, email=None):
+        """
+        Updates the columns given of a student (see `Student.update_in_db`).
+        """
+        return await executor.run(Student.update_in_db, studentID, name, age, email)
+
+    @classmethod
+    async def courses(cls, emails):
+        """
+        Returns the course IDs of each student email (see `Student.get_courses_for_students`).
+        """
+        return await executor.run(Student.get_courses_for_students, list(emails))
+
+# THIS CLASS GIVES ASYNCIO CODE ACCESS TO THE INSTRUCTORS
+class AsyncInstructors(_AsyncEntities):
+    """
+    Async facade of `Instructor`: every method runs the blocking model method on `executor`.
+    """
+    model = Instructor
+
+    @classmethod
+    async def create(cls, name, age, email, instructorID):
+        """
+        Creates an instructor and adds it to the database (see `Instructor.create_instructor`).
+        """
+        return await executor.run(Instructor.create_instructor, name, age, email, instructorID)
+
+    @classmethod
+    async def update(cls, instructorID, name=None, age=None, email=None):
+        """
+        Updates the columns given of an instructor (see `Instructor.update_in_db`).
+        """
+        return await executor.run(Instructor.update_in_db, instructorID, name, age, email)
+
+    @classmethod
+    async def courses(cls, emails):
+        """
+        Returns the course IDs of each instructor email (see `Instructor.get_courses_for_instructors`).
+        """
+        return await executor.run(Instructor.get_courses_for_instructors, list(emails))
+
+# THIS CLASS GIVES ASYNCIO CODE ACCESS TO THE COURSES
+class AsyncCourses(_AsyncEntities):
+    """
+    Async facade of `Course`: every method runs the blocking model method on `executor`.
+    """
+    model = Course
+
+    @classmethod
+    async def create(cls, courseID, courseName, instructor=None):
+        """
+        Creates a course and adds it to the database (see `Course.create_course`).
+        """
+        return await executor.run(Course.create_course, courseID, courseName, instructor)
+
+    @classmethod
+    async def update(cls, courseID, courseName=None):
+        """
+        Renames a course (see `Course.update_in_db`).
+        """
+        return await executor.run(Course.update_in_db, courseID, courseName)
+
+    @classmethod
+    async def assign_instructor(cls, courseID, instructor):
+        """
+        Assigns an instructor to a course, or unassigns it with None (see `Course.assign_instructor`).
+        """
+        return await executor.run(Course.assign_instructor, courseID, instructor)
+
+    @classmethod
+    async def students(cls, course_ids):
+        """
+        Returns the student emails of each course ID (see `Course.get_students_for_courses`).
+        """
+        return await executor.run(Course.get_students_for_courses, list(course_ids))
+
+# THIS CLASS GIVES ASYNCIO CODE ACCESS TO THE REGISTRATIONS
+class AsyncRegistrations:
+    """
+    Async facade of the registrations of students to courses.
+    """
+    @classmethod
+    async def register(cls, courseID, email):
+        """
+        Registers a student to a course (see `Course.register_student`).
+        """
+        return await executor.run(Course.register_student, courseID, email)
+
+    @classmethod
+    async def register_many(cls, course_ids, emails):
+        """
+        Registers every student to every course in one transaction (see `Course.register_students`).
+        """
+        return await executor.run(Course.register_students, list(course_ids), list(emails))
+
+    @classmethod
+    async def unregister(cls, courseID, email):
+        """
+        Unregisters a student from a course (see `Course.unregister_student`).
+        """
+        return await executor.run(Course.unregister_student, courseID, email)
+
+    @classmethod
+    async def courses_of(cls, email):
+        """
+        Returns the IDs of the courses a student is registered to.
+        """
+        courses = await AsyncStudents.courses([email])
+        return courses[email]
+
+    @classmethod
+    async def students_of(cls, courseID):
+        """
+        Returns the emails of the students registered to a course.
+        """
+        students = await AsyncCourses.students([courseID])
+        return students[courseID]
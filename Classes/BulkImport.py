@@ -0,0 +1,340 @@
+import csv
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from Classes.Course import STUDENT_REGISTRATION, Course
+from Classes.Database import MAX_VARIABLES, apply_profile, connection
+from Classes.Events import RELOAD, publish
+from Classes.Person import Instructor, Student
+
+# NUMBER OF ROWS INSERTED PER TRANSACTION
+BATCH_SIZE = 1000
+
+# COLUMNS EXPECTED IN THE CSV FILE, UNIQUE COLUMNS, FOREIGN KEYS (column -> referenced table, column and
+# reason of the reject when no row matches), CHANGE BUS ENTITY OF EACH TABLE, AND THE INSERT OF THE
+# TABLES THAT STORE THE ROW ID OF A STUDENT OR INSTRUCTOR INSTEAD OF THEIR EMAIL
+KINDS = {
+    'students': {
+        'columns': ('name', 'age', 'email', 'studentID'),
+        'unique': ('studentID', 'email'),
+        'entity': 'student',
+    },
+    'instructors': {
+        'columns': ('name', 'age', 'email', 'instructorID'),
+        'unique': ('instructorID', 'email'),
+        'entity': 'instructor',
+    },
+    'courses': {
+        'columns': ('courseID', 'courseName', 'instructor'),
+        'unique': ('courseID',),
+        'references': {'instructor': ('instructors', 'email', "Instructor email not found")},
+        'entity': 'course',
+        'insert': '''
+            INSERT INTO courses (courseID, courseName, instructorRowID)
+            VALUES (?, ?, (SELECT id FROM instructors WHERE email = ?))
+        ''',
+    },
+    'registrations': {
+        'columns': ('studentEmail', 'courseID'),
+        'unique': (),
+        'references': {
+            'studentEmail': ('students', 'email', "Student email not found"),
+            'courseID': ('courses', 'courseID', "Course ID not found"),
+        },
+        'entity': 'registration',
+        'insert': STUDENT_REGISTRATION,
+    },
+}
+
+# THIS CLASS KEEPS TRACK OF THE PROGRESS OF AN IMPORT
+class ImportReport:
+    """
+    Progress and result of a bulk import.
+
+    The report is updated after every batch, so another thread (e.g. a GUI polling
+    loop) can read it while the import is running.
+
+    Attributes:
+    ----------
+        kind (str): The table being imported.
+        processed (int): The number of CSV rows read so far.
+        inserted (int): The number of rows inserted in the database so far.
+        rejects (list of tuple): The rejected rows as (line number, reason) pairs.
+        cancelled (bool): Whether the import was stopped before the end of the file.
+        done (bool): Whether the import has finished.
+    """
+    def __init__(self, kind):
+        self.kind = kind
+        self.processed = 0
+        self.inserted = 0
+        self.rejects = []
+        self.cancelled = False
+        self.done = False
+
+    def __repr__(self):
+        return (f"ImportReport({self.kind}: processed={self.processed}, inserted={self.inserted}, "
+                f"rejected={len(self.rejects)}, cancelled={self.cancelled})")
+
+# THIS FUNCTION STREAMS THE ROWS OF A CSV FILE
+def read_csv(path):
+    """
+    Streams the rows of a CSV file whose first line holds the column names.
+
+    Parameters:
+    ----------
+        path (str): The path of the CSV file.
+
+    Yields:
+    ------
+        tuple: The line number and the row as a dictionary of column name to value.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+
+# THIS FUNCTION VALIDATES ONE ROW WITH THE RULES OF THE MODEL CLASSES
+def validate_row(kind, row):
+    """
+    Validates a CSV row with the same rules as the model constructors.
+
+    Parameters:
+    ----------
+        kind (str): The table the row belongs to (a key of `KINDS`).
+        row (dict): The row read from the CSV file.
+
+    Returns:
+    -------
+        tuple: The values to insert, in the order of `KINDS[kind]['columns']`.
+
+    Raises:
+    ------
+        ValueError: If a column is missing or a value is invalid.
+    """
+    values = {}
+    for column in KINDS[kind]['columns']:
+        value = row.get(column)
+        if value is None:
+            if kind == 'courses' and column == 'instructor':
+                value = ""
+            else:
+                raise ValueError(f"Missing column {column}")
+        values[column] = value.strip()
+
+    def to_int(column):
+        try:
+            return int(values[column])
+        except ValueError:
+            raise ValueError(f"Invalid {column} provided")
+
+    if kind == 'students':
+        student = Student(values['name'], to_int('age'), values['email'], to_int('studentID'))
+        return (student.name, student.age, student.email, student.studentID)
+    if kind == 'instructors':
+        instructor = Instructor(values['name'], to_int('age'), values['email'], to_int('instructorID'))
+        return (instructor.name, instructor.age, instructor.email, instructor.instructorID)
+    if kind == 'courses':
+        if not values['courseName']:
+            raise ValueError("Invalid course name provided")
+        course = Course(to_int('courseID'), values['courseName'], values['instructor'])
+        return (course.courseID, course.courseName, course.instructor)
+    if '@mail.aub.edu' not in values['studentEmail']:
+        raise ValueError("Invalid email provided")
+    courseID = to_int('courseID')
+    if not courseID:
+        raise ValueError("Invalid course ID provided")
+    return (values['studentEmail'], courseID)
+
+# THIS FUNCTION VALIDATES A BATCH OF ROWS (RUNS IN A WORKER PROCESS WHEN A POOL IS USED)
+def _validate_batch(kind, batch):
+    valid = []
+    rejects = []
+    for line, row in batch:
+        try:
+            valid.append((line, validate_row(kind, row)))
+        except ValueError as e:
+            rejects.append((line, str(e)))
+    return valid, rejects
+
+# THIS FUNCTION SPLITS A STREAM OF ROWS INTO BATCHES
+def _batches(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+# THIS FUNCTION VALIDATES THE BATCHES, OPTIONALLY ACROSS A PROCESS POOL
+def _validated_batches(kind, rows, batch_size, workers):
+    if workers <= 1:
+        for batch in _batches(rows, batch_size):
+            yield len(batch), _validate_batch(kind, batch)
+        return
+    # keep only a few batches in flight so the file is still streamed
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for batch in _batches(rows, batch_size):
+            pending.append((len(batch), pool.submit(_validate_batch, kind, batch)))
+            if len(pending) >= workers * 2:
+                size, future = pending.pop(0)
+                yield size, future.result()
+        for size, future in pending:
+            yield size, future.result()
+
+# THIS FUNCTION RETURNS WHICH OF THE GIVEN VALUES ALREADY EXIST IN A COLUMN
+def _existing(cursor, table, column, values, select=None):
+    found = set()
+    values = list(values)
+    for start in range(0, len(values), MAX_VARIABLES):
+        chunk = values[start:start + MAX_VARIABLES]
+        cursor.execute(f'SELECT {select or column} FROM {table} WHERE {column} IN ({",".join("?" * len(chunk))})', chunk)
+        found.update(row if select else row[0] for row in cursor.fetchall())
+    return found
+
+# THIS FUNCTION REMOVES THE ROWS WHOSE FOREIGN KEYS POINT TO NO ROW
+def _filter_references(cursor, kind, valid, rejects):
+    columns = KINDS[kind]['columns']
+    references = [(columns.index(column), table, key, reason)
+                  for column, (table, key, reason) in KINDS[kind].get('references', {}).items()]
+    found = [_existing(cursor, table, key, {values[index] for _, values in valid} - {None})
+             for index, table, key, _ in references]
+    kept = []
+    for line, values in valid:
+        # a NULL value (e.g. a course without instructor) doesn't point to any row
+        reason = next((reason for (index, _, _, reason), existing in zip(references, found)
+                       if values[index] is not None and values[index] not in existing), None)
+        if reason:
+            rejects.append((line, reason))
+        else:
+            kept.append((line, values))
+    return kept
+
+# THIS FUNCTION REMOVES THE ROWS THAT WOULD BREAK A CONSTRAINT OF THE DATABASE
+def _filter_batch(cursor, kind, valid, seen, rejects):
+    columns = KINDS[kind]['columns']
+    valid = _filter_references(cursor, kind, valid, rejects)
+    if kind == 'registrations':
+        registered = _existing(cursor, 'registrations', 'studentEmail', {values[0] for _, values in valid},
+                               select='studentEmail, courseID')
+        rows = []
+        for line, values in valid:
+            if values in registered or values in seen['pair']:
+                rejects.append((line, "Student already registered"))
+            else:
+                seen['pair'].add(values)
+                rows.append(values)
+        return rows
+    # one set of already used values per unique column
+    taken = {}
+    for column in KINDS[kind]['unique']:
+        index = columns.index(column)
+        taken[column] = _existing(cursor, kind, column, {values[index] for _, values in valid})
+    rows = []
+    for line, values in valid:
+        for column in KINDS[kind]['unique']:
+            value = values[columns.index(column)]
+            if value in taken[column] or value in seen[column]:
+                label = "ID" if column.endswith('ID') else column
+                rejects.append((line, f"{kind[:-1].capitalize()} {label} already taken"))
+                break
+        else:
+            for column in KINDS[kind]['unique']:
+                seen[column].add(values[columns.index(column)])
+            rows.append(values)
+    return rows
+
+# THIS FUNCTION IMPORTS A STREAM OF ROWS INTO THE DATABASE
+def import_rows(kind, rows, batch_size=BATCH_SIZE, workers=1, progress=None, cancel=None,
+                report=None, profile='bulk-load'):
+    """
+    Validates and inserts a stream of rows in batched transactions.
+
+    Every batch is validated (in `workers` processes when more than one is requested),
+    checked against the unique constraints in one query per column, and inserted with
+    `executemany` in its own transaction, which holds the write lock from the checks on.
+    Invalid and duplicate rows are skipped and recorded in the report.
+
+    Parameters:
+    ----------
+        kind (str): The table to import into ('students', 'instructors', 'courses' or 'registrations').
+        rows (iterable): The (line number, row dictionary) pairs to import, e.g. from `read_csv`.
+        batch_size (int): The number of rows per transaction (default is `BATCH_SIZE`).
+        workers (int): The number of processes used to validate the rows (default is 1, no pool).
+        progress (callable): A function called with the report after every batch (optional).
+        cancel (threading.Event): An event that stops the import before the next batch when set (optional).
+        report (ImportReport): The report to update (default is a new one).
+        profile (str): The database tuning profile used while importing (default is 'bulk-load').
+
+    Returns:
+    -------
+        ImportReport: The final report of the import.
+
+    Raises:
+    ------
+        ValueError: If the kind is unknown.
+        sqlite3.Error: If there is an issue with the database operation.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown import type: {kind}")
+    report = report or ImportReport(kind)
+    columns = KINDS[kind]['columns']
+    insert = KINDS[kind].get('insert') or f'INSERT INTO {kind} ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})'
+    seen = {column: set() for column in KINDS[kind]['unique'] or ('pair',)}
+    try:
+        with connection() as conn:
+            if profile:
+                apply_profile(conn, profile)
+        for size, (valid, rejects) in _validated_batches(kind, rows, batch_size, workers):
+            if cancel is not None and cancel.is_set():
+                report.cancelled = True
+                break
+            with connection() as conn:
+                if not conn.in_transaction:
+                    # take the write lock before the constraint checks, so a row created by another
+                    # desk between the check and the insert can't make the whole batch fail
+                    conn.execute('BEGIN IMMEDIATE')
+                cursor = conn.cursor()
+                batch = _filter_batch(cursor, kind, valid, seen, rejects)
+                cursor.executemany(insert, batch)
+            report.processed += size
+            report.inserted += len(batch)
+            report.rejects.extend(sorted(rejects))
+            if progress is not None:
+                progress(report)
+    finally:
+        if profile:
+            with connection() as conn:
+                apply_profile(conn)
+        # the rows aren't published one by one: the subscribers reload what they show once
+        if report.inserted:
+            publish(KINDS[kind]['entity'], RELOAD)
+        report.done = True
+    return report
+
+# THIS FUNCTION IMPORTS A CSV FILE INTO THE DATABASE
+def import_csv(kind, path, **options):
+    """
+    Streams a CSV file into the database (see `import_rows` for the options).
+
+    Parameters:
+    ----------
+        kind (str): The table to import into ('students', 'instructors', 'courses' or 'registrations').
+        path (str): The path of the CSV file. Its first line must hold the column names of `KINDS[kind]`.
+
+    Returns:
+    -------
+        ImportReport: The final report of the import.
+    """
+    return import_rows(kind, read_csv(path), **options)
+
+
+if __name__ == '__main__':
+    # usage: python -m Classes.BulkImport students intake.csv [workers]
+    result = import_csv(sys.argv[1], sys.argv[2], workers=int(sys.argv[3]) if len(sys.argv) > 3 else 1,
+                        progress=lambda r: print(f"{r.processed} rows processed", end="\r"))
+    print()
+    print(result)
+    for line, reason in result.rejects:
+        print(f"line {line}: {reason}")
@@ -0,0 +1,139 @@
+import sys
+import threading
+from collections import OrderedDict
+
+# MAXIMUM NUMBER OF OBJECTS KEPT BY EACH ENTITY CACHE
+MAX_ENTRIES = 10000
+
+# THIS CLASS KEEPS THE OBJECTS LOADED FROM THE DATABASE SO THE SAME ROW GIVES THE SAME OBJECT
+class EntityCache:
+    """
+    Identity map of the objects of one table, keyed by their primary key.
+
+    Looking up a row that is already cached returns the object built for it the first
+    time, so it doesn't have to be built and validated again. The cache holds at most
+    `max_size` objects; the least recently used one is dropped when it is full. The
+    model classes keep it up to date when they write to the database (write-through).
+
+    Parameters:
+    ----------
+        name (str): The name of the cache, used in the statistics (e.g. the table name).
+        max_size (int): The maximum number of cached objects (default is `MAX_ENTRIES`).
+    """
+    def __init__(self, name, max_size=MAX_ENTRIES):
+        self.name = name
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    # THIS METHOD RETURNS THE CACHED OBJECT OF A KEY
+    def get(self, key):
+        """
+        Returns the cached object of a key and marks it as recently used.
+
+        Parameters:
+        ----------
+            key: The primary key of the row.
+
+        Returns:
+        -------
+            object: The cached object, or None if the key isn't cached.
+        """
+        with self._lock:
+            obj = self._entries.get(key)
+            if obj is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return obj
+
+    # THIS METHOD CACHES THE OBJECT OF A KEY
+    def put(self, key, obj):
+        """
+        Caches the object of a key, replacing the previous one, and drops the least
+        recently used objects if the cache is full.
+
+        Parameters:
+        ----------
+            key: The primary key of the row.
+            obj (object): The object built for the row.
+
+        Returns:
+        -------
+            object: The cached object (`obj`).
+        """
+        with self._lock:
+            self._entries[key] = obj
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return obj
+
+    # THIS METHOD DROPS THE OBJECT OF A KEY
+    def evict(self, key):
+        """
+        Drops the cached object of a key (e.g. after the row was changed or deleted).
+
+        Parameters:
+        ----------
+            key: The primary key of the row.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    # THIS METHOD EMPTIES THE CACHE
+    def clear(self):
+        """
+        Drops every cached object (e.g. after the database was changed outside of the models).
+        """
+        with self._lock:
+            self._entries.clear()
+
+    # THIS METHOD RETURNS THE STATISTICS OF THE CACHE
+    def stats(self):
+        """
+        Returns the statistics of the cache.
+
+        Returns:
+        -------
+            dict: The `name`, current `size` and `max_size` of the cache, and the number of
+            `hits`, `misses` and `evictions` so far.
+        """
+        with self._lock:
+            return {'name': self.name, 'size': len(self._entries), 'max_size': self.max_size,
+                    'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    # THIS METHOD RESETS THE STATISTICS OF THE CACHE
+    def reset_stats(self):
+        """
+        Resets the `hits`, `misses` and `evictions` counters to zero.
+        """
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+# THIS FUNCTION SHARES ONE COPY OF A STRING REPEATED ACROSS MANY OBJECTS
+def intern_text(value):
+    """
+    Returns the interned copy of a string, so every object holding the same text (e.g. the
+    name of a course, the email of the instructor of many courses) points to one string
+    instead of its own copy read from the database. Other values are returned unchanged.
+
+    Parameters:
+    ----------
+        value: The value to intern.
+
+    Returns:
+    -------
+        The interned string, or `value` itself if it isn't a string.
+    """
+    return sys.intern(value) if type(value) is str else value
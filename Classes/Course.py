@@ -1,13 +1,60 @@
 import json
 import os
 import sqlite3
+from collections import namedtuple
 
+from Classes import Database
+from Classes.Cache import EntityCache, intern_text
+from Classes.Database import connection, fetch_row, fetch_rows, get_connection, group_by_key, page_rows, unique_errors
+from Classes.Events import DELETE, INSERT, RELOAD, UPDATE, publish, publish_many, subscribe
 from Classes.Person import Instructor, Student
 
+# INSERT OF THE REGISTRATION OF A STUDENT, FROM THEIR EMAIL AND THE COURSE ID (an unknown email
+# leaves studentRowID NULL, which the NOT NULL constraint of the column refuses)
+STUDENT_REGISTRATION = '''
+    INSERT INTO enrollments (studentRowID, courseID)
+    VALUES ((SELECT id FROM students WHERE email = ?), ?)
+'''
+
+# OUTCOME OF A BATCH REGISTRATION: the number of (student, course) pairs registered, and of
+# the pairs skipped because the student was already registered to the course
+RegistrationCount = namedtuple('RegistrationCount', ('registered', 'skipped'))
+
 # THIS IS THE CLASS COURSE
 class Course:
+    # COLUMNS THE COURSES CAN BE PAGED BY, WITH A UNIQUE TIE-BREAKER WHEN THE COLUMN ISN'T UNIQUE
+    # (not the instructor: their email lives in the instructors table, so no index of the courses
+    # can serve that order and every page would join and sort all the courses)
+    PAGE_KEYS = {
+        'courseID': ('courseID',),
+        'courseName': ('courseName', 'courseID'),
+    }
+
+    # ATTRIBUTES OF A COURSE, STORED IN SLOTS INSTEAD OF A PER-OBJECT DICTIONARY
+    __slots__ = ('courseID', 'courseName', 'instructor', '_enrolledStudents')
+
+    # COLUMNS OF A COURSE AS PUBLISHED ON THE CHANGE BUS
+    COLUMNS = ('courseID', 'courseName', 'instructor')
+
+    # ERRORS RAISED WHEN A UNIQUE COLUMN OF A NEW COURSE IS ALREADY TAKEN
+    TAKEN = {'courseID': "Course ID already taken"}
+
+    # CONDITION PICKING THE COURSES A PERSON HAS (True) OR DOESN'T HAVE (False), FOR EACH ROLE;
+    # the email is turned into the row id of the person once, then only integers are compared
+    PERSON_COURSES = {
+        ('Student', True): '''EXISTS (SELECT 1 FROM enrollments e
+            WHERE e.studentRowID = (SELECT id FROM students WHERE email = ?) AND e.courseID = c.courseID)''',
+        ('Student', False): '''NOT EXISTS (SELECT 1 FROM enrollments e
+            WHERE e.studentRowID = (SELECT id FROM students WHERE email = ?) AND e.courseID = c.courseID)''',
+        ('Instructor', True): 'c.instructorRowID = (SELECT id FROM instructors WHERE email = ?)',
+        ('Instructor', False): 'c.instructorRowID IS NOT (SELECT id FROM instructors WHERE email = ?)',
+    }
+
+    # IDENTITY MAP OF THE COURSES LOADED FROM THE DATABASE, KEYED BY courseID
+    cache = EntityCache('courses')
+
     # CONSTRUCTOR
-    def __init__(self, courseID, courseName, instructor="", enrolledStudents=[]):
+    def __init__(self, courseID, courseName, instructor=None, enrolledStudents=None):
         """
         This function create a course object
 
@@ -15,8 +62,9 @@ class Course:
         ----------
             courseID (int): The unique identifier for the course.
             courseName (str): The name of the course.
-            instructor (str): The name of the instructor assigned to the course (default is an empty string).
-            enrolledStudents (list): A list of students enrolled in the course (default is an empty list).
+            instructor (str): The email of the instructor assigned to the course (default is None, no instructor;
+                an empty string is stored as None, the value of a course without instructor).
+            enrolledStudents (list): A list of students enrolled in the course (default is None, a new empty list).
 
         Raises:
         ------
@@ -25,23 +73,37 @@ class Course:
         if not isinstance(courseID, int) or not courseID:
             raise ValueError("Invalid course ID provided")        
         self.courseID = courseID
-        self.courseName = courseName
-        self.instructor = instructor
-        self.enrolledStudents = enrolledStudents
+        # the same names and instructor emails come back for many courses: keep one copy of each
+        self.courseName = intern_text(courseName)
+        self.instructor = intern_text(instructor) if instructor else None
+        # every object gets its own list, created the first time it is used (most objects
+        # loaded from the database never use it)
+        self._enrolledStudents = list(enrolledStudents) if enrolledStudents else None
+
+    # THIS PROPERTY RETURNS THE LIST OF THE STUDENTS OF THE COURSE, CREATING IT ON FIRST USE
+    @property
+    def enrolledStudents(self):
+        if self._enrolledStudents is None:
+            self._enrolledStudents = []
+        return self._enrolledStudents
+
+    @enrolledStudents.setter
+    def enrolledStudents(self, values):
+        self._enrolledStudents = list(values)
     
     # THIS METHOD VALIDATES DATA INPUTED AND ADDS COURSE TO THE DATABASE
     @classmethod
-    def create_course(cls, courseID, courseName, instructor=""):
+    def create_course(cls, courseID, courseName, instructor=None):
         """
-        This method checks whether the provided courseID is unique and not already 
-        present in the database. If the ID is valid and unique, a new course instance 
-        is created and added to the database.
+        This method creates a new course instance and adds it to the database. The
+        UNIQUE constraint of the courses table rejects a courseID that is already
+        present in the database.
 
         Parameters:
         ----------
             courseID (int): The unique identifier for the course.
             courseName (str): The name of the course.
-            instructor (str): The name of the instructor assigned to the course (default is an empty string).
+            instructor (str): The email of the instructor assigned to the course (default is None, no instructor).
 
         Returns:
         -------
@@ -50,56 +112,210 @@ class Course:
         Raises:
         ------
             ValueError: If the courseID already exists in the database or if invalid data is provided.
+            sqlite3.IntegrityError: If no instructor has the given email.
         """
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
-        # check that id is unique and not already taken
-        cursor.execute('''
-            SELECT * FROM courses WHERE courseID = ?
-        ''', (courseID,))
-        existing_course_id = cursor.fetchone()
-        if existing_course_id:
-            conn.close()
-            raise ValueError("Course ID already taken")
-        
         course = cls(courseID, courseName, instructor)
-        # create course instance in database
-        cursor.execute('''
-            INSERT INTO courses (courseID, courseName, instructor)
-            VALUES (?, ?, ?)
-        ''', (courseID, courseName, instructor))
-        conn.commit()
-        conn.close()
-        return course
+        # the UNIQUE constraint rejects a taken ID, in the same statement as the insert
+        with connection() as conn, unique_errors(cls.TAKEN):
+            cursor = conn.cursor()
+            # create course instance in database
+            cursor.execute('''
+                INSERT INTO courses (courseID, courseName, instructorRowID)
+                VALUES (?, ?, ?)
+            ''', (courseID, courseName, cls._instructor_row(cursor, course.instructor)))
+        publish('course', INSERT, courseID, new=course.as_row())
+        return cls.cache.put(courseID, course)
+
+    # THIS METHOD RETURNS THE COLUMNS OF THE COURSE AS A DICTIONARY
+    def as_row(self):
+        return {column: getattr(self, column) for column in self.COLUMNS}
 
     # THIS METHOD SAVES DATA OF A COURSE TO THE DATABSE
     def save_to_db(self):
         """
-        This method inserts or replaces the current `Course` instance data 
-        (courseID, courseName, and instructor) into the `courses` table of the 
-        SQLite database.
+        This method inserts the current `Course` instance data (courseID,
+        courseName, and instructor) into the `courses` table of the SQLite
+        database, or updates the row of its courseID if there is one.
 
         Raises:
         ------
-            sqlite3.Error: If there is an issue with the database operation.
+            sqlite3.Error: If there is an issue with the database operation (e.g. no instructor has its email).
         """
-        conn = sqlite3.connect('school_management.db') 
-        cursor = conn.cursor()
-        # SQL query to insert or replace course data based on the courseID
-        cursor.execute('''
-            INSERT OR REPLACE INTO courses (courseID, courseName, instructor)
-            VALUES (?, ?, ?)
-        ''', (self.courseID, self.courseName, self.instructor))
-        conn.commit() 
-        conn.close()  
+        with connection() as conn:
+            cursor = conn.cursor()
+            previous = fetch_row(cursor, 'course_instructors', self.COLUMNS, 'courseID', self.courseID)
+            # update the row in place: INSERT OR REPLACE would delete it first, and the
+            # foreign keys would delete the registrations of the course with it
+            cursor.execute('''
+                INSERT INTO courses (courseID, courseName, instructorRowID)
+                VALUES (?, ?, ?)
+                ON CONFLICT (courseID) DO UPDATE SET courseName = excluded.courseName, instructorRowID = excluded.instructorRowID
+            ''', (self.courseID, self.courseName, self._instructor_row(cursor, self.instructor)))
+        self.cache.put(self.courseID, self)
+        if previous != self.as_row():
+            publish('course', UPDATE if previous else INSERT, self.courseID, previous, self.as_row())
         print(f"Course {self.courseName} saved to the database.")
     
+    # THIS METHOD RENAMES A COURSE IN THE DATABASE
+    @classmethod
+    def update_in_db(cls, courseID, courseName=None):
+        """
+        This method changes the name of a course in the database (when a
+        non-empty name is given) and drops the cached `Course` object so the
+        next load reads the new name.
+
+        Parameters:
+        ----------
+            courseID (int): The ID of the course to update.
+            courseName (str): The new name of the course (optional).
+
+        Raises:
+        ------
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        if courseName:
+            cls._update(courseID, 'courseName', courseName)
+        cls.cache.evict(courseID)
+
+    # THIS METHOD ASSIGNS AN INSTRUCTOR TO A COURSE
+    @classmethod
+    def assign_instructor(cls, courseID, instructor):
+        """
+        This method sets the instructor of a course in the database and
+        drops the cached `Course` object so the next load reads the change.
+
+        Parameters:
+        ----------
+            courseID (int): The ID of the course.
+            instructor (str): The email of the instructor, or an empty string/None to unassign the course.
+
+        Raises:
+        ------
+            sqlite3.Error: If there is an issue with the database operation (e.g. no instructor has the email).
+        """
+        # an unassigned course has a NULL instructor, the only value the foreign key accepts besides an email
+        cls._update(courseID, 'instructor', instructor or None)
+        cls.cache.evict(courseID)
+
+    # THIS METHOD CHANGES ONE COLUMN OF A COURSE AND PUBLISHES THE CHANGE
+    @classmethod
+    def _update(cls, courseID, column, value):
+        with connection() as conn:
+            cursor = conn.cursor()
+            previous = fetch_row(cursor, 'course_instructors', cls.COLUMNS, 'courseID', courseID)
+            if column == 'instructor':
+                # the table holds the row id of the instructor, not their email
+                cursor.execute('UPDATE courses SET instructorRowID = ? WHERE courseID = ?',
+                               (cls._instructor_row(cursor, value), courseID))
+            else:
+                cursor.execute(f'UPDATE courses SET {column} = ? WHERE courseID = ?', (value, courseID))
+        if previous and previous[column] != value:
+            publish('course', UPDATE, courseID, previous, dict(previous, **{column: value}))
+
+    # THIS METHOD RETURNS THE ROW ID OF AN INSTRUCTOR FROM THEIR EMAIL
+    @staticmethod
+    def _instructor_row(cursor, email):
+        if not email:
+            return None
+        cursor.execute('SELECT id FROM instructors WHERE email = ?', (email,))
+        row = cursor.fetchone()
+        if row is None:
+            # what the foreign key raised when the courses held the email itself
+            raise sqlite3.IntegrityError("FOREIGN KEY constraint failed")
+        return row[0]
+
+    # THIS METHOD REGISTERS A STUDENT TO A COURSE
+    @classmethod
+    def register_student(cls, courseID, email):
+        """
+        This method registers a student to a course and publishes the new
+        registration on the change bus.
+
+        Parameters:
+        ----------
+            courseID (int): The ID of the course.
+            email (str): The email of the student.
+
+        Raises:
+        ------
+            sqlite3.Error: If there is an issue with the database operation (e.g. the student is already
+                registered, or the student or the course doesn't exist).
+        """
+        with connection() as conn:
+            conn.execute(STUDENT_REGISTRATION, (email, courseID))
+        registration = {'studentEmail': email, 'courseID': courseID}
+        publish('registration', INSERT, (email, courseID), new=registration)
+
+    # THIS METHOD REGISTERS MANY STUDENTS TO MANY COURSES AT ONCE
+    @classmethod
+    def register_students(cls, course_ids, emails):
+        """
+        This method registers every given student to every given course in
+        one transaction: the new (student, course) pairs are inserted with a
+        single `executemany` and committed once, and the pairs that are
+        already registered are skipped. The new registrations are published
+        on the change bus one by one, or as one `RELOAD` when there are more
+        than `Events.BATCH_PUBLISH_LIMIT` of them.
+
+        Parameters:
+        ----------
+            course_ids (iterable of int): The IDs of the courses.
+            emails (iterable of str): The emails of the students.
+
+        Returns:
+        -------
+            RegistrationCount: The number of pairs registered and skipped.
+
+        Raises:
+        ------
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        course_ids = list(dict.fromkeys(course_ids))
+        emails = list(dict.fromkeys(emails))
+        with connection() as conn:
+            if not conn.in_transaction:
+                # take the write lock before reading the registrations, so another desk can't
+                # register the same pairs between the check and the insert
+                conn.execute('BEGIN IMMEDIATE')
+            registered = Student.get_courses_for_students(emails)
+            new = [(email, courseID) for email in emails
+                   for courseID in course_ids if courseID not in registered[email]]
+            conn.executemany(STUDENT_REGISTRATION, new)
+        publish_many('registration', [(INSERT, (email, courseID), None, {'studentEmail': email, 'courseID': courseID})
+                                      for email, courseID in new])
+        return RegistrationCount(len(new), len(course_ids) * len(emails) - len(new))
+
+    # THIS METHOD UNREGISTERS A STUDENT FROM A COURSE
+    @classmethod
+    def unregister_student(cls, courseID, email):
+        """
+        This method removes the registration of a student to a course and
+        publishes the removal on the change bus.
+
+        Parameters:
+        ----------
+            courseID (int): The ID of the course.
+            email (str): The email of the student.
+
+        Raises:
+        ------
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        with connection() as conn:
+            cursor = conn.execute('''
+                DELETE FROM enrollments
+                WHERE studentRowID = (SELECT id FROM students WHERE email = ?) AND courseID = ?
+            ''', (email, courseID))
+        if cursor.rowcount:
+            registration = {'studentEmail': email, 'courseID': courseID}
+            publish('registration', DELETE, (email, courseID), registration)
+
     # THIS METHOD LOADS DATA OF A COURSE FROM THE COURSE DATABASE
     @classmethod
     def load_from_db(cls):
         """
         This method fetches all rows from the `courses` table in the SQLite 
-        database, converts each row into a `Course` instance, and returns 
+        database (with the email of their instructor), converts each row into a `Course` instance, and returns 
         a list of `Course` objects.
 
         Returns:
@@ -110,23 +326,134 @@ class Course:
         ------
             sqlite3.Error: If there is an issue with the database operation.
         """
-        courses = []
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT courseID, courseName, instructor FROM courses')
-        rows = cursor.fetchall()
-        for row in rows:
-            courseID, courseName, instructor = row
-            courses.append(cls(courseID, courseName, instructor))
-        conn.close()
-        return courses
+        return list(cls.iter_from_db())
+
+    # THIS METHOD STREAMS THE COURSES OF THE DATABASE ONE AT A TIME
+    @classmethod
+    def iter_from_db(cls, batch_size=None):
+        """
+        This method yields `Course` objects one at a time instead of building
+        the whole list. Rows are read from the `courses` table in chunks of
+        `batch_size` with `fetchmany`, so the first courses are available
+        before the rest of the table has been read.
+
+        Parameters:
+        ----------
+            batch_size (int): The number of rows fetched at a time (default is `Database.FETCH_SIZE`).
+
+        Yields:
+        ------
+            Course: The next course of the database.
+
+        Raises:
+        ------
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        cursor = get_connection().cursor()
+        cursor.execute('SELECT courseID, courseName, instructor FROM course_instructors')
+        while True:
+            rows = cursor.fetchmany(batch_size or Database.FETCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                yield cls._from_row(*row)
+
+    # THIS METHOD RETURNS THE COURSE OBJECT OF A ROW, REUSING THE CACHED ONE
+    @classmethod
+    def _from_row(cls, courseID, courseName, instructor):
+        course = cls.cache.get(courseID)
+        if course is None:
+            return cls.cache.put(courseID, cls(courseID, courseName, instructor))
+        # the row was already validated when it was cached; only take its latest values
+        course.courseName, course.instructor = intern_text(courseName), intern_text(instructor) if instructor else None
+        return course
+
+    # THIS METHOD RETURNS ONE COURSE BY ID
+    @classmethod
+    def get_by_id(cls, courseID):
+        """
+        This method returns the course with the given ID, from the cache
+        when it is there.
+
+        Parameters:
+        ----------
+            courseID (int): The ID of the course.
+
+        Returns:
+        -------
+            Course: The course, or None if there is no course with this ID.
+
+        Raises:
+        ------
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        course = cls.cache.get(courseID)
+        if course is not None:
+            return course
+        cursor = get_connection().cursor()
+        cursor.execute('SELECT courseID, courseName, instructor FROM course_instructors WHERE courseID = ?', (courseID,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return cls.cache.put(courseID, cls(*row))
+
+    # THIS METHOD RETURNS ONE PAGE OF COURSES USING KEYSET PAGINATION
+    @classmethod
+    def page_after(cls, last_key=None, limit=50, order_by='courseID', descending=False):
+        """
+        This method returns the page of courses that comes right after
+        `last_key`. The page is found with an index seek on the ordering
+        column instead of an OFFSET, so every page costs the same no matter
+        how deep into the table it is.
+
+        Parameters:
+        ----------
+            last_key: The key of the last course of the previous page, as returned by `page_key` (default is None, the first page).
+            limit (int): The maximum number of courses in the page (default is 50).
+            order_by (str): The column the courses are ordered by, one of `PAGE_KEYS` (default is 'courseID').
+            descending (bool): Whether the courses are returned in descending order (default is False).
+
+        Returns:
+        -------
+            list of Course: The courses of the page. The page is the last one when it holds fewer than `limit` courses.
+
+        Raises:
+        ------
+            ValueError: If `order_by` is not one of `PAGE_KEYS`.
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        if order_by not in cls.PAGE_KEYS:
+            raise ValueError(f"Cannot page courses by {order_by}")
+        rows = page_rows('course_instructors', ('courseID', 'courseName', 'instructor'), cls.PAGE_KEYS[order_by],
+                         last_key, limit, descending)
+        return [cls._from_row(*row) for row in rows]
+
+    # THIS METHOD RETURNS THE PAGING KEY OF A COURSE
+    @classmethod
+    def page_key(cls, course, order_by='courseID'):
+        """
+        This method returns the key to pass to `page_after` to get the page
+        following `course`.
+
+        Parameters:
+        ----------
+            course (Course): The last course of a page.
+            order_by (str): The column the courses are ordered by, one of `PAGE_KEYS` (default is 'courseID').
+
+        Returns:
+        -------
+            tuple: The values of the ordering columns of the course.
+        """
+        return tuple(getattr(course, column) for column in cls.PAGE_KEYS[order_by])
     
     # THIS METHOD DELETES COURSE OBJECT FROM DATABASE
     @classmethod
     def delete_from_db(cls,id):
         """
         This method deletes a row from the `courses` table in the SQLite 
-        database based on the provided courseID.
+        database based on the provided courseID. The foreign key of the
+        `enrollments` table deletes the registrations to the course with it;
+        they are published on the change bus as well.
 
         Parameters:
         ----------
@@ -136,13 +463,18 @@ class Course:
         ------
             sqlite3.Error: If there is an issue with the database operation.
         """
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            DELETE FROM courses WHERE courseID = ?
-        ''', (id,))
-        conn.commit() 
-        conn.close() 
+        with connection() as conn:
+            cursor = conn.cursor()
+            previous = fetch_row(cursor, 'course_instructors', cls.COLUMNS, 'courseID', id)
+            # the registrations the ON DELETE CASCADE of the foreign key is about to remove
+            registrations = fetch_rows(cursor, 'registrations', ('studentEmail', 'courseID'), 'courseID', id)
+            cursor.execute('''
+                DELETE FROM courses WHERE courseID = ?
+            ''', (id,))
+        cls.cache.evict(id)
+        publish_many('registration', [(DELETE, (row['studentEmail'], id), row, None) for row in registrations])
+        if previous:
+            publish('course', DELETE, id, previous)
         print(f"Course with ID {id} deleted from the database.")
     
     def get_students_for_course(self, course_id):
@@ -162,16 +494,98 @@ class Course:
         ------
             sqlite3.Error: If there is an issue with the database operation.
         """
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT studentEmail FROM registrations WHERE courseID = ?
-        ''', (course_id,))
-        student_emails = cursor.fetchall()  
-        student_emails = [email[0] for email in student_emails]  
-        conn.close()
-        return student_emails
-    
+        return self.get_students_for_courses([course_id])[course_id]
+
+    # THIS METHOD RETURNS THE STUDENTS OF MANY COURSES AT ONCE
+    @classmethod
+    def get_students_for_courses(cls, course_ids):
+        """
+        This method fetches the email addresses of the students registered
+        for each of the given courses. All the courses are looked up together
+        (one query per `Database.MAX_VARIABLES` courses) instead of one query
+        per course.
+
+        Parameters:
+        ----------
+            course_ids (iterable of int): The IDs of the courses.
+
+        Returns:
+        -------
+            dict: Every course ID mapped to the list of email addresses of its
+            enrolled students (an empty list for a course without students).
+
+        Raises:
+        ------
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        return group_by_key('''
+            SELECT e.courseID, s.email
+            FROM enrollments e JOIN students s ON s.id = e.studentRowID
+            WHERE e.courseID IN ({}) ORDER BY e.id
+        ''', course_ids)
+
+    # THIS METHOD RETURNS THE COURSES A STUDENT/INSTRUCTOR CAN REGISTER TO OR BE ASSIGNED TO
+    @classmethod
+    def available_courses_for(cls, email, role):
+        """
+        This method returns the courses a student isn't registered to, or
+        the courses an instructor isn't assigned to. The filtering is done by
+        SQLite with a NOT EXISTS lookup on the enrollments index, instead
+        of loading every course and checking it against the person's courses.
+
+        Parameters:
+        ----------
+            email (str): The email address of the student or instructor.
+            role (str): "Student" or "Instructor".
+
+        Returns:
+        -------
+            list of tuple: The (courseID, courseName) of the courses, ordered by courseID.
+
+        Raises:
+        ------
+            ValueError: If the role is neither "Student" nor "Instructor".
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        return cls._courses_for(email, role, False)
+
+    # THIS METHOD RETURNS THE COURSES A STUDENT IS REGISTERED TO OR AN INSTRUCTOR IS ASSIGNED TO
+    @classmethod
+    def registered_courses_for(cls, email, role):
+        """
+        This method returns the courses a student is registered to, or the
+        courses an instructor is assigned to, with an EXISTS lookup on the
+        enrollments index (or the instructor index of the courses).
+
+        Parameters:
+        ----------
+            email (str): The email address of the student or instructor.
+            role (str): "Student" or "Instructor".
+
+        Returns:
+        -------
+            list of tuple: The (courseID, courseName) of the courses, ordered by courseID.
+
+        Raises:
+        ------
+            ValueError: If the role is neither "Student" nor "Instructor".
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        return cls._courses_for(email, role, True)
+
+    # THIS METHOD RUNS THE QUERY OF THE COURSES A PERSON HAS, OR OF THE OTHER COURSES
+    @classmethod
+    def _courses_for(cls, email, role, registered):
+        if (role, registered) not in cls.PERSON_COURSES:
+            raise ValueError(f"Unknown role: {role}")
+        cursor = get_connection().cursor()
+        cursor.execute(f'''
+            SELECT c.courseID, c.courseName FROM courses c
+            WHERE {cls.PERSON_COURSES[role, registered]}
+            ORDER BY c.courseID
+        ''', (email,))
+        return cursor.fetchall()
+
     
     '''# THIS METHOD VALIDATES DATA INPUTED AND RETURNS THE COURSE OBJECT CREATED
     @classmethod
@@ -280,4 +694,15 @@ class Course:
             if instructor.email == email:
                 instructor_obj = instructor
         instructor_obj.assigned_courses.remove(self.courseName)
-        instructor_obj.save_to_file()'''
\ No newline at end of file
+        instructor_obj.save_to_file()'''
+
+# THIS FUNCTION DROPS THE CACHED COURSES WHOSE INSTRUCTOR CHANGED
+def _evict_courses(change):
+    # an instructor deleted or given a new email changes the instructor their courses point to,
+    # without going through the Course methods that keep the cache up to date
+    if change.op == RELOAD:
+        Course.cache.clear()
+    elif change.op == UPDATE and change.old['instructor'] != change.new['instructor']:
+        Course.cache.evict(change.key)
+
+subscribe(_evict_courses, 'course')
@@ -0,0 +1,420 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# PATH OF THE SQLite DATABASE USED BY THE SCHOOL MANAGEMENT SYSTEM
+DATABASE = 'school_management.db'
+
+# SQLite TUNING PROFILES (PRAGMA name -> value) APPLIED TO EVERY CONNECTION WHEN IT IS OPENED
+# (foreign_keys is off by default in SQLite: every profile turns it on so the cascades of the schema run)
+PROFILES = {
+    # GUI use: WAL lets the View All readers run while the Register tab writes
+    'interactive': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+        'foreign_keys': 'ON',
+    },
+    # large imports: bigger cache and no fsync per transaction
+    'bulk-load': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -131072,
+        'mmap_size': 1073741824,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,
+        'foreign_keys': 'ON',
+    },
+    # reporting: the connection refuses every write
+    'read-only': {
+        'cache_size': -32000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+        'query_only': 'ON',
+        'foreign_keys': 'ON',
+    },
+}
+
+# PROFILE OF THE CONNECTION THE SCHEMA MIGRATIONS RUN ON WHEN THE CURRENT PROFILE REFUSES WRITES
+WRITABLE_PROFILE = 'interactive'
+
+# NAME OF THE PROFILE USED FOR NEW CONNECTIONS (can be chosen with the SCHOOL_DB_PROFILE environment variable)
+PROFILE = os.environ.get('SCHOOL_DB_PROFILE', 'interactive')
+
+# NUMBER OF ROWS FETCHED AT A TIME WHEN STREAMING A TABLE
+FETCH_SIZE = 500
+
+# SQLite LIMITS THE NUMBER OF "?" PARAMETERS IN ONE QUERY
+MAX_VARIABLES = 900
+
+# every thread keeps its own connections (sqlite3 connections can't be shared between threads)
+_local = threading.local()
+_stats_lock = threading.Lock()
+_stats = {'opened': 0, 'reused': 0}
+
+# THIS FUNCTION OPENS A NEW SQLite CONNECTION
+def _open_connection(path):
+    """
+    Opens a new SQLite connection and records it in the connection counters.
+
+    Parameters:
+    ----------
+        path (str): The path of the SQLite database file.
+
+    Returns:
+    -------
+        sqlite3.Connection: The newly opened connection.
+    """
+    conn = sqlite3.connect(path)
+    apply_profile(conn)
+    with _stats_lock:
+        _stats['opened'] += 1
+    return conn
+
+# THIS FUNCTION APPLIES A TUNING PROFILE TO A CONNECTION
+def apply_profile(conn, name=None):
+    """
+    Applies the PRAGMA settings of a tuning profile to a connection.
+
+    Parameters:
+    ----------
+        conn (sqlite3.Connection): The connection to tune.
+        name (str): The name of the profile in `PROFILES` (default is the current `PROFILE`).
+
+    Raises:
+    ------
+        ValueError: If the profile name is unknown.
+    """
+    name = name or PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown database profile: {name}")
+    for pragma, value in PROFILES[name].items():
+        conn.execute(f'PRAGMA {pragma} = {value}')
+
+# THIS FUNCTION SELECTS THE TUNING PROFILE USED FOR NEW CONNECTIONS
+def set_profile(name):
+    """
+    Selects the tuning profile applied to every connection opened from now on.
+
+    The pooled connections of the current thread are closed so that they are reopened
+    with the new settings on their next use.
+
+    Parameters:
+    ----------
+        name (str): The name of the profile in `PROFILES`.
+
+    Raises:
+    ------
+        ValueError: If the profile name is unknown.
+    """
+    global PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown database profile: {name}")
+    PROFILE = name
+    close_connections()
+
+# THIS FUNCTION RETURNS THE POOLED CONNECTION OF THE CURRENT THREAD
+def get_connection(path=None):
+    """
+    Returns the pooled connection of the current thread, opening it on first use.
+
+    Connections are kept per thread and per database path, so every later call from
+    the same thread reuses the same connection instead of paying the setup cost again.
+
+    Parameters:
+    ----------
+        path (str): The path of the SQLite database file (default is `DATABASE`).
+
+    Returns:
+    -------
+        sqlite3.Connection: The connection owned by the current thread.
+    """
+    path = path or DATABASE
+    pool = getattr(_local, 'connections', None)
+    if pool is None:
+        pool = _local.connections = {}
+    conn = pool.get(path)
+    if conn is None:
+        conn = pool[path] = _open_connection(path)
+    else:
+        with _stats_lock:
+            _stats['reused'] += 1
+    return conn
+
+# THIS FUNCTION GIVES ACCESS TO THE DATABASE INSIDE A TRANSACTION
+@contextmanager
+def connection(path=None):
+    """
+    Context manager giving access to the pooled connection of the current thread.
+
+    The work done inside the outermost `with` block is committed when the block exits
+    normally and rolled back if an exception is raised. Nested blocks share the
+    transaction of the outermost one.
+
+    Parameters:
+    ----------
+        path (str): The path of the SQLite database file (default is `DATABASE`).
+
+    Yields:
+    ------
+        sqlite3.Connection: The connection owned by the current thread.
+    """
+    path = path or DATABASE
+    conn = get_connection(path)
+    depths = getattr(_local, 'depths', None)
+    if depths is None:
+        depths = _local.depths = {}
+    depths[path] = depths.get(path, 0) + 1
+    try:
+        yield conn
+    except BaseException:
+        depths[path] -= 1
+        if not depths[path]:
+            conn.rollback()
+        raise
+    else:
+        depths[path] -= 1
+        if not depths[path]:
+            conn.commit()
+
+# THIS FUNCTION GIVES ACCESS TO A CONNECTION THAT ACCEPTS WRITES, WHATEVER THE PROFILE
+@contextmanager
+def writable_connection(path=None):
+    """
+    Context manager giving access to a connection that accepts writes (e.g. to migrate
+    the schema).
+
+    This is the pooled connection of the current thread, unless the current profile
+    refuses writes (`read-only`): then a separate connection tuned with `WRITABLE_PROFILE`
+    is opened for the block and closed when it exits. The caller manages the transactions.
+
+    Parameters:
+    ----------
+        path (str): The path of the SQLite database file (default is `DATABASE`).
+
+    Yields:
+    ------
+        sqlite3.Connection: A connection accepting writes.
+    """
+    path = path or DATABASE
+    if PROFILES[PROFILE].get('query_only', 'OFF') == 'OFF':
+        yield get_connection(path)
+        return
+    conn = sqlite3.connect(path)
+    try:
+        apply_profile(conn, WRITABLE_PROFILE)
+        with _stats_lock:
+            _stats['opened'] += 1
+        yield conn
+    finally:
+        conn.close()
+
+# THIS FUNCTION CLOSES THE CONNECTIONS OF THE CURRENT THREAD
+def close_connections():
+    """
+    Closes every pooled connection owned by the current thread.
+
+    The next call to `get_connection` or `connection` from this thread opens a new one.
+    """
+    pool = getattr(_local, 'connections', None)
+    if pool:
+        for conn in pool.values():
+            conn.close()
+        pool.clear()
+
+# THIS FUNCTION RETURNS HOW MANY CONNECTIONS WERE OPENED VS REUSED
+def connection_stats():
+    """
+    Returns the connection counters of the connection manager.
+
+    Returns:
+    -------
+        dict: A dictionary with the number of connections `opened` and `reused` so far.
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+# THIS FUNCTION RESETS THE CONNECTION COUNTERS
+def reset_connection_stats():
+    """
+    Resets the `opened` and `reused` connection counters to zero.
+    """
+    with _stats_lock:
+        _stats['opened'] = 0
+        _stats['reused'] = 0
+
+# THIS FUNCTION RETURNS ONE PAGE OF A TABLE USING KEYSET (SEEK) PAGINATION
+def page_rows(table, columns, keys, last_key=None, limit=50, descending=False):
+    """
+    Returns the rows that come right after `last_key` in the order given by `keys`.
+
+    Instead of an OFFSET, the page starts with a `WHERE (keys) > (last_key)` condition,
+    so every page costs the same index seek whether it is the first page or the ten
+    thousandth.
+
+    Parameters:
+    ----------
+        table (str): The table to read.
+        columns (tuple of str): The columns to select.
+        keys (tuple of str): The columns the rows are ordered by. Together they must be unique.
+        last_key (tuple): The key values of the last row of the previous page (default is None, the first page).
+        limit (int): The maximum number of rows in the page (default is 50).
+        descending (bool): Whether the rows are returned in descending order (default is False).
+
+    Returns:
+    -------
+        list of tuple: The rows of the page.
+
+    Raises:
+    ------
+        sqlite3.Error: If there is an issue with the database operation.
+    """
+    query = f'SELECT {", ".join(columns)} FROM {table}'
+    params = []
+    if last_key is not None:
+        if not isinstance(last_key, tuple):
+            last_key = (last_key,)
+        operator = '<' if descending else '>'
+        query += f' WHERE ({", ".join(keys)}) {operator} ({", ".join("?" * len(keys))})'
+        params.extend(last_key)
+    order = 'DESC' if descending else 'ASC'
+    query += ' ORDER BY ' + ', '.join(f'{key} {order}' for key in keys) + ' LIMIT ?'
+    params.append(limit)
+    cursor = get_connection().cursor()
+    cursor.execute(query, params)
+    return cursor.fetchall()
+
+# THIS FUNCTION LOOKS UP THE VALUES RELATED TO MANY KEYS AT ONCE
+def group_by_key(query, keys):
+    """
+    Runs a lookup for a whole collection of keys and groups the results by key.
+
+    The keys are sent in an `IN (...)` list, so the lookup costs one query per
+    `MAX_VARIABLES` keys instead of one query per key.
+
+    Parameters:
+    ----------
+        query (str): The query, with `{}` in place of the list of "?" parameters. It must select (key, value) rows.
+        keys (iterable): The keys to look up.
+
+    Returns:
+    -------
+        dict: Every key mapped to the list of its values, in the order returned by the query
+        (an empty list for the keys without any value).
+
+    Raises:
+    ------
+        sqlite3.Error: If there is an issue with the database operation.
+    """
+    grouped = {key: [] for key in keys}
+    keys = list(grouped)
+    cursor = get_connection().cursor()
+    for start in range(0, len(keys), MAX_VARIABLES):
+        chunk = keys[start:start + MAX_VARIABLES]
+        cursor.execute(query.format(', '.join('?' * len(chunk))), chunk)
+        for key, value in cursor.fetchall():
+            grouped[key].append(value)
+    return grouped
+
+# THIS FUNCTION RETURNS THE COLUMNS OF ONE ROW AS A DICTIONARY
+def fetch_row(cursor, table, columns, key_column, key):
+    """
+    Reads one row of a table by a unique column (e.g. to publish its values before a change).
+
+    Parameters:
+    ----------
+        cursor (sqlite3.Cursor): The cursor to read with (e.g. the one of the current transaction).
+        table (str): The name of the table.
+        columns (tuple of str): The columns to read.
+        key_column (str): The unique column the row is found by.
+        key: The value of `key_column`.
+
+    Returns:
+    -------
+        dict: The columns of the row mapped to their values, or None if there is no such row.
+
+    Raises:
+    ------
+        sqlite3.Error: If there is an issue with the database operation.
+    """
+    cursor.execute(f'SELECT {", ".join(columns)} FROM {table} WHERE {key_column} = ?', (key,))
+    row = cursor.fetchone()
+    return None if row is None else dict(zip(columns, row))
+
+# THIS FUNCTION READS THE ROWS OF A TABLE MATCHING A VALUE OF A COLUMN
+def fetch_rows(cursor, table, columns, key_column, key):
+    """
+    Reads the rows of a table by a column that isn't unique (e.g. the rows a foreign key
+    cascade is about to change, to publish them once the change is committed).
+
+    Parameters:
+    ----------
+        cursor (sqlite3.Cursor): The cursor to read with (e.g. the one of the current transaction).
+        table (str): The name of the table.
+        columns (tuple of str): The columns to read.
+        key_column (str): The column the rows are found by.
+        key: The value of `key_column`.
+
+    Returns:
+    -------
+        list of dict: The columns of every row mapped to their values.
+
+    Raises:
+    ------
+        sqlite3.Error: If there is an issue with the database operation.
+    """
+    cursor.execute(f'SELECT {", ".join(columns)} FROM {table} WHERE {key_column} = ?', (key,))
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+# THIS FUNCTION RETURNS THE COLUMNS OF THE UNIQUE CONSTRAINT AN INSERT OR UPDATE BROKE
+def unique_columns(error):
+    """
+    Returns the columns named by the error SQLite raises when a UNIQUE constraint fails
+    (e.g. "UNIQUE constraint failed: students.email").
+
+    Parameters:
+    ----------
+        error (sqlite3.IntegrityError): The error raised by the statement.
+
+    Returns:
+    -------
+        tuple of str: The columns of the constraint (without the table name), or an empty
+        tuple if the error isn't about a UNIQUE constraint.
+    """
+    prefix = 'UNIQUE constraint failed: '
+    message = str(error)
+    if not message.startswith(prefix):
+        return ()
+    return tuple(column.split('.')[-1] for column in message[len(prefix):].split(', '))
+
+# THIS FUNCTION TURNS THE UNIQUE CONSTRAINT ERRORS OF SOME STATEMENTS INTO READABLE ERRORS
+@contextmanager
+def unique_errors(messages):
+    """
+    Context manager turning the `sqlite3.IntegrityError` raised when a UNIQUE constraint
+    fails into a `ValueError` with the message of its column (e.g. "Student ID already taken").
+    Letting the constraint reject the row is both cheaper and safer than checking with a
+    SELECT first: another connection can't insert the same value between the check and the
+    INSERT. Use it inside `connection()` so the transaction is rolled back.
+
+    Parameters:
+    ----------
+        messages (dict): The unique columns mapped to the message of their error.
+
+    Raises:
+    ------
+        ValueError: If a UNIQUE constraint on one of the columns of `messages` fails.
+        sqlite3.IntegrityError: If another constraint fails.
+    """
+    try:
+        yield
+    except sqlite3.IntegrityError as e:
+        column = next((column for column in unique_columns(e) if column in messages), None)
+        if column is None:
+            raise
+        raise ValueError(messages[column]) from e
@@ -0,0 +1,182 @@
+import threading
+from collections import namedtuple
+
+# OPERATIONS OF A CHANGE
+INSERT = 'insert'
+UPDATE = 'update'
+DELETE = 'delete'
+# many rows changed at once (e.g. a CSV import): the subscribers reload what they show
+RELOAD = 'reload'
+
+# ABOVE THIS NUMBER OF ROWS CHANGED AT ONCE, ONE RELOAD IS PUBLISHED INSTEAD OF ONE CHANGE PER ROW
+BATCH_PUBLISH_LIMIT = 100
+
+# ENTITIES THE MODELS PUBLISH CHANGES OF, WITH THE KEY IDENTIFYING A CHANGED ROW
+ENTITIES = {
+    'student': 'studentID',
+    'instructor': 'instructorID',
+    'course': 'courseID',
+    'registration': ('studentEmail', 'courseID'),
+}
+
+# ONE CHANGE OF THE DATABASE: the entity, the operation, the key of the row, and the
+# columns of the row before (None for an insert) and after (None for a delete) the change
+Change = namedtuple('Change', ('entity', 'op', 'key', 'old', 'new'))
+
+# THIS CLASS DELIVERS THE CHANGES PUBLISHED BY THE MODELS TO THEIR SUBSCRIBERS
+class ChangeBus:
+    """
+    Publish/subscribe bus of the changes made to the database through the models.
+
+    The models publish one `Change` per row they insert, update or delete, once the
+    transaction is committed, so the tabs can apply just that row to their dropdowns and
+    views instead of reloading them. Subscribers are called synchronously on the thread
+    that published the change; the GUIs relay the changes published by background
+    threads to their event loop (see `TkinterTabs.Changes` and `PyQtTabs.Changes`).
+    """
+    def __init__(self):
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    # THIS METHOD REGISTERS A FUNCTION CALLED FOR EVERY CHANGE OF SOME ENTITIES
+    def subscribe(self, callback, *entities):
+        """
+        Registers a function called with every published change of the given entities.
+
+        Parameters:
+        ----------
+            callback (callable): The function called with each `Change`.
+            *entities (str): The entities to receive the changes of (default is every entity).
+
+        Returns:
+        -------
+            callable: The callback, to pass to `unsubscribe`.
+
+        Raises:
+        ------
+            ValueError: If an entity is unknown.
+        """
+        for entity in entities:
+            if entity not in ENTITIES:
+                raise ValueError(f"Unknown entity: {entity}")
+        with self._lock:
+            self._subscribers.append((callback, frozenset(entities)))
+        return callback
+
+    # THIS METHOD REMOVES A SUBSCRIBER
+    def unsubscribe(self, callback):
+        """
+        Stops calling a function registered with `subscribe`.
+
+        Parameters:
+        ----------
+            callback (callable): The function to remove.
+        """
+        with self._lock:
+            self._subscribers = [subscriber for subscriber in self._subscribers if subscriber[0] is not callback]
+
+    # THIS METHOD DELIVERS A CHANGE TO ITS SUBSCRIBERS
+    def publish(self, entity, op, key=None, old=None, new=None):
+        """
+        Calls every subscriber of the entity with the change.
+
+        Parameters:
+        ----------
+            entity (str): The entity changed, one of `ENTITIES`.
+            op (str): The operation (`INSERT`, `UPDATE`, `DELETE` or `RELOAD`).
+            key: The key of the row changed (None for `RELOAD`).
+            old (dict): The columns of the row before the change (optional).
+            new (dict): The columns of the row after the change (optional).
+
+        Returns:
+        -------
+            Change: The change delivered.
+        """
+        change = Change(entity, op, key, old, new)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback, entities in subscribers:
+            if not entities or entity in entities:
+                callback(change)
+        return change
+
+# THE BUS THE MODELS PUBLISH THEIR CHANGES ON
+bus = ChangeBus()
+subscribe = bus.subscribe
+unsubscribe = bus.unsubscribe
+publish = bus.publish
+
+# THIS FUNCTION PUBLISHES THE CHANGES OF MANY ROWS OF ONE ENTITY
+def publish_many(entity, changes):
+    """
+    Publishes the changes of many rows of an entity (e.g. a batch registration, or the rows
+    a foreign key cascade changed), one by one or as one `RELOAD` when there are more than
+    `BATCH_PUBLISH_LIMIT` of them.
+
+    Parameters:
+    ----------
+        entity (str): The entity changed, one of `ENTITIES`.
+        changes (list of tuple): The (op, key, old, new) of every changed row.
+    """
+    if len(changes) > BATCH_PUBLISH_LIMIT:
+        publish(entity, RELOAD)
+        return
+    for op, key, old, new in changes:
+        publish(entity, op, key, old, new)
+
+# THIS FUNCTION APPLIES A CHANGE TO A LIST OF THE VALUES OF ONE COLUMN
+def apply_to_list(values, change, column):
+    """
+    Applies an insert, update or delete of the change bus to a list of the values of one
+    column (e.g. the emails listed in a dropdown).
+
+    Parameters:
+    ----------
+        values (list): The values, changed in place.
+        change (Change): The change published by the models.
+        column (str): The column of the changed rows the values come from.
+
+    Returns:
+    -------
+        bool: False if the change is a `RELOAD` and the values must be read again, True otherwise.
+    """
+    if change.op == RELOAD:
+        return False
+    old = change.old[column] if change.old else None
+    new = change.new[column] if change.new else None
+    if change.op == INSERT and new not in values:
+        values.append(new)
+    elif change.op == DELETE and old in values:
+        values.remove(old)
+    elif change.op == UPDATE and old != new:
+        if old in values:
+            values[values.index(old)] = new
+        elif new not in values:
+            values.append(new)
+    return True
+
+# THIS FUNCTION TELLS WHETHER A CHANGE CAN ALTER THE COURSES OF A PERSON
+def affects_courses_of(change, email):
+    """
+    Tells whether a change can alter the courses a student is registered to or an instructor
+    is assigned to, or the courses they can still register to or be assigned to, or the
+    labels ("ID - name") the Register tabs show for them.
+
+    Parameters:
+    ----------
+        change (Change): The change published by the models.
+        email (str): The email of the student or instructor.
+
+    Returns:
+    -------
+        bool: True if the courses of the person must be read again.
+    """
+    if change.op == RELOAD:
+        return change.entity in ('course', 'registration')
+    if change.entity == 'registration':
+        return change.key[0] == email
+    if change.entity == 'course':
+        if change.op != UPDATE or change.old['courseName'] != change.new['courseName']:
+            return True
+        return email in (change.old['instructor'], change.new['instructor'])
+    return False
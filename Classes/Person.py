@@ -1,8 +1,15 @@
 import json
-import sqlite3
+
+from Classes import Database
+from Classes.Cache import EntityCache
+from Classes.Database import connection, fetch_row, fetch_rows, get_connection, group_by_key, page_rows, unique_errors
+from Classes.Events import DELETE, INSERT, UPDATE, publish, publish_many
 
 # THIS IS THE SUPER CLASS PERSON
 class Person:
+    # ATTRIBUTES OF A PERSON, STORED IN SLOTS INSTEAD OF A PER-OBJECT DICTIONARY
+    __slots__ = ('name', 'age', 'email')
+
     # CONSTRUCTOR OF THE CLASS STUDENT
     def __init__(self, name, age, email):
         """
@@ -34,8 +41,34 @@ class Person:
 
 # THIS IS THE SUBCLASS STUDENT 
 class Student(Person):
+    # COLUMNS THE STUDENTS CAN BE PAGED BY, WITH A UNIQUE TIE-BREAKER WHEN THE COLUMN ISN'T UNIQUE
+    PAGE_KEYS = {
+        'studentID': ('studentID',),
+        'email': ('email',),
+        'name': ('name', 'studentID'),
+        'age': ('age', 'studentID'),
+    }
+
+    # ATTRIBUTES OF A STUDENT ADDED TO THOSE OF A PERSON
+    __slots__ = ('studentID', '_registered_courses')
+
+    # COLUMNS OF A STUDENT AS PUBLISHED ON THE CHANGE BUS
+    COLUMNS = ('name', 'age', 'email', 'studentID')
+
+    # ERRORS RAISED WHEN A UNIQUE COLUMN OF A NEW STUDENT IS ALREADY TAKEN
+    TAKEN = {
+        'studentID': "Student ID already taken",
+        'email': "Student email already taken",
+    }
+
+    # COLUMNS OF A REGISTRATION AS PUBLISHED ON THE CHANGE BUS
+    REGISTRATION_COLUMNS = ('studentEmail', 'courseID')
+
+    # IDENTITY MAP OF THE STUDENTS LOADED FROM THE DATABASE, KEYED BY studentID
+    cache = EntityCache('students')
+
     # CONSTRUCTOR
-    def __init__(self, name, age, email, studentID, registered_courses=[]):
+    def __init__(self, name, age, email, studentID, registered_courses=None):
         """
         This function creates a Student object and initializes the student's details, including their ID and registered courses.
 
@@ -45,7 +78,7 @@ class Student(Person):
             age (int): The age of the student. It must be a non-negative integer.
             email (str): The email address of the student. It must be a valid AUB email ending with '@mail.aub.edu'.
             studentID (int): The unique identifier for the student. It must be a non-empty integer.
-            registered_courses (list): A list of courses the student is registered for (default is an empty list).
+            registered_courses (list): A list of courses the student is registered for (default is None, a new empty list).
 
         Raises:
         ------
@@ -58,15 +91,28 @@ class Student(Person):
         if not isinstance(studentID, int) or not studentID:
             raise ValueError("Invalid student ID provided")
         self.studentID = studentID
-        self.registered_courses = registered_courses
+        # every object gets its own list, created the first time it is used (most objects
+        # loaded from the database never use it)
+        self._registered_courses = list(registered_courses) if registered_courses else None
+
+    # THIS PROPERTY RETURNS THE LIST OF THE COURSES OF THE STUDENT, CREATING IT ON FIRST USE
+    @property
+    def registered_courses(self):
+        if self._registered_courses is None:
+            self._registered_courses = []
+        return self._registered_courses
+
+    @registered_courses.setter
+    def registered_courses(self, values):
+        self._registered_courses = list(values)
     
     # THIS METHOD VALIDATES DATA INPUTED AND ADDS STUDENT TO THE DATABASE
     @classmethod
     def create_student(cls, name, age, email, studentID):
         """
         This method validates the input data and adds a new student to the database.
-        It checks whether the provided student ID and email are unique before creating a new
-        `Student` object and saving the details in the `students` table of the SQLite database.
+        It creates a new `Student` object and saves the details in the `students` table of the SQLite
+        database; the UNIQUE constraints of the table reject a student ID or email that is already taken.
 
         Parameters:
         ----------
@@ -85,33 +131,17 @@ class Student(Person):
             ValueError: If the email is already taken.
             ValueError: If the provided name, age, email, or studentID are invalid.
         """
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
-        # check that id is unique and not already taken
-        cursor.execute('''
-            SELECT * FROM students WHERE studentID = ?
-        ''', (studentID,))
-        existing_student_id = cursor.fetchone()
-        if existing_student_id:
-            conn.close()
-            raise ValueError("Student ID already taken")
-        # check that email is unique and not already taken
-        cursor.execute('''
-            SELECT * FROM students WHERE email = ?
-        ''', (email,))
-        existing_student_email = cursor.fetchone()
-        if existing_student_email:
-            conn.close()
-            raise ValueError("Student email already taken")
         student = cls(name, age, email, studentID)
-        # create student instance in database
-        cursor.execute('''
-            INSERT INTO students (name, age, email, studentID)
-            VALUES (?, ?, ?, ?)
-        ''', (name, age, email, studentID))
-        conn.commit()
-        conn.close()
-        return student
+        # the UNIQUE constraints reject a taken ID or email, in the same statement as the insert
+        with connection() as conn, unique_errors(cls.TAKEN):
+            cursor = conn.cursor()
+            # create student instance in database
+            cursor.execute('''
+                INSERT INTO students (name, age, email, studentID)
+                VALUES (?, ?, ?, ?)
+            ''', (name, age, email, studentID))
+        publish('student', INSERT, studentID, new=student.as_row())
+        return cls.cache.put(studentID, student)
     
     # THIS METHOD INTRODUCES THE STUDENT
     def introduce(self):
@@ -119,28 +149,82 @@ class Student(Person):
         print("ID: " + str(self.studentID))
         print("Registered Courses: " + ", ".join(self.registered_courses))       
     
+    # THIS METHOD RETURNS THE COLUMNS OF THE STUDENT AS A DICTIONARY
+    def as_row(self):
+        return {column: getattr(self, column) for column in self.COLUMNS}
+
     # THIS METHOD SAVES DATA OF A STUDENT TO THE DATABSE
     def save_to_db(self):
         """
         Saves the student data to the database.
-        This method inserts or replaces the current `Student` instance's data (name, age, email, and studentID)
-        in the `students` table of the SQLite database.
+        This method inserts the current `Student` instance's data (name, age, email, and studentID)
+        in the `students` table of the SQLite database, or updates the row of its studentID if there is one.
 
         Raises:
         ------
+            ValueError: If the email is already taken by another student.
             sqlite3.Error: If there is an issue with the database operation.
         """
-        conn = sqlite3.connect('school_management.db') 
-        cursor = conn.cursor()
-        # SQL query to insert or replace student data based on the studentID
-        cursor.execute('''
-            INSERT OR REPLACE INTO students (name, age, email, studentID)
-            VALUES (?, ?, ?, ?)
-        ''', (self.name, self.age, self.email, self.studentID))
-        conn.commit() 
-        conn.close()  
+        with connection() as conn, unique_errors(self.TAKEN):
+            cursor = conn.cursor()
+            previous = fetch_row(cursor, 'students', self.COLUMNS, 'studentID', self.studentID)
+            registrations = self._moved_registrations(cursor, previous, self.email)
+            # update the row in place: INSERT OR REPLACE would delete it first, and the
+            # foreign key would delete the registrations of the student with it
+            cursor.execute('''
+                INSERT INTO students (name, age, email, studentID)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (studentID) DO UPDATE SET name = excluded.name, age = excluded.age, email = excluded.email
+            ''', (self.name, self.age, self.email, self.studentID))
+        self.cache.put(self.studentID, self)
+        if previous != self.as_row():
+            publish('student', UPDATE if previous else INSERT, self.studentID, previous, self.as_row())
+        self._publish_registrations(registrations, self.email)
         print(f"Student {self.name} saved to the database.")
     
+    # THIS METHOD UPDATES THE INFORMATION OF A STUDENT IN THE DATABASE
+    @classmethod
+    def update_in_db(cls, studentID, name=None, age=None, email=None):
+        """
+        Updates the name, age and/or email of a student in the database.
+        Only the values that are given (and not empty) are changed, and the cached
+        `Student` object is dropped so the next load reads the new values. The
+        registrations refer to the student by row id, so they follow a new email;
+        they are published under it on the change bus.
+
+        Parameters:
+        ----------
+            studentID (int): The ID of the student to update.
+            name (str): The new name (optional).
+            age (int): The new age (optional).
+            email (str): The new email address (optional).
+
+        Raises:
+        ------
+            ValueError: If the email is already taken by another student.
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        with connection() as conn:
+            cursor = conn.cursor()
+            previous = fetch_row(cursor, 'students', cls.COLUMNS, 'studentID', studentID)
+            if name:
+                cursor.execute('UPDATE students SET name = ? WHERE studentID = ?', (name, studentID))
+            if age:
+                cursor.execute('UPDATE students SET age = ? WHERE studentID = ?', (age, studentID))
+            if email:
+                # check that the new email isn't already taken by another student
+                cursor.execute('SELECT email FROM students WHERE email = ? AND studentID != ?', (email, studentID))
+                if cursor.fetchone():
+                    raise ValueError("Student email already taken")
+                registrations = cls._moved_registrations(cursor, previous, email)
+                cursor.execute('UPDATE students SET email = ? WHERE studentID = ?', (email, studentID))
+            current = fetch_row(cursor, 'students', cls.COLUMNS, 'studentID', studentID)
+        cls.cache.evict(studentID)
+        if previous and current != previous:
+            publish('student', UPDATE, studentID, previous, current)
+        if email:
+            cls._publish_registrations(registrations, email)
+
     # THIS METHOD LOADS DATA OF A STUDENT FROM THE STUDENT DATABASE
     @classmethod
     def load_from_db(cls):
@@ -157,16 +241,148 @@ class Student(Person):
         ------
             sqlite3.Error: If there is an issue with the database operation.
         """
-        students = []
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
+        return list(cls.iter_from_db())
+
+    # THIS METHOD STREAMS THE STUDENTS OF THE DATABASE ONE AT A TIME
+    @classmethod
+    def iter_from_db(cls, batch_size=None):
+        """
+        Yields `Student` objects one at a time instead of building the whole list.
+        Rows are read from the `students` table in chunks of `batch_size` with `fetchmany`, so the
+        first students are available before the rest of the table has been read.
+
+        Parameters:
+        ----------
+            batch_size (int): The number of rows fetched at a time (default is `Database.FETCH_SIZE`).
+
+        Yields:
+        ------
+            Student: The next student of the database.
+
+        Raises:
+        ------
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        cursor = get_connection().cursor()
         cursor.execute('SELECT name, age, email, studentID FROM students')
-        rows = cursor.fetchall()
-        for row in rows:
-            name, age, email, studentID = row
-            students.append(cls(name, age, email, studentID))
-        conn.close()
-        return students
+        while True:
+            rows = cursor.fetchmany(batch_size or Database.FETCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                yield cls._from_row(*row)
+
+    # THIS METHOD RETURNS THE STUDENT OBJECT OF A ROW, REUSING THE CACHED ONE
+    @classmethod
+    def _from_row(cls, name, age, email, studentID):
+        student = cls.cache.get(studentID)
+        if student is None:
+            return cls.cache.put(studentID, cls(name, age, email, studentID))
+        # the row was already validated when it was cached; only take its latest values
+        student.name, student.age, student.email = name, age, email
+        return student
+
+    # THIS METHOD RETURNS ONE STUDENT BY ID
+    @classmethod
+    def get_by_id(cls, studentID):
+        """
+        Returns the student with the given ID, from the cache when it is there.
+
+        Parameters:
+        ----------
+            studentID (int): The ID of the student.
+
+        Returns:
+        -------
+            Student: The student, or None if there is no student with this ID.
+
+        Raises:
+        ------
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        student = cls.cache.get(studentID)
+        if student is not None:
+            return student
+        cursor = get_connection().cursor()
+        cursor.execute('SELECT name, age, email, studentID FROM students WHERE studentID = ?', (studentID,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return cls.cache.put(studentID, cls(*row))
+
+    # THIS METHOD RETURNS ONE PAGE OF STUDENTS USING KEYSET PAGINATION
+    @classmethod
+    def page_after(cls, last_key=None, limit=50, order_by='studentID', descending=False):
+        """
+        Returns the page of students that comes right after `last_key`.
+        The page is found with an index seek on the ordering column instead of an OFFSET, so
+        every page costs the same no matter how deep into the table it is.
+
+        Parameters:
+        ----------
+            last_key: The key of the last student of the previous page, as returned by `page_key` (default is None, the first page).
+            limit (int): The maximum number of students in the page (default is 50).
+            order_by (str): The column the students are ordered by, one of `PAGE_KEYS` (default is 'studentID').
+            descending (bool): Whether the students are returned in descending order (default is False).
+
+        Returns:
+        -------
+            list of Student: The students of the page. The page is the last one when it holds fewer than `limit` students.
+
+        Raises:
+        ------
+            ValueError: If `order_by` is not one of `PAGE_KEYS`.
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        if order_by not in cls.PAGE_KEYS:
+            raise ValueError(f"Cannot page students by {order_by}")
+        rows = page_rows('students', ('name', 'age', 'email', 'studentID'), cls.PAGE_KEYS[order_by],
+                         last_key, limit, descending)
+        return [cls._from_row(*row) for row in rows]
+
+    # THIS METHOD RETURNS THE PAGING KEY OF A STUDENT
+    @classmethod
+    def page_key(cls, student, order_by='studentID'):
+        """
+        Returns the key to pass to `page_after` to get the page following `student`.
+
+        Parameters:
+        ----------
+            student (Student): The last student of a page.
+            order_by (str): The column the students are ordered by, one of `PAGE_KEYS` (default is 'studentID').
+
+        Returns:
+        -------
+            tuple: The values of the ordering columns of the student.
+        """
+        return tuple(getattr(student, column) for column in cls.PAGE_KEYS[order_by])
+    
+    # THIS METHOD RETURNS THE COURSES OF MANY STUDENTS AT ONCE
+    @classmethod
+    def get_courses_for_students(cls, emails):
+        """
+        Returns the IDs of the courses each of the given students is registered for.
+        All the students are looked up together (one query per `Database.MAX_VARIABLES`
+        students) instead of one query per student.
+
+        Parameters:
+        ----------
+            emails (iterable of str): The email addresses of the students.
+
+        Returns:
+        -------
+            dict: Every email mapped to the list of course IDs the student is registered for
+            (an empty list for a student without courses).
+
+        Raises:
+        ------
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        return group_by_key('''
+            SELECT s.email, e.courseID
+            FROM students s JOIN enrollments e ON e.studentRowID = s.id
+            WHERE s.email IN ({}) ORDER BY e.id
+        ''', emails)
     
     # THIS METHOD DELETES STUDENT OBJECT FROM DATABASE
     @classmethod
@@ -174,7 +390,8 @@ class Student(Person):
         """
         Deletes a student from the database by studentID.
         This method deletes a row from the `students` table in the SQLite 
-        database based on the provided studentID.
+        database based on the provided studentID. The foreign key of the
+        `enrollments` table deletes the registrations of the student with it.
 
         Parameters:
         ----------
@@ -184,21 +401,70 @@ class Student(Person):
         ------
             sqlite3.Error: If there is an issue with the database operation.
         """
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            DELETE FROM students WHERE studentID = ?
-        ''', (id))
-        conn.commit() 
-        conn.close() 
+        # the Tkinter tabs pass the row returned by fetchone()
+        if isinstance(id, tuple):
+            id = id[0]
+        with connection() as conn:
+            cursor = conn.cursor()
+            previous = fetch_row(cursor, 'students', cls.COLUMNS, 'studentID', id)
+            registrations = cls._moved_registrations(cursor, previous, None)
+            cursor.execute('''
+                DELETE FROM students WHERE studentID = ?
+            ''', (id,))
+        cls.cache.evict(id)
+        cls._publish_registrations(registrations, None)
+        if previous:
+            publish('student', DELETE, id, previous)
         print(f"Student with ID {id} deleted from the database.")
 
+    # THIS METHOD READS THE REGISTRATIONS OF A STUDENT WHOSE EMAIL CHANGES (OR WHO IS DELETED)
+    @classmethod
+    def _moved_registrations(cls, cursor, previous, email):
+        if previous is None or previous['email'] == email:
+            return []
+        return fetch_rows(cursor, 'registrations', cls.REGISTRATION_COLUMNS, 'studentEmail', previous['email'])
+
+    # THIS METHOD PUBLISHES THE REGISTRATIONS UNDER THE NEW EMAIL OF THEIR STUDENT (OR AS DELETED, FOR None)
+    @staticmethod
+    def _publish_registrations(registrations, email):
+        if email is None:
+            changes = [(DELETE, (row['studentEmail'], row['courseID']), row, None) for row in registrations]
+        else:
+            changes = [(UPDATE, (email, row['courseID']), row, dict(row, studentEmail=email)) for row in registrations]
+        publish_many('registration', changes)
+
 # --------------------------------------------------------------------------------------------------------
 
 # THIS IS THE SUBCLASS INSTRUCTOR
 class Instructor(Person):
+    # COLUMNS THE INSTRUCTORS CAN BE PAGED BY, WITH A UNIQUE TIE-BREAKER WHEN THE COLUMN ISN'T UNIQUE
+    PAGE_KEYS = {
+        'instructorID': ('instructorID',),
+        'email': ('email',),
+        'name': ('name', 'instructorID'),
+        'age': ('age', 'instructorID'),
+    }
+
+    # ATTRIBUTES OF A INSTRUCTOR ADDED TO THOSE OF A PERSON
+    __slots__ = ('instructorID', '_assigned_courses')
+
+    # COLUMNS OF A INSTRUCTOR AS PUBLISHED ON THE CHANGE BUS
+    COLUMNS = ('name', 'age', 'email', 'instructorID')
+
+    # ERRORS RAISED WHEN A UNIQUE COLUMN OF A NEW INSTRUCTOR IS ALREADY TAKEN
+    TAKEN = {
+        'instructorID': "Instructor ID already taken",
+        'email': "Instructor email already taken",
+    }
+
+    # COLUMNS OF A COURSE AS PUBLISHED ON THE CHANGE BUS (see `Course.COLUMNS`)
+    COURSE_COLUMNS = ('courseID', 'courseName', 'instructor')
+
+    # IDENTITY MAP OF THE INSTRUCTORS LOADED FROM THE DATABASE, KEYED BY instructorID
+    cache = EntityCache('instructors')
+
     # CONSTRUCTOR 
-    def __init__(self, name, age, email, instructorID, assigned_courses=[]):
+    def __init__(self, name, age, email, instructorID, assigned_courses=None):
         """
         Initializes an Instructor object with the provided details.
 
@@ -208,7 +474,7 @@ class Instructor(Person):
             age (int): The age of the instructor. It must be a non-negative integer.
             email (str): The email address of the instructor. It must be a valid AUB email ending with '@mail.aub.edu'.
             instructorID (int): The unique identifier for the instructor. It must be a non-empty integer.
-            assigned_courses (list): A list of courses assigned to the instructor (default is an empty list).
+            assigned_courses (list): A list of courses assigned to the instructor (default is None, a new empty list).
 
         Raises:
         ------
@@ -218,16 +484,29 @@ class Instructor(Person):
         if not isinstance(instructorID, int) or not instructorID:
             raise ValueError("Invalid instructor ID provided")
         self.instructorID = instructorID
-        self.assigned_courses = assigned_courses
+        # every object gets its own list, created the first time it is used (most objects
+        # loaded from the database never use it)
+        self._assigned_courses = list(assigned_courses) if assigned_courses else None
+
+    # THIS PROPERTY RETURNS THE LIST OF THE COURSES OF THE INSTRUCTOR, CREATING IT ON FIRST USE
+    @property
+    def assigned_courses(self):
+        if self._assigned_courses is None:
+            self._assigned_courses = []
+        return self._assigned_courses
+
+    @assigned_courses.setter
+    def assigned_courses(self, values):
+        self._assigned_courses = list(values)
 
     # THIS METHOD VALIDATES DATA INPUTED AND ADDS INSTRUCTOR TO THE DATABASE
     @classmethod
     def create_instructor(cls, name, age, email, instructorID):
         """
         Validates the input data and adds a new instructor to the database.
-        This method checks whether the provided instructor ID and email are unique before 
-        creating a new `Instructor` object and saving the details in the `instructors` table 
-        of the SQLite database.
+        This method creates a new `Instructor` object and saves the details in the `instructors`
+        table of the SQLite database; the UNIQUE constraints of the table reject an instructor ID
+        or email that is already taken.
 
         Parameters:
         ----------
@@ -245,33 +524,17 @@ class Instructor(Person):
             ValueError: If the instructor ID or email is already taken.
             ValueError: If the provided name, age, email, or instructorID are invalid.
         """
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
-        # check that id is unique and not already taken
-        cursor.execute('''
-            SELECT * FROM instructors WHERE instructorID = ?
-        ''', (instructorID,))
-        existing_instructor_id = cursor.fetchone()
-        if existing_instructor_id:
-            conn.close()
-            raise ValueError("Instructor ID already taken")
-        # check that email is unique and not already taken
-        cursor.execute('''
-            SELECT * FROM instructors WHERE email = ?
-        ''', (email,))
-        existing_instructor_email = cursor.fetchone()
-        if existing_instructor_email:
-            conn.close()
-            raise ValueError("Instructor email already taken")
         instructor = cls(name, age, email, instructorID)
-        # create student instance in database
-        cursor.execute('''
-            INSERT INTO instructors (name, age, email, instructorID)
-            VALUES (?, ?, ?, ?)
-        ''', (name, age, email, instructorID))
-        conn.commit()
-        conn.close()
-        return instructor
+        # the UNIQUE constraints reject a taken ID or email, in the same statement as the insert
+        with connection() as conn, unique_errors(cls.TAKEN):
+            cursor = conn.cursor()
+            # create instructor instance in database
+            cursor.execute('''
+                INSERT INTO instructors (name, age, email, instructorID)
+                VALUES (?, ?, ?, ?)
+            ''', (name, age, email, instructorID))
+        publish('instructor', INSERT, instructorID, new=instructor.as_row())
+        return cls.cache.put(instructorID, instructor)
     
     # THIS METHOD ADDS COURSE TO ASSIGNED COURSES
     def assign_course(self, course):
@@ -283,28 +546,82 @@ class Instructor(Person):
         print("ID: " + str(self.instructorID))
         print("Assigned Courses: " + ", ".join(self.assigned_courses))
 
+    # THIS METHOD RETURNS THE COLUMNS OF THE INSTRUCTOR AS A DICTIONARY
+    def as_row(self):
+        return {column: getattr(self, column) for column in self.COLUMNS}
+
     # THIS METHOD SAVES DATA OF A INSTRUCTOR TO THE DATABSE
     def save_to_db(self):
         """
         Saves the instructor's data to the database.
-        This method inserts or replaces the current `Instructor` instance's data 
-        (name, age, email, and instructorID) in the `instructors` table of the SQLite database.
+        This method inserts the current `Instructor` instance's data (name, age, email, and instructorID)
+        in the `instructors` table of the SQLite database, or updates the row of its instructorID if there is one.
 
         Raises:
         ------
+            ValueError: If the email is already taken by another instructor.
             sqlite3.Error: If there is an issue with the database operation.
         """
-        conn = sqlite3.connect('school_management.db') 
-        cursor = conn.cursor()
-        # SQL query to insert or replace instructor data based on the instructorID
-        cursor.execute('''
-            INSERT OR REPLACE INTO instructors (name, age, email, instructorID)
-            VALUES (?, ?, ?, ?)
-        ''', (self.name, self.age, self.email, self.instructorID))
-        conn.commit() 
-        conn.close()  
+        with connection() as conn, unique_errors(self.TAKEN):
+            cursor = conn.cursor()
+            previous = fetch_row(cursor, 'instructors', self.COLUMNS, 'instructorID', self.instructorID)
+            courses = self._moved_courses(cursor, previous, self.email)
+            # update the row in place: INSERT OR REPLACE would delete it first, and the
+            # foreign key would unassign the courses of the instructor
+            cursor.execute('''
+                INSERT INTO instructors (name, age, email, instructorID)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (instructorID) DO UPDATE SET name = excluded.name, age = excluded.age, email = excluded.email
+            ''', (self.name, self.age, self.email, self.instructorID))
+        self.cache.put(self.instructorID, self)
+        if previous != self.as_row():
+            publish('instructor', UPDATE if previous else INSERT, self.instructorID, previous, self.as_row())
+        self._publish_courses(courses, self.email)
         print(f"Instructor {self.name} saved to the database.")
     
+    # THIS METHOD UPDATES THE INFORMATION OF AN INSTRUCTOR IN THE DATABASE
+    @classmethod
+    def update_in_db(cls, instructorID, name=None, age=None, email=None):
+        """
+        Updates the name, age and/or email of an instructor in the database.
+        Only the values that are given (and not empty) are changed, and the cached
+        `Instructor` object is dropped so the next load reads the new values. The
+        courses refer to the instructor by row id, so they follow a new email;
+        they are published under it on the change bus.
+
+        Parameters:
+        ----------
+            instructorID (int): The ID of the instructor to update.
+            name (str): The new name (optional).
+            age (int): The new age (optional).
+            email (str): The new email address (optional).
+
+        Raises:
+        ------
+            ValueError: If the email is already taken by another instructor.
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        with connection() as conn:
+            cursor = conn.cursor()
+            previous = fetch_row(cursor, 'instructors', cls.COLUMNS, 'instructorID', instructorID)
+            if name:
+                cursor.execute('UPDATE instructors SET name = ? WHERE instructorID = ?', (name, instructorID))
+            if age:
+                cursor.execute('UPDATE instructors SET age = ? WHERE instructorID = ?', (age, instructorID))
+            if email:
+                # check that the new email isn't already taken by another instructor
+                cursor.execute('SELECT email FROM instructors WHERE email = ? AND instructorID != ?', (email, instructorID))
+                if cursor.fetchone():
+                    raise ValueError("Instructor email already taken")
+                courses = cls._moved_courses(cursor, previous, email)
+                cursor.execute('UPDATE instructors SET email = ? WHERE instructorID = ?', (email, instructorID))
+            current = fetch_row(cursor, 'instructors', cls.COLUMNS, 'instructorID', instructorID)
+        cls.cache.evict(instructorID)
+        if previous and current != previous:
+            publish('instructor', UPDATE, instructorID, previous, current)
+        if email:
+            cls._publish_courses(courses, email)
+
     # THIS METHOD LOADS DATA OF A INSTRUCTOR FROM THE INSTRUCTOR DATABASE
     @classmethod
     def load_from_db(cls):
@@ -321,16 +638,148 @@ class Instructor(Person):
         ------
             sqlite3.Error: If there is an issue with the database operation.
         """
-        instructors = []
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
+        return list(cls.iter_from_db())
+
+    # THIS METHOD STREAMS THE INSTRUCTORS OF THE DATABASE ONE AT A TIME
+    @classmethod
+    def iter_from_db(cls, batch_size=None):
+        """
+        Yields `Instructor` objects one at a time instead of building the whole list.
+        Rows are read from the `instructors` table in chunks of `batch_size` with `fetchmany`, so the
+        first instructors are available before the rest of the table has been read.
+
+        Parameters:
+        ----------
+            batch_size (int): The number of rows fetched at a time (default is `Database.FETCH_SIZE`).
+
+        Yields:
+        ------
+            Instructor: The next instructor of the database.
+
+        Raises:
+        ------
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        cursor = get_connection().cursor()
         cursor.execute('SELECT name, age, email, instructorID FROM instructors')
-        rows = cursor.fetchall()
-        for row in rows:
-            name, age, email, instructorID = row
-            instructors.append(cls(name, age, email, instructorID))
-        conn.close()
-        return instructors    
+        while True:
+            rows = cursor.fetchmany(batch_size or Database.FETCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                yield cls._from_row(*row)
+
+    # THIS METHOD RETURNS THE INSTRUCTOR OBJECT OF A ROW, REUSING THE CACHED ONE
+    @classmethod
+    def _from_row(cls, name, age, email, instructorID):
+        instructor = cls.cache.get(instructorID)
+        if instructor is None:
+            return cls.cache.put(instructorID, cls(name, age, email, instructorID))
+        # the row was already validated when it was cached; only take its latest values
+        instructor.name, instructor.age, instructor.email = name, age, email
+        return instructor
+
+    # THIS METHOD RETURNS ONE INSTRUCTOR BY ID
+    @classmethod
+    def get_by_id(cls, instructorID):
+        """
+        Returns the instructor with the given ID, from the cache when it is there.
+
+        Parameters:
+        ----------
+            instructorID (int): The ID of the instructor.
+
+        Returns:
+        -------
+            Instructor: The instructor, or None if there is no instructor with this ID.
+
+        Raises:
+        ------
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        instructor = cls.cache.get(instructorID)
+        if instructor is not None:
+            return instructor
+        cursor = get_connection().cursor()
+        cursor.execute('SELECT name, age, email, instructorID FROM instructors WHERE instructorID = ?', (instructorID,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return cls.cache.put(instructorID, cls(*row))
+
+    # THIS METHOD RETURNS ONE PAGE OF INSTRUCTORS USING KEYSET PAGINATION
+    @classmethod
+    def page_after(cls, last_key=None, limit=50, order_by='instructorID', descending=False):
+        """
+        Returns the page of instructors that comes right after `last_key`.
+        The page is found with an index seek on the ordering column instead of an OFFSET, so
+        every page costs the same no matter how deep into the table it is.
+
+        Parameters:
+        ----------
+            last_key: The key of the last instructor of the previous page, as returned by `page_key` (default is None, the first page).
+            limit (int): The maximum number of instructors in the page (default is 50).
+            order_by (str): The column the instructors are ordered by, one of `PAGE_KEYS` (default is 'instructorID').
+            descending (bool): Whether the instructors are returned in descending order (default is False).
+
+        Returns:
+        -------
+            list of Instructor: The instructors of the page. The page is the last one when it holds fewer than `limit` instructors.
+
+        Raises:
+        ------
+            ValueError: If `order_by` is not one of `PAGE_KEYS`.
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        if order_by not in cls.PAGE_KEYS:
+            raise ValueError(f"Cannot page instructors by {order_by}")
+        rows = page_rows('instructors', ('name', 'age', 'email', 'instructorID'), cls.PAGE_KEYS[order_by],
+                         last_key, limit, descending)
+        return [cls._from_row(*row) for row in rows]
+
+    # THIS METHOD RETURNS THE PAGING KEY OF AN INSTRUCTOR
+    @classmethod
+    def page_key(cls, instructor, order_by='instructorID'):
+        """
+        Returns the key to pass to `page_after` to get the page following `instructor`.
+
+        Parameters:
+        ----------
+            instructor (Instructor): The last instructor of a page.
+            order_by (str): The column the instructors are ordered by, one of `PAGE_KEYS` (default is 'instructorID').
+
+        Returns:
+        -------
+            tuple: The values of the ordering columns of the instructor.
+        """
+        return tuple(getattr(instructor, column) for column in cls.PAGE_KEYS[order_by])
+    
+    # THIS METHOD RETURNS THE COURSES OF MANY INSTRUCTORS AT ONCE
+    @classmethod
+    def get_courses_for_instructors(cls, emails):
+        """
+        Returns the IDs of the courses assigned to each of the given instructors.
+        All the instructors are looked up together (one query per `Database.MAX_VARIABLES`
+        instructors) instead of one query per instructor.
+
+        Parameters:
+        ----------
+            emails (iterable of str): The email addresses of the instructors.
+
+        Returns:
+        -------
+            dict: Every email mapped to the list of course IDs assigned to the instructor
+            (an empty list for an instructor without courses).
+
+        Raises:
+        ------
+            sqlite3.Error: If there is an issue with the database operation.
+        """
+        return group_by_key('''
+            SELECT i.email, c.courseID
+            FROM instructors i JOIN courses c ON c.instructorRowID = i.id
+            WHERE i.email IN ({}) ORDER BY c.id
+        ''', emails)
     
     # THIS METHOD DELETES AN INSTRUCTOR OBJECT FROM DATABASE
     @classmethod
@@ -338,7 +787,8 @@ class Instructor(Person):
         """
         Deletes an instructor from the database by instructorID.
         This method deletes a row from the `instructors` table in the SQLite database 
-        based on the provided instructorID.
+        based on the provided instructorID. The foreign key of the `courses` table
+        unassigns the courses of the instructor (their instructor becomes NULL).
 
         Parameters:
         ----------
@@ -348,15 +798,34 @@ class Instructor(Person):
         ------
             sqlite3.Error: If there is an issue with the database operation.
         """    
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            DELETE FROM instructors WHERE instructorID = ?
-        ''', (id))
-        conn.commit() 
-        conn.close() 
+        # the Tkinter tabs pass the row returned by fetchone()
+        if isinstance(id, tuple):
+            id = id[0]
+        with connection() as conn:
+            cursor = conn.cursor()
+            previous = fetch_row(cursor, 'instructors', cls.COLUMNS, 'instructorID', id)
+            courses = cls._moved_courses(cursor, previous, None)
+            cursor.execute('''
+                DELETE FROM instructors WHERE instructorID = ?
+            ''', (id,))
+        cls.cache.evict(id)
+        cls._publish_courses(courses, None)
+        if previous:
+            publish('instructor', DELETE, id, previous)
         print(f"Instructor with ID {id} deleted from the database.")   
 
+    # THIS METHOD READS THE COURSES OF AN INSTRUCTOR WHOSE EMAIL CHANGES (OR WHO IS DELETED)
+    @classmethod
+    def _moved_courses(cls, cursor, previous, email):
+        if previous is None or previous['email'] == email:
+            return []
+        return fetch_rows(cursor, 'course_instructors', cls.COURSE_COLUMNS, 'instructor', previous['email'])
+
+    # THIS METHOD PUBLISHES THE COURSES UNDER THE NEW EMAIL OF THEIR INSTRUCTOR (OR AS UNASSIGNED, FOR None)
+    @staticmethod
+    def _publish_courses(courses, email):
+        publish_many('course', [(UPDATE, row['courseID'], row, dict(row, instructor=email)) for row in courses])
+
 
     '''
     ------------------------------------------------------------------------------------------------------------
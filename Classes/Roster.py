@@ -0,0 +1,324 @@
+from Classes import Database
+from Classes.Course import Course
+from Classes.Database import MAX_VARIABLES, get_connection
+from Classes.Events import RELOAD, UPDATE
+from Classes.Person import Instructor, Student
+
+# HOW EACH ROSTER IS BUILT: the base table (or view), its columns, the paging keys of its model,
+# the column identifying a row, the JOIN/value aggregated into one "a, b, c" column, and the
+# entities of the change bus whose changes show up in the roster
+ROSTERS = {
+    'students': {
+        'table': 'students',
+        'columns': ('name', 'age', 'email', 'studentID'),
+        'page_keys': Student.PAGE_KEYS,
+        'key': 'email',
+        'join': '''
+            LEFT JOIN enrollments e ON e.studentRowID = t.id
+            LEFT JOIN courses c ON c.courseID = e.courseID
+        ''',
+        'aggregate': 'c.courseName',
+        'entities': ('student', 'registration', 'course'),
+    },
+    'instructors': {
+        'table': 'instructors',
+        'columns': ('name', 'age', 'email', 'instructorID'),
+        'page_keys': Instructor.PAGE_KEYS,
+        'key': 'email',
+        'join': '''
+            LEFT JOIN courses c ON c.instructorRowID = t.id
+        ''',
+        'aggregate': 'c.courseName',
+        'entities': ('instructor', 'course'),
+    },
+    'courses': {
+        'table': 'course_instructors',
+        'columns': ('courseName', 'courseID', 'instructor'),
+        'page_keys': Course.PAGE_KEYS,
+        'key': 'courseID',
+        'join': '''
+            LEFT JOIN enrollments e ON e.courseID = t.courseID
+            LEFT JOIN students s ON s.id = e.studentRowID
+        ''',
+        'aggregate': 's.email',
+        'entities': ('course', 'registration'),
+    },
+}
+
+# DEFAULT ORDER OF THE ROWS OF EACH ROSTER
+DEFAULT_ORDER = {'students': 'name', 'instructors': 'name', 'courses': 'courseName'}
+
+# THIS FUNCTION BUILDS THE SINGLE QUERY RETURNING A ROSTER
+def _roster_query(kind, last_key, limit, order_by, descending, keys):
+    roster = ROSTERS[kind]
+    if order_by not in roster['page_keys']:
+        raise ValueError(f"Cannot order {kind} by {order_by}")
+    order_keys = roster['page_keys'][order_by]
+    direction = 'DESC' if descending else 'ASC'
+    conditions = []
+    params = []
+    if last_key is not None:
+        if not isinstance(last_key, tuple):
+            last_key = (last_key,)
+        operator = '<' if descending else '>'
+        conditions.append(f'({", ".join(order_keys)}) {operator} ({", ".join("?" * len(order_keys))})')
+        params.extend(last_key)
+    if keys is not None:
+        keys = list(keys)
+        conditions.append(f'{roster["key"]} IN ({", ".join("?" * len(keys))})')
+        params.extend(keys)
+    # the page of base rows is picked first, then only those rows are joined and aggregated
+    base = f'SELECT * FROM {roster["table"]}'
+    if conditions:
+        base += ' WHERE ' + ' AND '.join(conditions)
+    base += ' ORDER BY ' + ', '.join(f'{column} {direction}' for column in order_keys)
+    if limit is not None:
+        base += ' LIMIT ?'
+        params.append(limit)
+    query = f'''
+        SELECT {", ".join("t." + column for column in roster["columns"])}, group_concat({roster["aggregate"]}, ', ')
+        FROM ({base}) t
+        {roster["join"]}
+        GROUP BY t.id
+        ORDER BY {", ".join(f"t.{column} {direction}" for column in order_keys)}
+    '''
+    return query, params
+
+# THIS FUNCTION STREAMS A ROSTER ONE ROW AT A TIME
+def iter_roster(kind, last_key=None, limit=None, order_by=None, descending=False, keys=None):
+    """
+    Streams a roster: every student with their course names, every instructor with
+    their assigned course names, or every course with its enrolled student emails.
+
+    The whole roster is computed by a single JOIN/`group_concat` query, instead of one
+    query per row to look up the related courses or students.
+
+    Parameters:
+    ----------
+        kind (str): The roster to read ('students', 'instructors' or 'courses').
+        last_key (tuple): Only return the rows after this paging key, as returned by `row_key` (default is None).
+        limit (int): The maximum number of rows to return (default is None, no limit).
+        order_by (str): The column the rows are ordered by, one of the model's `PAGE_KEYS` (default is the name).
+        descending (bool): Whether the rows are returned in descending order (default is False).
+        keys (iterable): Only return the rows with these emails (people) or course IDs (courses) (default is None, all rows).
+
+    Yields:
+    ------
+        tuple: The columns of `ROSTERS[kind]['columns']` followed by the aggregated names,
+        joined by ", " (an empty string when there are none).
+
+    Raises:
+    ------
+        ValueError: If the kind or `order_by` is unknown.
+        sqlite3.Error: If there is an issue with the database operation.
+    """
+    if kind not in ROSTERS:
+        raise ValueError(f"Unknown roster: {kind}")
+    query, params = _roster_query(kind, last_key, limit, order_by or DEFAULT_ORDER[kind], descending, keys)
+    cursor = get_connection().cursor()
+    cursor.execute(query, params)
+    while True:
+        rows = cursor.fetchmany(Database.FETCH_SIZE)
+        if not rows:
+            break
+        for row in rows:
+            yield row[:-1] + (row[-1] or "",)
+
+# THIS FUNCTION RETURNS A ROSTER (OR ONE PAGE OF IT) AS A LIST
+def roster(kind, last_key=None, limit=None, order_by=None, descending=False, keys=None):
+    """
+    Returns a roster as a list of rows (see `iter_roster` for the parameters).
+
+    Returns:
+    -------
+        list of tuple: The rows of the roster.
+    """
+    return list(iter_roster(kind, last_key, limit, order_by, descending, keys))
+
+# THIS FUNCTION RETURNS THE PAGING KEY OF A ROSTER ROW
+def row_key(kind, row, order_by=None):
+    """
+    Returns the key to pass as `last_key` to get the rows following `row`.
+
+    Parameters:
+    ----------
+        kind (str): The roster the row belongs to ('students', 'instructors' or 'courses').
+        row (tuple): A row returned by `roster` or `iter_roster`.
+        order_by (str): The column the rows are ordered by (default is the name).
+
+    Returns:
+    -------
+        tuple: The values of the ordering columns of the row.
+    """
+    columns = ROSTERS[kind]['columns']
+    order_keys = ROSTERS[kind]['page_keys'][order_by or DEFAULT_ORDER[kind]]
+    return tuple(row[columns.index(column)] for column in order_keys)
+
+# SHORTCUTS FOR THE THREE ROSTERS
+def student_roster(**options):
+    """
+    Returns every student with the names of their registered courses (see `iter_roster`).
+    """
+    return roster('students', **options)
+
+def instructor_roster(**options):
+    """
+    Returns every instructor with the names of their assigned courses (see `iter_roster`).
+    """
+    return roster('instructors', **options)
+
+def course_roster(**options):
+    """
+    Returns every course with the emails of its enrolled students (see `iter_roster`).
+    """
+    return roster('courses', **options)
+
+# THIS FUNCTION STREAMS A WHOLE ROSTER ONE PAGE (ONE QUERY) AT A TIME
+def iter_roster_pages(kind, order_by=None, descending=False, page_size=100):
+    """
+    Streams a whole roster, reading it one keyset page at a time.
+
+    Unlike `iter_roster`, no cursor is kept open between two pages, so the stream can
+    be consumed slowly (e.g. as the user scrolls) without holding a read transaction.
+
+    Parameters:
+    ----------
+        kind (str): The roster to read ('students', 'instructors' or 'courses').
+        order_by (str): The column the rows are ordered by, one of the model's `PAGE_KEYS` (default is the name).
+        descending (bool): Whether the rows are returned in descending order (default is False).
+        page_size (int): The number of rows read per query (default is 100).
+
+    Yields:
+    ------
+        tuple: The rows of the roster (see `iter_roster`).
+    """
+    last_key = None
+    while True:
+        rows = roster(kind, last_key, page_size, order_by, descending)
+        yield from rows
+        if len(rows) < page_size:
+            return
+        last_key = row_key(kind, rows[-1], order_by)
+
+# THIS FUNCTION RETURNS THE KEYS OF THE ROSTER ROWS A CHANGE CAN ALTER
+def changed_keys(kind, change):
+    """
+    Returns the roster rows a change of the change bus can alter.
+
+    Parameters:
+    ----------
+        kind (str): The roster ('students', 'instructors' or 'courses').
+        change (Events.Change): The change published by the models.
+
+    Returns:
+    -------
+        set: The emails (people) or course IDs (courses) of the rows to read again, or
+        None if the change can alter any row (a `RELOAD`).
+
+    Raises:
+    ------
+        sqlite3.Error: If there is an issue with the database operation.
+    """
+    if change.op == RELOAD:
+        return None
+    rows = [row for row in (change.old, change.new) if row]
+    entity = change.entity
+    if entity not in ROSTERS[kind]['entities']:
+        return set()
+    # a change of the rows of the roster itself
+    if kind == 'students' and entity == 'student' or kind == 'instructors' and entity == 'instructor':
+        return {row['email'] for row in rows}
+    if kind == 'courses' and entity == 'course':
+        return {change.key}
+    if entity == 'registration':
+        email, course_id = change.key
+        return {email} if kind == 'students' else {course_id}
+    # a course shows up in the students (by name) and instructors (by name and instructor) rosters
+    if change.op == UPDATE and change.old['courseName'] == change.new['courseName']:
+        if kind == 'students' or change.old['instructor'] == change.new['instructor']:
+            return set()
+    if kind == 'students':
+        return set(Course.get_students_for_courses([change.key])[change.key])
+    return {row['instructor'] for row in rows if row['instructor']}
+
+# THIS FUNCTION RETURNS THE SORT KEY OF A ROSTER ROW, WITH NULLS FIRST AS IN SQLite
+def _sort_key(kind, order_by):
+    indexes = [ROSTERS[kind]['columns'].index(column) for column in ROSTERS[kind]['page_keys'][order_by]]
+    return lambda row: tuple((row[i] is not None, row[i]) for i in indexes)
+
+# THIS FUNCTION RETURNS WHERE A ROW GOES IN A LIST OF SORTED ROWS
+def _position(rows, row, sort_key, descending):
+    target = sort_key(row)
+    low, high = 0, len(rows)
+    while low < high:
+        middle = (low + high) // 2
+        value = sort_key(rows[middle])
+        if (value > target) if descending else (value < target):
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+# THIS FUNCTION WORKS OUT HOW TO APPLY A CHANGE TO THE ROWS OF A ROSTER BEING SHOWN
+def roster_edits(kind, rows, change, order_by=None, descending=False, complete=True):
+    """
+    Returns the edits that bring the rows of a roster being shown up to date with a change,
+    so a view can apply just the rows the change altered instead of reloading.
+
+    Only the rows the change can alter (see `changed_keys`) are read again. A row whose
+    position in the order didn't change is updated in place; otherwise it is removed and
+    inserted again at its new position. New rows are only inserted when their position is
+    among the rows loaded so far (or when the whole roster is loaded): the next pages read
+    the other ones. Rows shown in the order of a search (no `order_by`) are only updated or
+    removed, never inserted.
+
+    Parameters:
+    ----------
+        kind (str): The roster ('students', 'instructors' or 'courses').
+        rows (list of tuple): The rows shown, as returned by `roster` (the last column may be formatted).
+        change (Events.Change): The change published by the models.
+        order_by (str): The column the rows are ordered by (default is None, the order of a search).
+        descending (bool): Whether the rows are in descending order (default is False).
+        complete (bool): Whether `rows` holds the whole roster (default is True).
+
+    Returns:
+    -------
+        list of tuple: The edits to apply in order: ('update', index, row), ('delete', index)
+        and ('insert', index, row), or None if the whole roster must be reloaded.
+
+    Raises:
+    ------
+        sqlite3.Error: If there is an issue with the database operation.
+    """
+    keys = changed_keys(kind, change)
+    if keys is None or len(keys) > MAX_VARIABLES:
+        return None
+    if not keys:
+        return []
+    key_index = ROSTERS[kind]['columns'].index(ROSTERS[kind]['key'])
+    fresh = {row[key_index]: row for row in iter_roster(kind, keys=keys)}
+    sort_key = _sort_key(kind, order_by) if order_by else None
+    rows = list(rows)
+    edits = []
+    # from the end, so removing a row doesn't move the rows still to be checked
+    for index in reversed(range(len(rows))):
+        key = rows[index][key_index]
+        if key not in keys:
+            continue
+        row = fresh.get(key)
+        if row is not None and (sort_key is None or sort_key(row) == sort_key(rows[index])):
+            rows[index] = row
+            edits.append(('update', index, row))
+            del fresh[key]
+        else:
+            del rows[index]
+            edits.append(('delete', index))
+            if sort_key is None:
+                fresh.pop(key, None)
+    if sort_key is not None:
+        for row in fresh.values():
+            index = _position(rows, row, sort_key, descending)
+            if index < len(rows) or complete:
+                rows.insert(index, row)
+                edits.append(('insert', index, row))
+    return edits
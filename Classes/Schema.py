@@ -0,0 +1,405 @@
+import sqlite3
+
+from Classes.Database import get_connection, writable_connection
+
+# ROWS OF THE FULL-TEXT SEARCH INDEX: one per student, instructor, course and registration,
+# as (table, rowid, indexed values, join). The rowid is the ID * 4 + a number per kind, so
+# a trigger can find and replace the row of any record. Every row holds its kind, the email
+# and course ID it belongs to (used to find the matching roster rows) and the searchable text.
+SEARCH_ROWS = {
+    'student': ('students', 'studentID * 4',
+                "'student', email, NULL, name, email, studentID", ''),
+    'instructor': ('instructors', 'instructorID * 4 + 1',
+                   "'instructor', email, NULL, name, email, instructorID", ''),
+    'course': ('courses c', 'c.courseID * 4 + 2',
+               "'course', i.email, c.courseID, c.courseName, i.email, c.courseID",
+               'LEFT JOIN instructors i ON i.id = c.instructorRowID'),
+    'registration': ('enrollments e', 'e.id * 4 + 3',
+                     "'registration', s.email, e.courseID, c.courseName, s.email, e.courseID",
+                     'JOIN students s ON s.id = e.studentRowID JOIN courses c ON c.courseID = e.courseID'),
+}
+
+# THE SAME ROWS UP TO SCHEMA VERSION 4, WHEN THE REGISTRATIONS AND COURSES HELD THE EMAILS OF THEIR
+# STUDENT AND INSTRUCTOR (used by the migrations released before the row ids)
+_EMAIL_SEARCH_ROWS = dict(SEARCH_ROWS, **{
+    'course': ('courses', 'courseID * 4 + 2',
+               "'course', instructor, courseID, courseName, instructor, courseID", ''),
+    'registration': ('registrations r', 'r.id * 4 + 3',
+                     "'registration', r.studentEmail, r.courseID, c.courseName, r.studentEmail, r.courseID",
+                     'JOIN courses c ON c.courseID = r.courseID'),
+})
+
+# THIS FUNCTION RETURNS THE STATEMENT REMOVING THE INDEX ROWS OF THE RECORDS MATCHING A CONDITION
+def _unindex(kind, condition, rows=SEARCH_ROWS):
+    table, rowid, _, _ = rows[kind]
+    return f'DELETE FROM search_index WHERE rowid IN (SELECT {rowid} FROM {table} WHERE {condition})'
+
+# THIS FUNCTION RETURNS THE STATEMENT INDEXING THE RECORDS MATCHING A CONDITION
+def _index(kind, condition='1', rows=SEARCH_ROWS):
+    table, rowid, values, join = rows[kind]
+    return (f'INSERT INTO search_index (rowid, kind, person, course, name, email, identifier) '
+            f'SELECT {rowid}, {values} FROM {" ".join(filter(None, (table, join)))} WHERE {condition}')
+
+# THIS FUNCTION RETURNS THE STATEMENTS REINDEXING THE RECORDS MATCHING A CONDITION
+def _reindex(kind, condition, rows=SEARCH_ROWS):
+    return [_unindex(kind, condition, rows), _index(kind, condition, rows)]
+
+# THIS FUNCTION RETURNS A TRIGGER KEEPING THE SEARCH INDEX IN SYNC WITH A TABLE
+def _search_trigger(name, event, table, statements):
+    body = ''.join(f'    {statement};\n' for statement in statements)
+    return f'CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table} BEGIN\n{body}END'
+
+# THIS FUNCTION RETURNS THE STATEMENTS FILLING THE SEARCH INDEX FROM SCRATCH
+def _rebuild(rows):
+    return ['DELETE FROM search_index'] + [_index(kind, rows=rows) for kind in rows]
+
+# TRIGGERS KEEPING THE SEARCH ROWS OF THE COURSES AND REGISTRATIONS IN SYNC UP TO SCHEMA VERSION 4,
+# AS (name, event, table, statements); the registration rows hold the course name, so they follow the course
+_EMAIL_SEARCH_TRIGGERS = [
+    ('courses_search_insert', 'INSERT', 'courses',
+     _reindex('course', 'courseID = NEW.courseID', _EMAIL_SEARCH_ROWS)
+     + _reindex('registration', 'r.courseID = NEW.courseID', _EMAIL_SEARCH_ROWS)),
+    ('courses_search_update', 'UPDATE', 'courses',
+     ['DELETE FROM search_index WHERE rowid = OLD.courseID * 4 + 2']
+     + _reindex('course', 'courseID = NEW.courseID', _EMAIL_SEARCH_ROWS)),
+    ('courses_search_rename', 'UPDATE OF courseID, courseName', 'courses',
+     [_unindex('registration', 'r.courseID = OLD.courseID', _EMAIL_SEARCH_ROWS)]
+     + _reindex('registration', 'r.courseID = NEW.courseID', _EMAIL_SEARCH_ROWS)),
+    ('courses_search_delete', 'DELETE', 'courses',
+     ['DELETE FROM search_index WHERE rowid = OLD.courseID * 4 + 2',
+      _unindex('registration', 'r.courseID = OLD.courseID', _EMAIL_SEARCH_ROWS)]),
+    ('registrations_search_insert', 'INSERT', 'registrations',
+     _reindex('registration', 'r.id = NEW.id', _EMAIL_SEARCH_ROWS)),
+    ('registrations_search_update', 'UPDATE', 'registrations',
+     ['DELETE FROM search_index WHERE rowid = OLD.id * 4 + 3']
+     + _reindex('registration', 'r.id = NEW.id', _EMAIL_SEARCH_ROWS)),
+    ('registrations_search_delete', 'DELETE', 'registrations',
+     ['DELETE FROM search_index WHERE rowid = OLD.id * 4 + 3']),
+]
+
+# THE SAME TRIGGERS ONCE THE REGISTRATIONS AND COURSES REFER TO THEIR STUDENT AND INSTRUCTOR BY ROW ID;
+# the course and registration rows hold the email of the instructor/student, so they follow it too
+_SEARCH_TRIGGERS = [
+    ('courses_search_insert', 'INSERT', 'courses',
+     _reindex('course', 'c.courseID = NEW.courseID')
+     + _reindex('registration', 'e.courseID = NEW.courseID')),
+    ('courses_search_update', 'UPDATE', 'courses',
+     ['DELETE FROM search_index WHERE rowid = OLD.courseID * 4 + 2']
+     + _reindex('course', 'c.courseID = NEW.courseID')),
+    ('courses_search_rename', 'UPDATE OF courseID, courseName', 'courses',
+     [_unindex('registration', 'e.courseID = OLD.courseID')]
+     + _reindex('registration', 'e.courseID = NEW.courseID')),
+    ('courses_search_delete', 'DELETE', 'courses',
+     ['DELETE FROM search_index WHERE rowid = OLD.courseID * 4 + 2',
+      _unindex('registration', 'e.courseID = OLD.courseID')]),
+    ('enrollments_search_insert', 'INSERT', 'enrollments',
+     _reindex('registration', 'e.id = NEW.id')),
+    ('enrollments_search_update', 'UPDATE', 'enrollments',
+     ['DELETE FROM search_index WHERE rowid = OLD.id * 4 + 3']
+     + _reindex('registration', 'e.id = NEW.id')),
+    ('enrollments_search_delete', 'DELETE', 'enrollments',
+     ['DELETE FROM search_index WHERE rowid = OLD.id * 4 + 3']),
+    ('students_search_email', 'UPDATE OF email', 'students',
+     _reindex('registration', 'e.studentRowID = NEW.id')),
+    ('instructors_search_email', 'UPDATE OF email', 'instructors',
+     _reindex('course', 'c.instructorRowID = NEW.id')),
+]
+
+# STATEMENTS FILLING THE SEARCH INDEX FROM SCRATCH
+SEARCH_INDEX_REBUILD = _rebuild(SEARCH_ROWS)
+
+# ORDERED MIGRATION STEPS OF THE DATABASE SCHEMA: (version, description, statements)
+# the version reached is stored in PRAGMA user_version; never edit a released step, add a new one
+MIGRATIONS = [
+    (1, "Create the students, instructors, courses and registrations tables", [
+        '''
+        CREATE TABLE IF NOT EXISTS students (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            age INTEGER,
+            email TEXT UNIQUE,
+            studentID INTEGER UNIQUE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS instructors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            age INTEGER,
+            email TEXT UNIQUE,
+            instructorID INTEGER UNIQUE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS courses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            courseID INTEGER UNIQUE,
+            courseName TEXT NOT NULL,
+            instructor TEXT
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS registrations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            studentEmail TEXT,
+            courseID INTEGER NULL,
+            FOREIGN KEY (studentEmail) REFERENCES students(email),
+            FOREIGN KEY (courseID) REFERENCES courses(courseID)
+        )
+        ''',
+    ]),
+    (2, "Index the registration, instructor and paging lookups", [
+        # keep the first copy of duplicate enrolments so the unique index can be built
+        '''
+        DELETE FROM registrations
+        WHERE id NOT IN (SELECT MIN(id) FROM registrations GROUP BY studentEmail, courseID)
+        ''',
+        # also serves the lookups by studentEmail alone
+        'CREATE UNIQUE INDEX IF NOT EXISTS idx_registrations_student_course ON registrations(studentEmail, courseID)',
+        'CREATE INDEX IF NOT EXISTS idx_registrations_course ON registrations(courseID)',
+        'CREATE INDEX IF NOT EXISTS idx_courses_instructor ON courses(instructor)',
+        'CREATE INDEX IF NOT EXISTS idx_courses_name ON courses(courseName, courseID)',
+        'CREATE INDEX IF NOT EXISTS idx_students_name ON students(name, studentID)',
+        'CREATE INDEX IF NOT EXISTS idx_instructors_name ON instructors(name, instructorID)',
+    ]),
+    (3, "Add the full-text search index of the View All tabs", [
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+            kind UNINDEXED,
+            person UNINDEXED,
+            course UNINDEXED,
+            name,
+            email,
+            identifier,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+        ''',
+        _search_trigger('students_search_insert', 'INSERT', 'students',
+                        _reindex('student', 'studentID = NEW.studentID')),
+        _search_trigger('students_search_update', 'UPDATE', 'students',
+                        ['DELETE FROM search_index WHERE rowid = OLD.studentID * 4']
+                        + _reindex('student', 'studentID = NEW.studentID')),
+        _search_trigger('students_search_delete', 'DELETE', 'students',
+                        ['DELETE FROM search_index WHERE rowid = OLD.studentID * 4']),
+        _search_trigger('instructors_search_insert', 'INSERT', 'instructors',
+                        _reindex('instructor', 'instructorID = NEW.instructorID')),
+        _search_trigger('instructors_search_update', 'UPDATE', 'instructors',
+                        ['DELETE FROM search_index WHERE rowid = OLD.instructorID * 4 + 1']
+                        + _reindex('instructor', 'instructorID = NEW.instructorID')),
+        _search_trigger('instructors_search_delete', 'DELETE', 'instructors',
+                        ['DELETE FROM search_index WHERE rowid = OLD.instructorID * 4 + 1']),
+    ] + [_search_trigger(*trigger) for trigger in _EMAIL_SEARCH_TRIGGERS] + _rebuild(_EMAIL_SEARCH_ROWS)),
+    (4, "Enforce the foreign keys of the registrations and course assignments", [
+        # one-shot cleanup of the rows the new foreign keys would reject: registrations of a
+        # student or course that no longer exists, and courses assigned to an unknown instructor
+        '''
+        DELETE FROM registrations
+        WHERE studentEmail IS NULL OR courseID IS NULL
+           OR studentEmail NOT IN (SELECT email FROM students WHERE email IS NOT NULL)
+           OR courseID NOT IN (SELECT courseID FROM courses WHERE courseID IS NOT NULL)
+        ''',
+        '''
+        UPDATE courses SET instructor = NULL
+        WHERE instructor = '' OR instructor NOT IN (SELECT email FROM instructors WHERE email IS NOT NULL)
+        ''',
+        # SQLite can't add a constraint to a table: rebuild both tables, keeping their ids (the
+        # rowids of the search index are computed from them). The triggers of the two tables
+        # refer to each other, so they are dropped first and created again once both are rebuilt.
+        *[f'DROP TRIGGER IF EXISTS {trigger[0]}' for trigger in _EMAIL_SEARCH_TRIGGERS],
+        '''
+        CREATE TABLE courses_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            courseID INTEGER UNIQUE,
+            courseName TEXT NOT NULL,
+            instructor TEXT REFERENCES instructors(email) ON DELETE SET NULL ON UPDATE CASCADE
+        )
+        ''',
+        'INSERT INTO courses_new (id, courseID, courseName, instructor) SELECT id, courseID, courseName, instructor FROM courses',
+        'DROP TABLE courses',
+        'ALTER TABLE courses_new RENAME TO courses',
+        'CREATE INDEX IF NOT EXISTS idx_courses_instructor ON courses(instructor)',
+        'CREATE INDEX IF NOT EXISTS idx_courses_name ON courses(courseName, courseID)',
+        '''
+        CREATE TABLE registrations_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            studentEmail TEXT NOT NULL REFERENCES students(email) ON DELETE CASCADE ON UPDATE CASCADE,
+            courseID INTEGER NOT NULL REFERENCES courses(courseID) ON DELETE CASCADE ON UPDATE CASCADE
+        )
+        ''',
+        'INSERT INTO registrations_new (id, studentEmail, courseID) SELECT id, studentEmail, courseID FROM registrations',
+        'DROP TABLE registrations',
+        'ALTER TABLE registrations_new RENAME TO registrations',
+        'CREATE UNIQUE INDEX IF NOT EXISTS idx_registrations_student_course ON registrations(studentEmail, courseID)',
+        'CREATE INDEX IF NOT EXISTS idx_registrations_course ON registrations(courseID)',
+    ] + [_search_trigger(*trigger) for trigger in _EMAIL_SEARCH_TRIGGERS]),
+    (5, "Key the registrations and course assignments by the row ids of the students and instructors", [
+        # the search triggers refer to the old tables: they are created again for the new ones at
+        # the end (the ids are kept, so the rows of the search index stay the same)
+        *[f'DROP TRIGGER IF EXISTS {trigger[0]}' for trigger in _EMAIL_SEARCH_TRIGGERS],
+        '''
+        CREATE TABLE courses_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            courseID INTEGER UNIQUE,
+            courseName TEXT NOT NULL,
+            instructorRowID INTEGER REFERENCES instructors(id) ON DELETE SET NULL
+        )
+        ''',
+        '''
+        INSERT INTO courses_new (id, courseID, courseName, instructorRowID)
+        SELECT c.id, c.courseID, c.courseName, i.id
+        FROM courses c LEFT JOIN instructors i ON i.email = c.instructor
+        ''',
+        'DROP TABLE courses',
+        'ALTER TABLE courses_new RENAME TO courses',
+        'CREATE INDEX IF NOT EXISTS idx_courses_instructor ON courses(instructorRowID)',
+        'CREATE INDEX IF NOT EXISTS idx_courses_name ON courses(courseName, courseID)',
+        # the registrations move to a table keyed by integers; "registrations" becomes a view of it
+        '''
+        CREATE TABLE enrollments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            studentRowID INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+            courseID INTEGER NOT NULL REFERENCES courses(courseID) ON DELETE CASCADE ON UPDATE CASCADE
+        )
+        ''',
+        '''
+        INSERT INTO enrollments (id, studentRowID, courseID)
+        SELECT r.id, s.id, r.courseID
+        FROM registrations r JOIN students s ON s.email = r.studentEmail
+        ''',
+        'DROP TABLE registrations',
+        # also serves the lookups by student alone
+        'CREATE UNIQUE INDEX IF NOT EXISTS idx_enrollments_student_course ON enrollments(studentRowID, courseID)',
+        # covers the students of a course, which then only need one lookup by row id each
+        'CREATE INDEX IF NOT EXISTS idx_enrollments_course ON enrollments(courseID, studentRowID)',
+        # COMPATIBILITY VIEWS: the registrations and courses as they were, with the emails
+        # of their student and instructor, for the queries written against the old tables
+        '''
+        CREATE VIEW IF NOT EXISTS registrations AS
+        SELECT e.id, s.email AS studentEmail, e.courseID
+        FROM enrollments e JOIN students s ON s.id = e.studentRowID
+        ''',
+        '''
+        CREATE VIEW IF NOT EXISTS course_instructors AS
+        SELECT c.id, c.courseID, c.courseName, i.email AS instructor
+        FROM courses c LEFT JOIN instructors i ON i.id = c.instructorRowID
+        ''',
+        # the registrations view can still be written to: an unknown email leaves
+        # studentRowID NULL, which the NOT NULL constraint refuses like the old foreign key
+        '''
+        CREATE TRIGGER IF NOT EXISTS registrations_insert INSTEAD OF INSERT ON registrations BEGIN
+            INSERT INTO enrollments (studentRowID, courseID)
+            VALUES ((SELECT id FROM students WHERE email = NEW.studentEmail), NEW.courseID);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS registrations_update INSTEAD OF UPDATE ON registrations BEGIN
+            UPDATE enrollments
+            SET studentRowID = (SELECT id FROM students WHERE email = NEW.studentEmail), courseID = NEW.courseID
+            WHERE id = OLD.id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS registrations_delete INSTEAD OF DELETE ON registrations BEGIN
+            DELETE FROM enrollments WHERE id = OLD.id;
+        END
+        ''',
+    ] + [_search_trigger(*trigger) for trigger in _SEARCH_TRIGGERS]),
+    (6, "Index the paging of the students and instructors by age", [
+        # like the name indexes of version 2: a page ordered by age is an index seek, not a sort of the table
+        'CREATE INDEX IF NOT EXISTS idx_students_age ON students(age, studentID)',
+        'CREATE INDEX IF NOT EXISTS idx_instructors_age ON instructors(age, instructorID)',
+    ]),
+]
+
+# THIS FUNCTION RETURNS THE SCHEMA VERSION OF THE DATABASE
+def schema_version(path=None):
+    """
+    Returns the schema version stored in the database (PRAGMA user_version).
+
+    Parameters:
+    ----------
+        path (str): The path of the SQLite database file (default is `Database.DATABASE`).
+
+    Returns:
+    -------
+        int: The version of the last migration applied, 0 for a new database.
+    """
+    return get_connection(path).execute('PRAGMA user_version').fetchone()[0]
+
+# THIS FUNCTION APPLIES THE MIGRATIONS THE DATABASE DOESN'T HAVE YET
+def migrate(path=None):
+    """
+    Brings the database schema up to date.
+
+    Every migration newer than the stored schema version is applied in order, each one
+    in its own transaction together with the update of PRAGMA user_version, so a failed
+    migration leaves the database at the previous version. The migrations also run under
+    the read-only profile, on a separate connection that accepts writes.
+
+    Parameters:
+    ----------
+        path (str): The path of the SQLite database file (default is `Database.DATABASE`).
+
+    Returns:
+    -------
+        int: The schema version after the migrations.
+
+    Raises:
+    ------
+        sqlite3.IntegrityError: If a migration leaves rows that break a foreign key.
+        sqlite3.Error: If a migration fails.
+    """
+    version = schema_version(path)
+    if all(number <= version for number, _, _ in MIGRATIONS):
+        return version
+    # under the read-only profile the migrations run on a separate connection accepting writes
+    with writable_connection(path) as conn:
+        # a migration that rebuilds a table drops the old one, which would run the ON DELETE
+        # actions of the foreign keys: they are checked once at the end of every step instead
+        # (PRAGMA foreign_keys can't be changed inside a transaction)
+        enforced = conn.execute('PRAGMA foreign_keys').fetchone()[0]
+        conn.execute('PRAGMA foreign_keys = OFF')
+        try:
+            for number, description, statements in MIGRATIONS:
+                if number <= version:
+                    continue
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    for statement in statements:
+                        if callable(statement):
+                            statement(conn)
+                        else:
+                            conn.execute(statement)
+                    broken = conn.execute('PRAGMA foreign_key_check').fetchone()
+                    if broken:
+                        raise sqlite3.IntegrityError(f"Migration {number} leaves a row of {broken[0]} that breaks a foreign key")
+                    conn.execute(f'PRAGMA user_version = {number}')
+                except BaseException:
+                    conn.rollback()
+                    raise
+                conn.commit()
+                print(f"Database migrated to version {number}: {description}")
+                version = number
+        finally:
+            conn.execute(f'PRAGMA foreign_keys = {enforced}')
+        return version
+
+# THIS FUNCTION CREATES/UPGRADES THE SQLite DATABASE USED IN OUR SCHOOL MANAGEMENT SYSTEM
+def initialize_database(path=None):
+    """
+    Initializes the SQLite database for the School Management System.
+
+    This is the single entry point both applications call at startup. It creates the four
+    tables on a new database and applies every pending migration to an existing one:
+    - students: Stores information about students, including their name, age, email, and studentID.
+    - instructors: Stores information about instructors, including their name, age, email, and instructorID.
+    - courses: Stores information about courses, including courseID, courseName, and the row id of their instructor.
+    - enrollments: Stores the registration details of students in various courses, by row id of the student
+      (the `registrations` and `course_instructors` views show them with the emails).
+    - search_index: The full-text index of the four tables searched by the View All tabs.
+
+    Parameters:
+    ----------
+        path (str): The path of the SQLite database file (default is `Database.DATABASE`).
+    """
+    migrate(path)
@@ -0,0 +1,236 @@
+import re
+
+from Classes.Database import MAX_VARIABLES, connection, get_connection
+from Classes.Roster import ROSTERS, iter_roster
+from Classes.Schema import SEARCH_INDEX_REBUILD
+
+# WHAT EACH ROSTER IS SEARCHED IN: (kind of index row, columns searched or None for all,
+# index column holding the key of the roster row). A student is found by their own name,
+# email or ID and by the names of their courses; a course by its name, ID and instructor
+# and by the emails of its students.
+SEARCHES = {
+    'students': (('student', None, 'person'), ('registration', 'name', 'person')),
+    'instructors': (('instructor', None, 'person'), ('course', 'name', 'person')),
+    'courses': (('course', None, 'course'), ('registration', 'email', 'course')),
+}
+
+# WEIGHTS OF THE COLUMNS OF THE INDEX IN THE RANKING (kind, person, course, name, email, identifier)
+RANK_WEIGHTS = (0, 0, 0, 10.0, 5.0, 2.0)
+
+# THIS FUNCTION TURNS WHAT THE USER TYPED INTO AN FTS5 QUERY
+def match_expression(query, columns=None):
+    """
+    Turns a search box query into an FTS5 MATCH expression.
+
+    Every word of the query must match the beginning of a word of the row, so
+    "jo smi" finds "John Smith" and "s1@mail" finds "s1@mail.aub.edu".
+
+    Parameters:
+    ----------
+        query (str): The text typed by the user.
+        columns (str): The only index column to search (default is None, every column).
+
+    Returns:
+    -------
+        str: The MATCH expression, or None if the query holds no word.
+    """
+    words = re.findall(r'\w+', query.lower())
+    if not words:
+        return None
+    expression = ' '.join(f'"{word}"*' for word in words)
+    if columns:
+        expression = f'{{{columns}}} : ({expression})'
+    return expression
+
+# THIS FUNCTION SEARCHES THE INDEX FOR THE ROWS OF A ROSTER
+def search(kind, query, limit=None):
+    """
+    Searches the full-text index for the students, instructors or courses matching a query.
+
+    Parameters:
+    ----------
+        kind (str): What to search ('students', 'instructors' or 'courses').
+        query (str): The text typed by the user.
+        limit (int): The maximum number of results (default is None, no limit).
+
+    Returns:
+    -------
+        list: The keys of the matching rows (emails for people, course IDs for courses),
+        best match first.
+
+    Raises:
+    ------
+        ValueError: If the kind is unknown.
+        sqlite3.Error: If there is an issue with the database operation.
+    """
+    if kind not in SEARCHES:
+        raise ValueError(f"Unknown roster: {kind}")
+    weights = ', '.join(str(weight) for weight in RANK_WEIGHTS)
+    selects = []
+    params = []
+    for index_kind, columns, key in SEARCHES[kind]:
+        expression = match_expression(query, columns)
+        if expression is None:
+            return []
+        selects.append(f'''
+            SELECT {key} AS key, bm25(search_index, {weights}) AS score
+            FROM search_index WHERE search_index MATCH ? AND kind = ?
+        ''')
+        params.extend((expression, index_kind))
+    sql = f'''
+        SELECT key FROM ({" UNION ALL ".join(selects)})
+        WHERE key IS NOT NULL
+        GROUP BY key
+        ORDER BY min(score), key
+    '''
+    if limit is not None:
+        sql += ' LIMIT ?'
+        params.append(limit)
+    cursor = get_connection().cursor()
+    cursor.execute(sql, params)
+    return [row[0] for row in cursor.fetchall()]
+
+# THIS FUNCTION STREAMS THE ROSTER ROWS MATCHING A QUERY, BEST MATCH FIRST
+def search_roster(kind, query, limit=None):
+    """
+    Streams the roster rows (see `Roster.iter_roster`) matching a search query, best match first.
+
+    Parameters:
+    ----------
+        kind (str): The roster to search ('students', 'instructors' or 'courses').
+        query (str): The text typed by the user.
+        limit (int): The maximum number of rows (default is None, no limit).
+
+    Yields:
+    ------
+        tuple: The roster rows of the matches, in order of relevance.
+
+    Raises:
+    ------
+        ValueError: If the kind is unknown.
+        sqlite3.Error: If there is an issue with the database operation.
+    """
+    keys = search(kind, query, limit)
+    column = ROSTERS[kind]['columns'].index(ROSTERS[kind]['key'])
+    # the roster is read by chunks of keys and put back in the order of the ranking
+    for start in range(0, len(keys), MAX_VARIABLES):
+        chunk = keys[start:start + MAX_VARIABLES]
+        rows = {row[column]: row for row in iter_roster(kind, keys=chunk)}
+        for key in chunk:
+            if key in rows:
+                yield rows[key]
+
+# THIS FUNCTION REBUILDS THE SEARCH INDEX FROM THE TABLES
+def rebuild_index():
+    """
+    Rebuilds the whole full-text search index from the four tables.
+
+    The triggers keep the index in sync on their own; this is only needed after the
+    tables were changed with the triggers disabled (e.g. a restored backup).
+
+    Raises:
+    ------
+        sqlite3.Error: If there is an issue with the database operation.
+    """
+    with connection() as conn:
+        for statement in SEARCH_INDEX_REBUILD:
+            conn.execute(statement)
+
+# TIME TO WAIT AFTER THE LAST KEYSTROKE BEFORE SEARCHING (milliseconds)
+DEBOUNCE_MS = 250
+
+# THIS CLASS RUNS THE SUCCESSIVE SEARCHES OF ONE SEARCH BOX
+class IncrementalSearch:
+    """
+    Runs the successive searches typed in one search box.
+
+    When a query only extends the previous one ("jo" then "joh"), its matches are a
+    subset of the previous ones: only the full-text index is searched again, and the
+    roster rows of the matches are taken from the previous results instead of being
+    read (and joined) again. The index decides what matches, so narrowed results are
+    always the same, in the same order, as a fresh `search_roster`.
+    Starting a search cancels the one still streaming.
+
+    Parameters:
+    ----------
+        kind (str): The roster searched ('students', 'instructors' or 'courses').
+    """
+    def __init__(self, kind):
+        if kind not in SEARCHES:
+            raise ValueError(f"Unknown roster: {kind}")
+        self.kind = kind
+        self.key_column = ROSTERS[kind]['columns'].index(ROSTERS[kind]['key'])
+        self.query = None
+        self.rows = None
+        self.generation = 0
+
+    # THIS METHOD STREAMS THE MATCHES OF A QUERY FROM THE ROWS OF THE PREVIOUS ONE
+    def narrowed(self, query):
+        keys = search(self.kind, query)
+        rows = {row[self.key_column]: row for row in self.rows}
+        # a match the previous results don't hold (the index tokenizes some words differently
+        # from the search box) is read from the database
+        missing = [key for key in keys if key not in rows]
+        for start in range(0, len(missing), MAX_VARIABLES):
+            rows.update((row[self.key_column], row)
+                        for row in iter_roster(self.kind, keys=missing[start:start + MAX_VARIABLES]))
+        return (rows[key] for key in keys if key in rows)
+
+    # THIS METHOD STREAMS THE MATCHES OF A QUERY
+    def search(self, query):
+        """
+        Streams the roster rows matching a query, best match first.
+
+        The stream stops as soon as another search is started (or `cancel` is called),
+        so a superseded search never keeps filling the view.
+
+        Parameters:
+        ----------
+            query (str): The text typed by the user.
+
+        Yields:
+        ------
+            tuple: The roster rows of the matches.
+        """
+        self.generation += 1
+        generation = self.generation
+        if (self.rows is not None and self.query and re.findall(r'\w+', self.query.lower())
+                and query.lower().startswith(self.query.lower())):
+            source = self.narrowed(query)
+        else:
+            source = search_roster(self.kind, query)
+        rows = []
+        for row in source:
+            if generation != self.generation:
+                return
+            rows.append(row)
+            yield row
+        # only a complete result can be narrowed by the next query
+        if generation == self.generation:
+            self.query = query
+            self.rows = rows
+
+    # THIS METHOD STOPS THE SEARCH BEING STREAMED
+    def cancel(self):
+        """
+        Stops the search being streamed, if any.
+        """
+        self.generation += 1
+
+    # THIS METHOD FORGETS THE PREVIOUS RESULTS
+    def reset(self):
+        """
+        Cancels the current search and forgets the previous results, so the next
+        search reads the database again (e.g. after the search box was cleared).
+        """
+        self.cancel()
+        self.forget()
+
+    # THIS METHOD FORGETS THE PREVIOUS RESULTS WITHOUT CANCELLING THE CURRENT SEARCH
+    def forget(self):
+        """
+        Forgets the previous results, so the next search reads the database again
+        instead of narrowing them (e.g. after a change was published on the change bus).
+        """
+        self.query = None
+        self.rows = None
@@ -0,0 +1,213 @@
+from Classes.Database import connection
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is only needed by the snapshot, the rest of the application runs without it
+    np = None
+
+# THIS CLASS HOLDS THE STUDENTS, INSTRUCTORS, COURSES AND REGISTRATIONS AS COLUMNS OF NUMBERS
+class RosterSnapshot:
+    """
+    Read-only columnar copy of the database for analytics, built by `load_snapshot`.
+
+    Every table is stored as NumPy arrays (one per column) ordered by ID, and rows refer to
+    each other by their index in those arrays instead of by email:
+        - `student_ids`, `student_ages`, `student_emails` (one entry per student)
+        - `instructor_ids`, `instructor_ages`, `instructor_emails` (one entry per instructor)
+        - `course_ids`, `course_names`, and `course_instructors`, the index of the instructor of
+          each course (-1 when the course has no instructor)
+        - `enrollment_indptr` and `enrollment_students`, the registrations as a CSR adjacency:
+          the students of course `c` are `enrollment_students[enrollment_indptr[c]:enrollment_indptr[c + 1]]`
+
+    The aggregations below are vectorised over these arrays, so they don't build any model
+    object. The snapshot doesn't follow later changes of the database: load a new one instead.
+    """
+    def __init__(self, students, instructors, courses, registrations):
+        self.student_ids, self.student_ages, self.student_emails, student_rows = students
+        self.instructor_ids, self.instructor_ages, self.instructor_emails = instructors
+        self.course_ids, self.course_names, course_instructors = courses
+        self.course_instructors = _indexes(self.instructor_ids, course_instructors)
+        course_keys, student_keys = registrations
+        # the registrations refer to the students by row id: look the row ids up in a sorted copy
+        by_row = np.argsort(student_rows)
+        positions = _indexes(student_rows[by_row], student_keys)
+        student_indexes = np.where(positions >= 0, by_row[positions], -1)
+        course_indexes = _indexes(self.course_ids, course_keys)
+        # registrations whose student or course no longer exists are left out
+        kept = (student_indexes >= 0) & (course_indexes >= 0)
+        student_indexes, course_indexes = student_indexes[kept], course_indexes[kept]
+        # group the registrations by course, keeping the students of each course in ID order
+        order = np.lexsort((student_indexes, course_indexes))
+        self.enrollment_students = student_indexes[order]
+        self.enrollment_indptr = np.zeros(len(self.course_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(course_indexes, minlength=len(self.course_ids)), out=self.enrollment_indptr[1:])
+
+    def __repr__(self):
+        return (f"RosterSnapshot({len(self.student_ids)} students, {len(self.instructor_ids)} instructors, "
+                f"{len(self.course_ids)} courses, {len(self.enrollment_students)} registrations)")
+
+    # THIS METHOD RETURNS THE STUDENTS OF A COURSE
+    def students_of(self, course):
+        """
+        Returns the indexes of the students registered to a course.
+
+        Parameters:
+        ----------
+            course (int): The index of the course (see `course_index`).
+
+        Returns:
+        -------
+            numpy.ndarray: The indexes of its students, in `student_ids` order.
+        """
+        return self.enrollment_students[self.enrollment_indptr[course]:self.enrollment_indptr[course + 1]]
+
+    # THIS METHOD RETURNS THE INDEX OF A COURSE ID
+    def course_index(self, courseID):
+        """
+        Returns the index of a course in the arrays of the snapshot.
+
+        Parameters:
+        ----------
+            courseID (int): The ID of the course.
+
+        Returns:
+        -------
+            int: The index of the course.
+
+        Raises:
+        ------
+            KeyError: If there is no such course in the snapshot.
+        """
+        index = int(np.searchsorted(self.course_ids, courseID))
+        if index == len(self.course_ids) or self.course_ids[index] != courseID:
+            raise KeyError(courseID)
+        return index
+
+    # THIS METHOD RETURNS THE COURSE OF EVERY REGISTRATION
+    def enrollment_courses(self):
+        """
+        Returns the index of the course of every entry of `enrollment_students`.
+        """
+        return np.repeat(np.arange(len(self.course_ids)), self.enrollment_per_course())
+
+    # THIS METHOD COUNTS THE STUDENTS OF EVERY COURSE
+    def enrollment_per_course(self):
+        """
+        Returns the number of students registered to each course, in `course_ids` order.
+        """
+        return np.diff(self.enrollment_indptr)
+
+    # THIS METHOD COUNTS THE COURSES OF EVERY STUDENT
+    def courses_per_student(self):
+        """
+        Returns the number of courses each student is registered to, in `student_ids` order.
+        """
+        return np.bincount(self.enrollment_students, minlength=len(self.student_ids))
+
+    # THIS METHOD RETURNS THE AVERAGE AGE OF THE STUDENTS OF EVERY COURSE
+    def mean_age_per_course(self):
+        """
+        Returns the average age of the students of each course, in `course_ids` order
+        (NaN for a course without students).
+        """
+        counts = self.enrollment_per_course()
+        ages = np.bincount(self.enrollment_courses(), weights=self.student_ages[self.enrollment_students],
+                           minlength=len(self.course_ids))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return ages / counts
+
+    # THIS METHOD COUNTS THE STUDENTS OF EVERY COURSE BY AGE GROUP
+    def age_distribution_per_course(self, bins=(0, 18, 21, 25, 30, 200)):
+        """
+        Counts the students of each course in every age group.
+
+        Parameters:
+        ----------
+            bins (sequence of int): The bounds of the age groups; group `i` holds the ages from
+                `bins[i]` up to (not including) `bins[i + 1]` (default is under 18, 18-20, 21-24, 25-29, 30 and over).
+
+        Returns:
+        -------
+            numpy.ndarray: A (courses x groups) array of counts, in `course_ids` order. Ages outside
+            of the bins aren't counted.
+        """
+        bins = np.asarray(bins)
+        groups = len(bins) - 1
+        group = np.searchsorted(bins, self.student_ages[self.enrollment_students], side='right') - 1
+        kept = (group >= 0) & (group < groups)
+        cells = self.enrollment_courses()[kept] * groups + group[kept]
+        return np.bincount(cells, minlength=len(self.course_ids) * groups).reshape(len(self.course_ids), groups)
+
+    # THIS METHOD COUNTS THE COURSES AND STUDENTS OF EVERY INSTRUCTOR
+    def instructor_load(self):
+        """
+        Returns the teaching load of each instructor, in `instructor_ids` order.
+
+        Returns:
+        -------
+            tuple of numpy.ndarray: The number of courses of each instructor and the total
+            number of students registered to those courses.
+        """
+        assigned = self.course_instructors >= 0
+        instructors = self.course_instructors[assigned]
+        courses = np.bincount(instructors, minlength=len(self.instructor_ids))
+        students = np.bincount(instructors, weights=self.enrollment_per_course()[assigned],
+                               minlength=len(self.instructor_ids)).astype(np.int64)
+        return courses, students
+
+# THIS FUNCTION TURNS IDS INTO INDEXES OF A SORTED ARRAY OF IDS (-1 FOR AN ID THAT ISN'T IN IT)
+def _indexes(ids, keys):
+    if not len(ids):
+        return np.full(len(keys), -1, dtype=np.int64)
+    indexes = np.minimum(np.searchsorted(ids, keys), len(ids) - 1)
+    return np.where(ids[indexes] == keys, indexes, -1)
+
+# THIS FUNCTION READS ONE QUERY INTO ONE ARRAY PER COLUMN
+def _columns(cursor, query, dtypes):
+    rows = cursor.execute(query).fetchall()
+    if not rows:
+        return [np.empty(0, dtype=dtype) for dtype in dtypes]
+    table = np.array(rows, dtype=object)
+    return [table[:, i].astype(dtype) for i, dtype in enumerate(dtypes)]
+
+# THIS FUNCTION READS THE DATABASE INTO A COLUMNAR SNAPSHOT
+def load_snapshot(path=None):
+    """
+    Reads the students, instructors, courses and registrations into a `RosterSnapshot`.
+
+    The four tables are read in one transaction, so the snapshot is consistent even while
+    another connection writes. The registrations and courses refer to their student and
+    instructor by row id, so no email is compared while building it.
+
+    Parameters:
+    ----------
+        path (str): The path of the SQLite database file (default is `Database.DATABASE`).
+
+    Returns:
+    -------
+        RosterSnapshot: The snapshot.
+
+    Raises:
+    ------
+        ImportError: If NumPy is not installed.
+        sqlite3.Error: If there is an issue with the database operation.
+    """
+    if np is None:
+        raise ImportError("The columnar snapshot needs NumPy: pip install numpy")
+    with connection(path) as conn:
+        if not conn.in_transaction:
+            conn.execute('BEGIN')
+        cursor = conn.cursor()
+        students = _columns(cursor, 'SELECT studentID, age, email, id FROM students ORDER BY studentID',
+                            (np.int64, np.int32, object, np.int64))
+        instructors = _columns(cursor, 'SELECT instructorID, age, email FROM instructors ORDER BY instructorID',
+                               (np.int64, np.int32, object))
+        courses = _columns(cursor, '''
+            SELECT c.courseID, c.courseName, coalesce(i.instructorID, -1)
+            FROM courses c
+            LEFT JOIN instructors i ON i.id = c.instructorRowID
+            ORDER BY c.courseID
+        ''', (np.int64, object, np.int64))
+        registrations = _columns(cursor, 'SELECT courseID, studentRowID FROM enrollments', (np.int64, np.int64))
+    return RosterSnapshot(students, instructors, courses, registrations)
@@ -1,4 +1,3 @@
-import sqlite3
 import sys
 from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget
 from PyQtTabs.StudentTab import StudentTab
@@ -6,58 +5,10 @@ from PyQtTabs.InstructorTab import InstructorTab
 from PyQtTabs.CourseTab import CourseTab
 from PyQtTabs.RegisterTab import RegisterTab
 from PyQtTabs.ViewAllTab import ViewAllTab
+from PyQtTabs import Workers
+from Classes.Schema import initialize_database
 
-# Initialize the SQLite database
-def initialize_database():
-    conn = sqlite3.connect('school_management.db')
-    cursor = conn.cursor()
-
-    # Create students table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS students (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            age INTEGER,
-            email TEXT UNIQUE,
-            studentID INTEGER UNIQUE
-        )
-    ''')
-
-    # Create instructors table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS instructors (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            age INTEGER,
-            email TEXT UNIQUE,
-            instructorID INTEGER UNIQUE
-        )
-    ''')
-
-    # Create courses table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS courses (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            courseID INTEGER UNIQUE,
-            courseName TEXT NOT NULL,
-            instructor TEXT
-        )
-    ''')
-
-    # Create registrations table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS registrations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            studentEmail TEXT,
-            courseID INTEGER NULL,
-            FOREIGN KEY (studentEmail) REFERENCES students(email),
-            FOREIGN KEY (courseID) REFERENCES courses(courseID)
-        )
-    ''')
-
-    conn.commit()
-    conn.close()
-
+# Initialize the SQLite database (creates the tables and applies pending migrations)
 initialize_database()
 
 class SchoolManagementSystem(QMainWindow):
@@ -81,6 +32,8 @@ class SchoolManagementSystem(QMainWindow):
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    # the worker threads close their database connections when the window is closed
+    app.aboutToQuit.connect(Workers.shutdown)
     window = SchoolManagementSystem()
     window.show()
     sys.exit(app.exec_())
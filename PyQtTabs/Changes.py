@@ -0,0 +1,106 @@
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, pyqtSignal
+from Classes.Events import DELETE, INSERT, RELOAD, UPDATE, subscribe, unsubscribe
+
+
+# THIS OBJECT RELAYS THE CHANGES OF THE CHANGE BUS TO THE GUI THREAD
+class ChangeRelay(QObject):
+    changed = pyqtSignal(object)
+
+
+# Function to call a function with the changes of some entities while a widget exists.
+# The changes go through a signal, so the ones published by a background thread
+# (e.g. a CSV import) are delivered on the GUI thread
+def subscribe_widget(widget, callback, *entities):
+    relay = ChangeRelay()
+    relay.changed.connect(callback)
+
+    def deliver(change):
+        # the widget may be gone (e.g. a View All table replaced by another one)
+        if sip.isdeleted(widget):
+            unsubscribe(deliver)
+        else:
+            relay.changed.emit(change)
+
+    subscribe(deliver, *entities)
+    widget.destroyed.connect(lambda: unsubscribe(deliver))
+    return relay
+
+
+# THIS CLASS KEEPS THE ITEMS OF A COMBO BOX UP TO DATE ONE VALUE AT A TIME
+class ComboOptions:
+    """
+    The values of a dropdown (QComboBox), changed one item at a time.
+
+    Parameters:
+    ----------
+        combo (QComboBox): The dropdown.
+        placeholder (str): The item shown when there are no values.
+        load (callable): A function returning every value, used on a `RELOAD` (optional).
+        tasks (TaskRunner): Runs `load` off the GUI thread (default is None, `load` is called directly).
+    """
+    def __init__(self, combo, placeholder, load=None, tasks=None):
+        self.combo = combo
+        self.placeholder = placeholder
+        self.load = load
+        self.tasks = tasks
+        self.values = []
+        self.set_values([])
+        self.reload()
+
+    # Function to read every value again with the load function
+    def reload(self):
+        if self.load is None:
+            return
+        if self.tasks is None:
+            self.set_values(self.load())
+        else:
+            self.tasks.run(self, self.load, on_result=self.set_values)
+
+    # Function to replace every value of the dropdown
+    def set_values(self, values):
+        self.values = [str(value) for value in values]
+        self.combo.clear()
+        self.combo.addItems(self.values or [self.placeholder])
+
+    # Function to add a value at the end of the dropdown
+    def add(self, value):
+        value = str(value)
+        if value in self.values:
+            return
+        if not self.values:
+            self.combo.clear()
+        self.values.append(value)
+        self.combo.addItem(value)
+
+    # Function to remove a value from the dropdown
+    def remove(self, value):
+        value = str(value)
+        if value not in self.values:
+            return
+        index = self.values.index(value)
+        del self.values[index]
+        self.combo.removeItem(index)
+        if not self.values:
+            self.combo.addItem(self.placeholder)
+
+    # Function to rename a value of the dropdown
+    def replace(self, old, new):
+        old, new = str(old), str(new)
+        if old not in self.values:
+            self.add(new)
+            return
+        index = self.values.index(old)
+        self.values[index] = new
+        self.combo.setItemText(index, new)
+
+    # Function to apply a change of the change bus to the dropdown
+    def apply(self, change, column):
+        if change.op == RELOAD:
+            self.reload()
+        elif change.op == INSERT:
+            self.add(change.new[column])
+        elif change.op == DELETE:
+            self.remove(change.old[column])
+        elif change.op == UPDATE and change.old[column] != change.new[column]:
+            self.replace(change.old[column], change.new[column])
@@ -1,15 +1,21 @@
-import sqlite3
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QLineEdit, QPushButton, QComboBox, QGridLayout, QDialog
 )
 from PyQt5.QtGui import QFont
+from Classes.Database import get_connection
 from Classes.Course import Course
+from PyQtTabs.Changes import ComboOptions, subscribe_widget
+from PyQtTabs.ImportDialog import import_from_csv
+from PyQtTabs.Workers import TaskRunner
 
 
 class CourseTab(QWidget):
     def __init__(self):
         super().__init__()
 
+        # The database work runs on a thread pool, the results come back to the GUI thread
+        self.tasks = TaskRunner(self)
+
         # Layout for the course tab
         layout = QGridLayout(self)
 
@@ -38,6 +44,11 @@ class CourseTab(QWidget):
         submit_button_course.clicked.connect(self.submit_form_course)
         layout.addWidget(submit_button_course, 3, 1)
 
+        # Import button for creating many courses from a CSV file
+        import_button_course = QPushButton("Import CSV")
+        import_button_course.clicked.connect(lambda: import_from_csv("courses", None, self))
+        layout.addWidget(import_button_course, 4, 1)
+
         # --------------------------------------------------------------------------------------------------------
 
         # THIS PART IS TO VIEW/EDIT/DELETE INFORMATION OF COURSES IN DATABASE
@@ -55,8 +66,10 @@ class CourseTab(QWidget):
         edit_button.clicked.connect(self.edit_course)
         layout.addWidget(edit_button, 3, 4)
 
-        # Refresh dropdown menu to show existing courses
-        self.dropdown_refresh()
+        # The dropdown is filled once; after that only the courses added, changed or deleted
+        # (published on the change bus by the models) are applied to it
+        self.course_ids = ComboOptions(self.selected_ID, "No courses in database", self.load_course_ids, self.tasks)
+        subscribe_widget(self, lambda change: self.course_ids.apply(change, 'courseID'), 'course')
 
     # THIS FUNCTION CREATES NEW COURSE IN DATABASE
     def submit_form_course(self):
@@ -64,52 +77,38 @@ class CourseTab(QWidget):
         courseID = int(self.ID_entry.text())
 
         # Create a new course and save it to the database
-        Course.create_course(courseID, courseName).save_to_db()
+        self.tasks.run(None, lambda: Course.create_course(courseID, courseName).save_to_db(),
+                       on_result=lambda _: self.course_submitted(courseName, courseID))
 
+    # THIS FUNCTION CLEARS THE FORM ONCE THE NEW COURSE IS SAVED
+    def course_submitted(self, courseName, courseID):
         # Clear fields after submission
         self.course_entry.clear()
         self.ID_entry.clear()
 
-        # Refresh the dropdown to include the new course
-        self.dropdown_refresh()
-
         print(f"Course Submitted: {courseName}, {courseID}")
 
-    # THIS FUNCTION REFRESHES THE DROPDOWN MENU WITH COURSE ID
-    def dropdown_refresh(self):
-        conn = sqlite3.connect('school_management.db')
+    # THIS FUNCTION RETURNS THE IDS OF EVERY COURSE SHOWN IN THE DROPDOWN MENU
+    def load_course_ids(self):
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute('SELECT courseID FROM courses')
-        courses = cursor.fetchall()
-        conn.close()
-
-        self.selected_ID.clear()
-        courses_ID = [str(course[0]) for course in courses]
-        if courses_ID:
-            self.selected_ID.addItems(courses_ID)
-        else:
-            self.selected_ID.addItem("No courses in database")
+        return [row[0] for row in cursor.fetchall()]
 
     # THIS CLASS ALLOWS COURSE INFORMATION MODIFICATION/DELETION 
     class EditDialog(QDialog):
-        def __init__(self, course_ID, parent=None):
+        def __init__(self, course, parent=None):
             super().__init__(parent)
-            self.course_ID = course_ID
+            self.course_ID = course.courseID
+            self.tasks = TaskRunner(self)
 
             self.setWindowTitle("Edit Course")
             self.setFixedSize(300, 200)
 
-            conn = sqlite3.connect('school_management.db')
-            cursor = conn.cursor()
-
             layout = QGridLayout(self)
 
-            # Fetch existing course data
-            cursor.execute('SELECT courseName FROM courses WHERE courseID = ?', (course_ID,))
-            course_data = cursor.fetchone()
-
             # Fields for editing
-            self.name_entry = QLineEdit(course_data[0])
+            self.name_entry = QLineEdit(course.courseName)
             layout.addWidget(QLabel("Name:"), 0, 0)
             layout.addWidget(self.name_entry, 0, 1)
 
@@ -122,38 +121,30 @@ class CourseTab(QWidget):
             delete_button.clicked.connect(self.delete)
             layout.addWidget(delete_button, 3, 0)
 
-            conn.close()
+            # The buttons can't be pressed again while the change is being saved
+            for button in (modify_button, delete_button):
+                self.tasks.busy.connect(lambda busy, button=button: button.setEnabled(not busy))
 
         # THIS METHOD MODIFIES THE COURSE INFORMATION
         def modify(self):
             courseID = self.course_ID
-            conn = sqlite3.connect('school_management.db')
-            cursor = conn.cursor()
-
-            if self.name_entry.text():
-                cursor.execute('''
-                    UPDATE courses
-                    SET courseName = ?
-                    WHERE courseID = ?
-                ''', (self.name_entry.text(), courseID))
-
-            conn.commit()
-            conn.close()
-
-            self.parent().dropdown_refresh()
-            self.accept()
+            self.tasks.run(None, Course.update_in_db, courseID, self.name_entry.text(),
+                           on_result=lambda _: self.accept())
 
         # THIS METHOD DELETES THE COURSE
         def delete(self):
             courseID = self.course_ID
-            Course.delete_from_db(courseID)
-
-            self.parent().dropdown_refresh()
-            self.accept()
+            self.tasks.run(None, Course.delete_from_db, courseID, on_result=lambda _: self.accept())
 
     # THIS FUNCTION OPENS THE EDIT WINDOW WHERE COURSE INFORMATION CAN BE MODIFIED
     def edit_course(self):
         course_ID = self.selected_ID.currentText()
         if course_ID != "No courses in database":
-            dialog = self.EditDialog(int(course_ID), self)
+            # The course is read in the background, the window opens once it is found
+            self.tasks.run('edit', Course.get_by_id, int(course_ID), on_result=self.open_edit_dialog)
+
+    # THIS FUNCTION OPENS THE EDIT WINDOW OF THE COURSE FOUND
+    def open_edit_dialog(self, course):
+        if course is not None:
+            dialog = self.EditDialog(course, self)
             dialog.exec_()
@@ -0,0 +1,98 @@
+import threading
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtWidgets import (
+    QDialog, QLabel, QPushButton, QVBoxLayout, QProgressBar, QListWidget, QFileDialog
+)
+from Classes.BulkImport import ImportReport, import_csv
+
+
+# THIS THREAD RUNS A CSV IMPORT OUTSIDE OF THE GUI THREAD
+class ImportThread(QThread):
+    progress = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, kind, path, parent=None):
+        super().__init__(parent)
+        self.kind = kind
+        self.path = path
+        self.report = ImportReport(kind)
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        try:
+            import_csv(self.kind, self.path, cancel=self.cancel_event, report=self.report,
+                       progress=self.progress.emit)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+# THIS CLASS SHOWS THE PROGRESS OF A CSV IMPORT AND ALLOWS CANCELLING IT
+class ImportDialog(QDialog):
+    def __init__(self, kind, path, on_done=None, parent=None):
+        super().__init__(parent)
+        self.on_done = on_done
+
+        self.setWindowTitle(f"Import {kind}")
+        self.setMinimumWidth(400)
+
+        layout = QVBoxLayout(self)
+
+        self.status_label = QLabel("Starting import...")
+        layout.addWidget(self.status_label)
+
+        # the total number of rows isn't known while streaming, so the bar only shows activity
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        layout.addWidget(self.progress_bar)
+
+        self.rejects_list = QListWidget()
+        layout.addWidget(self.rejects_list)
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel)
+        layout.addWidget(self.cancel_button)
+
+        self.thread = ImportThread(kind, path, self)
+        self.thread.progress.connect(self.show_progress)
+        self.thread.failed.connect(lambda error: self.status_label.setText(f"Import failed: {error}"))
+        self.thread.finished.connect(self.import_finished)
+        self.thread.start()
+
+    # THIS METHOD SHOWS THE PROGRESS AFTER EVERY BATCH
+    def show_progress(self, report):
+        self.status_label.setText(f"{report.processed} rows processed, {report.inserted} inserted, "
+                                  f"{len(report.rejects)} rejected")
+
+    # THIS METHOD SHOWS THE RESULT ONCE THE IMPORT IS DONE
+    def import_finished(self):
+        report = self.thread.report
+        if not self.status_label.text().startswith("Import failed"):
+            self.show_progress(report)
+            if report.cancelled:
+                self.status_label.setText(self.status_label.text() + " (cancelled)")
+        self.progress_bar.setRange(0, 1)
+        self.progress_bar.setValue(1)
+        self.rejects_list.addItems([f"line {line}: {reason}" for line, reason in report.rejects])
+        self.cancel_button.setText("Close")
+        self.cancel_button.clicked.disconnect()
+        self.cancel_button.clicked.connect(self.accept)
+        if self.on_done is not None:
+            self.on_done()
+
+    # THIS METHOD STOPS THE IMPORT AFTER THE CURRENT BATCH
+    def cancel(self):
+        self.thread.cancel_event.set()
+
+    def reject(self):
+        # closing the window cancels the import instead of leaving it running
+        self.cancel()
+        self.thread.wait()
+        super().reject()
+
+
+# THIS FUNCTION ASKS FOR A CSV FILE AND IMPORTS IT
+def import_from_csv(kind, on_done=None, parent=None):
+    path, _ = QFileDialog.getOpenFileName(parent, f"Import {kind}", "", "CSV files (*.csv);;All files (*)")
+    if path:
+        dialog = ImportDialog(kind, path, on_done, parent)
+        dialog.exec_()
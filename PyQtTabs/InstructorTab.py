@@ -1,15 +1,21 @@
-import sqlite3
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QLineEdit, QPushButton, QComboBox, QGridLayout, QDialog
 )
 from PyQt5.QtGui import QFont
+from Classes.Database import get_connection
 from Classes.Person import Instructor
+from PyQtTabs.Changes import ComboOptions, subscribe_widget
+from PyQtTabs.ImportDialog import import_from_csv
+from PyQtTabs.Workers import TaskRunner
 
 
 class InstructorTab(QWidget):
     def __init__(self):
         super().__init__()
 
+        # The database work runs on a thread pool, the results come back to the GUI thread
+        self.tasks = TaskRunner(self)
+
         layout = QGridLayout(self)
 
         # THIS PART IS FOR CREATING NEW INSTRUCTORS IN DATABASE
@@ -46,6 +52,11 @@ class InstructorTab(QWidget):
         submit_button_instructor.clicked.connect(self.submit_form_instructor)
         layout.addWidget(submit_button_instructor, 6, 1)
 
+        # Import button for creating many instructors from a CSV file
+        import_button_instructor = QPushButton("Import CSV")
+        import_button_instructor.clicked.connect(lambda: import_from_csv("instructors", None, self))
+        layout.addWidget(import_button_instructor, 7, 1)
+
         # --------------------------------------------------------------------------------------------------------
 
         # THIS PART IS TO VIEW/EDIT/DELETE INFORMATION OF INSTRUCTOR IN DATABASE
@@ -63,7 +74,10 @@ class InstructorTab(QWidget):
         edit_button.clicked.connect(self.edit_instructor)
         layout.addWidget(edit_button, 3, 4)
 
-        self.dropdown_refresh()
+        # The dropdown is filled once; after that only the instructors added, changed or deleted
+        # (published on the change bus by the models) are applied to it
+        self.emails = ComboOptions(self.selected_email, "No instructors in database", self.load_emails, self.tasks)
+        subscribe_widget(self, lambda change: self.emails.apply(change, 'email'), 'instructor')
 
     # THIS FUNCTION CREATES NEW INSTRUCTOR IN DATABASE
     def submit_form_instructor(self):
@@ -72,59 +86,48 @@ class InstructorTab(QWidget):
         email = self.email_entry.text()
         instructorID = int(self.ID_entry.text())
 
-        Instructor.create_instructor(name, age, email, instructorID).save_to_db()
+        self.tasks.run(None, lambda: Instructor.create_instructor(name, age, email, instructorID).save_to_db(),
+                       on_result=lambda _: self.instructor_submitted(name, age, email, instructorID))
 
+    # THIS FUNCTION CLEARS THE FORM ONCE THE NEW INSTRUCTOR IS SAVED
+    def instructor_submitted(self, name, age, email, instructorID):
         # Clear fields after submission
         self.name_entry.clear()
         self.age_entry.clear()
         self.email_entry.clear()
         self.ID_entry.clear()
 
-        self.dropdown_refresh()
 
         print(f"Instructor Submitted: {name}, {age}, {email}, {instructorID}")
 
-    # THIS FUNCTION REFRESHES THE DROPDOWN MENU WITH INSTRUCTOR EMAIL
-    def dropdown_refresh(self):
-        conn = sqlite3.connect('school_management.db')
+    # THIS FUNCTION RETURNS THE EMAILS OF EVERY INSTRUCTOR SHOWN IN THE DROPDOWN MENU
+    def load_emails(self):
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute('SELECT email FROM instructors')
-        instructors = cursor.fetchall()
-        conn.close()
-
-        self.selected_email.clear()
-        instructors_email = [instructor[0] for instructor in instructors]
-        if instructors_email:
-            self.selected_email.addItems(instructors_email)
-        else:
-            self.selected_email.addItem("No instructors in database")
+        return [row[0] for row in cursor.fetchall()]
 
     # THIS CLASS ALLOWS INSTRUCTORS TO MODIFY/DELETE THEIR INFORMATION
     class EditDialog(QDialog):
-        def __init__(self, instructor_ID, parent=None):
+        def __init__(self, instructor, parent=None):
             super().__init__(parent)
-            self.instructorID = instructor_ID
+            self.instructorID = instructor.instructorID
+            self.tasks = TaskRunner(self)
 
             self.setWindowTitle("Edit Instructor")
             self.setFixedSize(300, 200)
 
-            conn = sqlite3.connect('school_management.db')
-            cursor = conn.cursor()
-
             layout = QGridLayout(self)
 
-            cursor.execute('SELECT name, age, email FROM instructors WHERE instructorID = ?', (instructor_ID,))
-            instructor_data = cursor.fetchone()
-
-            self.name_entry = QLineEdit(instructor_data[0])
+            self.name_entry = QLineEdit(instructor.name)
             layout.addWidget(QLabel("Name:"), 0, 0)
             layout.addWidget(self.name_entry, 0, 1)
 
-            self.age_entry = QLineEdit(str(instructor_data[1]))
+            self.age_entry = QLineEdit(str(instructor.age))
             layout.addWidget(QLabel("Age:"), 1, 0)
             layout.addWidget(self.age_entry, 1, 1)
 
-            self.email_entry = QLineEdit(instructor_data[2])
+            self.email_entry = QLineEdit(instructor.email)
             layout.addWidget(QLabel("Email:"), 2, 0)
             layout.addWidget(self.email_entry, 2, 1)
 
@@ -136,34 +139,20 @@ class InstructorTab(QWidget):
             delete_button.clicked.connect(self.delete)
             layout.addWidget(delete_button, 3, 0)
 
-            conn.close()
+            # The buttons can't be pressed again while the change is being saved
+            for button in (modify_button, delete_button):
+                self.tasks.busy.connect(lambda busy, button=button: button.setEnabled(not busy))
 
         def modify(self):
-            conn = sqlite3.connect('school_management.db')
-            cursor = conn.cursor()
-
             name = self.name_entry.text()
             age = self.age_entry.text()
             email = self.email_entry.text()
 
-            cursor.execute('UPDATE instructors SET name = ?, age = ?, email = ? WHERE instructorID = ?',
-                           (name, age, email, self.instructorID))
-            conn.commit()
-            conn.close()
-
-            self.parent().dropdown_refresh()
-            self.accept()
+            self.tasks.run(None, Instructor.update_in_db, self.instructorID, name, age, email,
+                           on_result=lambda _: self.accept())
 
         def delete(self):
-            conn = sqlite3.connect('school_management.db')
-            cursor = conn.cursor()
-
-            cursor.execute('DELETE FROM instructors WHERE instructorID = ?', (self.instructorID,))
-            conn.commit()
-            conn.close()
-
-            self.parent().dropdown_refresh()
-            self.accept()
+            self.tasks.run(None, Instructor.delete_from_db, self.instructorID, on_result=lambda _: self.accept())
 
     # THIS FUNCTION OPENS THE EDIT WINDOW WHERE INSTRUCTOR CAN EDIT THEIR INFORMATION
     def edit_instructor(self):
@@ -171,12 +160,19 @@ class InstructorTab(QWidget):
         if email == "No instructors in database":
             return
 
-        conn = sqlite3.connect('school_management.db')
+        # The instructor is read in the background, the window opens once it is found
+        self.tasks.run('edit', self.find_instructor, email, on_result=self.open_edit_dialog)
+
+    # THIS FUNCTION RETURNS THE INSTRUCTOR WITH AN EMAIL (None if there is none)
+    def find_instructor(self, email):
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute('SELECT instructorID FROM instructors WHERE email = ?', (email,))
-        instructor_ID = cursor.fetchone()
-        conn.close()
+        row = cursor.fetchone()
+        return Instructor.get_by_id(row[0]) if row else None
 
-        if instructor_ID:
-            dialog = self.EditDialog(instructor_ID[0], self)
+    # THIS FUNCTION OPENS THE EDIT WINDOW OF THE INSTRUCTOR FOUND
+    def open_edit_dialog(self, instructor):
+        if instructor is not None:
+            dialog = self.EditDialog(instructor, self)
             dialog.exec_()
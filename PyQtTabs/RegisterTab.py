@@ -1,10 +1,15 @@
-import sqlite3
+from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import (
-    QWidget, QLabel, QLineEdit, QPushButton, QComboBox, QGridLayout, QRadioButton
+    QWidget, QLabel, QLineEdit, QPushButton, QComboBox, QGridLayout, QRadioButton, QDialog, QListWidget,
+    QListWidgetItem, QAbstractItemView
 )
 from PyQt5.QtGui import QFont
 from Classes.Course import Course
+from Classes.Events import affects_courses_of, apply_to_list
 from Classes.Person import Student, Instructor
+from PyQtTabs.Changes import ComboOptions, subscribe_widget
+from PyQtTabs.ImportDialog import import_from_csv
+from PyQtTabs.Workers import TaskRunner
 
 
 class RegisterTab(QWidget):
@@ -13,6 +18,13 @@ class RegisterTab(QWidget):
 
         layout = QGridLayout(self)
 
+        # The database work runs on a thread pool, the results come back to the GUI thread
+        self.tasks = TaskRunner(self)
+
+        # The emails of both roles are read once (in the background), then kept up to date
+        # from the change bus, so switching the role doesn't read the database again
+        self.people = {"Student": [], "Instructor": []}
+
         # THIS PART IS FOR REGISTERING/ASSIGNING COURSES TO STUDENTS/INSTRUCTORS
         bold_font = QFont()
         bold_font.setPointSize(14)
@@ -42,6 +54,8 @@ class RegisterTab(QWidget):
 
         self.selected_name = QComboBox()
         layout.addWidget(self.selected_name, 4, 0, 1, 2)
+        self.register_emails = ComboOptions(self.selected_name, "No students available",
+                                            lambda: self.people["Student" if self.student_radio.isChecked() else "Instructor"])
 
         self.selected_course = QComboBox()
         layout.addWidget(self.selected_course, 6, 0, 1, 2)
@@ -54,6 +68,16 @@ class RegisterTab(QWidget):
         submit_registration_button.clicked.connect(self.submit_course_registration)
         layout.addWidget(submit_registration_button, 7, 1)
 
+        # Import button for registering many students from a CSV file
+        import_registration_button = QPushButton("Import CSV")
+        import_registration_button.clicked.connect(lambda: import_from_csv("registrations", None, self))
+        layout.addWidget(import_registration_button, 8, 1)
+
+        # Button for registering many students to many courses at once
+        batch_registration_button = QPushButton("Register Many")
+        batch_registration_button.clicked.connect(self.open_batch_dialog)
+        layout.addWidget(batch_registration_button, 8, 0)
+
         self.update_dropdown()
 
         # --------------------------------------------------------------------------------------------------------
@@ -74,6 +98,9 @@ class RegisterTab(QWidget):
 
         self.selected_name_unregistered = QComboBox()
         layout.addWidget(self.selected_name_unregistered, 4, 4, 1, 2)
+        self.unregister_emails = ComboOptions(
+            self.selected_name_unregistered, "No students available",
+            lambda: self.people["Student" if self.student_radio_unregistered.isChecked() else "Instructor"])
 
         self.selected_course_unregistered = QComboBox()
         layout.addWidget(self.selected_course_unregistered, 6, 4, 1, 2)
@@ -88,149 +115,204 @@ class RegisterTab(QWidget):
 
         self.update_dropdown_unregister()
 
+        subscribe_widget(self, self.people_changed, 'student', 'instructor')
+        subscribe_widget(self, self.courses_changed, 'course', 'registration')
+        for role in self.people:
+            self.reload_people(role)
+
+    def load_people(self, role):
+        """Returns the emails of every student or instructor."""
+        model = Student if role == "Student" else Instructor
+        return [person.email for person in model.iter_from_db()]
+
+    def reload_people(self, role):
+        """Reads the emails of a role in the background, then shows them in the dropdowns of that role."""
+        self.tasks.run(("people", role), self.load_people, role,
+                       on_result=lambda emails: self.people_loaded(role, emails))
+
+    def people_loaded(self, role, emails):
+        """Shows the emails of a role read by `reload_people`."""
+        self.people[role] = emails
+        if self.student_radio.isChecked() == (role == "Student"):
+            self.register_emails.set_values(emails)
+        if self.student_radio_unregistered.isChecked() == (role == "Student"):
+            self.unregister_emails.set_values(emails)
+
     def update_dropdown(self):
         """Updates the dropdown menu with emails of students or instructors based on the selected role."""
+        self.tasks.cancel("register courses")
         self.selected_name.clear()
         self.selected_course.clear()
 
         role = "Student" if self.student_radio.isChecked() else "Instructor"
 
-        if role == "Student":
-            students = Student.load_from_db()
-            students_email = [student.email for student in students]
-            self.selected_name.addItems(students_email)
-        elif role == "Instructor":
-            instructors = Instructor.load_from_db()
-            instructors_email = [instructor.email for instructor in instructors]
-            self.selected_name.addItems(instructors_email)
+        self.register_emails.placeholder = f"No {role.lower()}s available"
+        self.register_emails.set_values(self.people[role])
 
     def submit_email(self):
         """Shows the available courses based on the selected user (student/instructor)."""
         self.selected_course.clear()
         role = "Student" if self.student_radio.isChecked() else "Instructor"
         email = self.selected_name.currentText()
+        self.tasks.run("register courses", Course.available_courses_for, email, role,
+                       on_result=self.show_unregistered_courses)
 
-        courses = Course.load_from_db()
-        available_courses = [str(course.courseID) for course in courses]
-
-        if role == "Student":
-            registered_courses = self.get_student_courses(email)
-        else:
-            registered_courses = self.get_instructor_courses(email)
-
-        unregistered_courses = [course for course in available_courses if course not in registered_courses]
-
-        if unregistered_courses:
-            self.selected_course.addItems(unregistered_courses)
-        else:
-            self.selected_course.addItem("No courses available")
+    def show_unregistered_courses(self, unregistered_courses):
+        """Lists the courses the chosen person can register to or be assigned to."""
+        self.show_courses(self.selected_course, unregistered_courses)
 
     def submit_course_registration(self):
         """Registers a student or assigns a course to an instructor."""
         role = "Student" if self.student_radio.isChecked() else "Instructor"
         email = self.selected_name.currentText()
-        course_ID = self.selected_course.currentText()
-
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
+        course_ID = self.selected_course.currentData()
+        if course_ID is None:
+            return
 
         if role == "Student":
-            cursor.execute('''
-                INSERT INTO registrations (studentEmail, courseID)
-                VALUES (?, ?)
-            ''', (email, course_ID))
-        else:
-            cursor.execute('''
-                UPDATE courses
-                SET instructor = ?
-                WHERE courseID = ?
-            ''', (email, course_ID))
-
-        conn.commit()
-        conn.close()
-
+            self.tasks.run(None, Course.register_student, course_ID, email,
+                           on_result=lambda _: self.registration_done())
+        if role == "Instructor":
+            self.tasks.run(None, Course.assign_instructor, course_ID, email,
+                           on_result=lambda _: self.registration_done())
+
+    def registration_done(self):
+        """Clears the registration form once the registration is saved."""
         self.selected_name.clear()
         self.selected_course.clear()
         self.update_dropdown()
 
     def update_dropdown_unregister(self):
         """Updates the dropdown for unregistering a course."""
+        self.tasks.cancel("unregister courses")
         self.selected_name_unregistered.clear()
         self.selected_course_unregistered.clear()
 
         role = "Student" if self.student_radio_unregistered.isChecked() else "Instructor"
 
-        if role == "Student":
-            students = Student.load_from_db()
-            students_email = [student.email for student in students]
-            self.selected_name_unregistered.addItems(students_email)
-        else:
-            instructors = Instructor.load_from_db()
-            instructors_email = [instructor.email for instructor in instructors]
-            self.selected_name_unregistered.addItems(instructors_email)
+        self.unregister_emails.placeholder = f"No {role.lower()}s available"
+        self.unregister_emails.set_values(self.people[role])
 
     def submit_email_unregister(self):
         """Shows the courses registered by a student or assigned to an instructor."""
         self.selected_course_unregistered.clear()
         role = "Student" if self.student_radio_unregistered.isChecked() else "Instructor"
         email = self.selected_name_unregistered.currentText()
+        self.tasks.run("unregister courses", Course.registered_courses_for, email, role,
+                       on_result=self.show_registered_courses)
 
-        courses = Course.load_from_db()
-        available_courses = [str(course.courseID) for course in courses]
-
-        if role == "Student":
-            registered_courses = self.get_student_courses(email)
-        else:
-            registered_courses = self.get_instructor_courses(email)
-
-        registered_courses_list = [course for course in available_courses if course in registered_courses]
+    def show_registered_courses(self, registered_courses_list):
+        """Lists the courses the chosen person is registered to or assigned to."""
+        self.show_courses(self.selected_course_unregistered, registered_courses_list)
 
-        if registered_courses_list:
-            self.selected_course_unregistered.addItems(registered_courses_list)
-        else:
-            self.selected_course_unregistered.addItem("No courses available")
+    def show_courses(self, combo, courses):
+        """Fills a course dropdown with (courseID, courseName) pairs, keeping the ID as the item data."""
+        combo.clear()
+        for course_id, course_name in courses:
+            combo.addItem(f"{course_id} - {course_name}", course_id)
+        if not courses:
+            combo.addItem("No courses available")
 
     def submit_course_unregistration(self):
         """Unregisters a student from a course or unassigns an instructor from a course."""
         role = "Student" if self.student_radio_unregistered.isChecked() else "Instructor"
         email = self.selected_name_unregistered.currentText()
-        course_ID = self.selected_course_unregistered.currentText()
-
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
+        course_ID = self.selected_course_unregistered.currentData()
+        if course_ID is None:
+            return
 
         if role == "Student":
-            cursor.execute('''
-                DELETE FROM registrations
-                WHERE studentEmail = ? AND courseID = ?
-            ''', (email, course_ID))
-        else:
-            cursor.execute('''
-                UPDATE courses
-                SET instructor = NULL
-                WHERE courseID = ?
-            ''', (course_ID,))
-
-        conn.commit()
-        conn.close()
-
+            self.tasks.run(None, Course.unregister_student, course_ID, email,
+                           on_result=lambda _: self.unregistration_done())
+        if role == "Instructor":
+            self.tasks.run(None, Course.assign_instructor, course_ID, None,
+                           on_result=lambda _: self.unregistration_done())
+
+    def unregistration_done(self):
+        """Clears the unregistration form once the change is saved."""
         self.selected_name_unregistered.clear()
         self.selected_course_unregistered.clear()
         self.update_dropdown_unregister()
 
-    # Helper methods to get courses for a student or instructor
-    def get_student_courses(self, email):
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT courseID FROM registrations WHERE studentEmail = ?', (email,))
-        course_ids = cursor.fetchall()
-        conn.close()
-        return [str(course[0]) for course in course_ids]
-
-    def get_instructor_courses(self, email):
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT courseID FROM courses WHERE instructor = ?', (email,))
-        course_ids = cursor.fetchall()
-        conn.close()
-        return [str(course[0]) for course in course_ids]
+    def open_batch_dialog(self):
+        """Opens the window registering many students to many courses at once."""
+        dialog = self.BatchDialog(self.people["Student"], self)
+        dialog.exec_()
+
+    # Window to register the selected students to the selected courses in one transaction
+    class BatchDialog(QDialog):
+        def __init__(self, emails, parent=None):
+            super().__init__(parent)
+            self.tasks = TaskRunner(self)
+
+            self.setWindowTitle("Register Many Students")
+            self.setMinimumSize(500, 400)
+
+            layout = QGridLayout(self)
+
+            # Both lists allow selecting many items (shift/ctrl click)
+            layout.addWidget(QLabel("Students"), 0, 0)
+            self.students_list = QListWidget()
+            self.students_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
+            self.students_list.addItems(emails)
+            layout.addWidget(self.students_list, 1, 0)
+
+            layout.addWidget(QLabel("Courses"), 0, 1)
+            self.courses_list = QListWidget()
+            self.courses_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
+            layout.addWidget(self.courses_list, 1, 1)
+
+            self.status_label = QLabel("Select the students and the courses to register them to")
+            layout.addWidget(self.status_label, 2, 0, 1, 2)
+
+            register_button = QPushButton("Register")
+            register_button.clicked.connect(self.register)
+            layout.addWidget(register_button, 3, 1)
+
+            # The button can't be pressed again while the registrations are being saved
+            self.tasks.busy.connect(lambda busy: register_button.setEnabled(not busy))
+
+            self.tasks.run("courses", self.load_courses, on_result=self.show_courses)
+
+        def load_courses(self):
+            return [(course.courseID, course.courseName) for course in Course.iter_from_db()]
+
+        def show_courses(self, courses):
+            for course_id, course_name in courses:
+                item = QListWidgetItem(f"{course_id} - {course_name}")
+                item.setData(Qt.UserRole, course_id)
+                self.courses_list.addItem(item)
+
+        def register(self):
+            emails = [item.text() for item in self.students_list.selectedItems()]
+            course_ids = [item.data(Qt.UserRole) for item in self.courses_list.selectedItems()]
+            if not emails or not course_ids:
+                self.status_label.setText("Select at least one student and one course")
+                return
+            self.tasks.run(None, Course.register_students, course_ids, emails, on_result=self.registered)
+
+        def registered(self, count):
+            self.status_label.setText(f"{count.registered} registrations added, "
+                                      f"{count.skipped} already registered")
+            self.students_list.clearSelection()
+            self.courses_list.clearSelection()
+
+    def people_changed(self, change):
+        """Applies a student or instructor added, changed or deleted to the email dropdowns."""
+        role = "Student" if change.entity == "student" else "Instructor"
+        if not apply_to_list(self.people[role], change, 'email'):
+            self.reload_people(role)
+            return
+        if self.student_radio.isChecked() == (role == "Student"):
+            self.register_emails.apply(change, 'email')
+        if self.student_radio_unregistered.isChecked() == (role == "Student"):
+            self.unregister_emails.apply(change, 'email')
+
+    def courses_changed(self, change):
+        """Reads again the courses of the chosen people when a course or registration change alters them."""
+        email = self.selected_name.currentText()
+        if self.selected_course.count() and affects_courses_of(change, email):
+            self.submit_email()
+        email = self.selected_name_unregistered.currentText()
+        if self.selected_course_unregistered.count() and affects_courses_of(change, email):
+            self.submit_email_unregister()
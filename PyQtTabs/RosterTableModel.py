@@ -0,0 +1,215 @@
+from collections import deque
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt5.QtWidgets import QWidget
+from Classes.Roster import DEFAULT_ORDER, ROSTERS, roster, roster_edits, row_key
+from PyQtTabs.Workers import TaskRunner
+
+# Number of rows loaded at a time when scrolling through a table
+PAGE_SIZE = 100
+
+
+# THIS MODEL SHOWS A ROSTER IN A QTableView, LOADING ITS ROWS ONLY AS THE VIEW SCROLLS
+class RosterTableModel(QAbstractTableModel):
+    """
+    Table model of a roster (students, instructors or courses) for a QTableView.
+
+    Without a search, rows are read from the database one page at a time through
+    `canFetchMore`/`fetchMore`, which the view calls when it is scrolled close to the
+    last loaded row; sorting by a column re-reads the pages in that order with SQL.
+    With a search, the matches are handed over as they are and shown page by page.
+    Only the rows the view asks for are turned into display values. The rows a change
+    of the change bus alters are applied with `apply_change` instead of reloading.
+
+    The pages, the searches and the rows of the changes are read on a thread pool (see
+    `Workers.TaskRunner`): the rows are inserted once they arrive, and reading a new
+    page or search drops the result of the one it replaces.
+
+    Parameters:
+    ----------
+        kind (str): The roster shown ('students', 'instructors' or 'courses').
+        headers (list of str): The titles of the columns.
+        parent (QObject): The parent of the model, showing the busy cursor if it is a widget (optional).
+    """
+    # Emitted when a change can alter any row and the roster must be loaded again
+    outdated = pyqtSignal()
+
+    def __init__(self, kind, headers, parent=None):
+        super().__init__(parent)
+        self.tasks = TaskRunner(parent if isinstance(parent, QWidget) else None)
+        self.kind = kind
+        self.headers = headers
+        self.columns = ROSTERS[kind]['columns']
+        self.order_by = DEFAULT_ORDER[kind]
+        self.descending = False
+        self.rows = []
+        self.matches = None
+        self.last_key = None
+        self.more = True
+        self.loading = False
+        # changes waiting to be applied, one at a time, and a counter of the edits of the rows
+        self.changes = deque()
+        self.version = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        value = self.rows[index.row()][index.column()]
+        # The last column lists the related courses or students
+        if index.column() == len(self.columns):
+            return value or "None"
+        # e.g. a course without instructor
+        return "" if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.more and not self.loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self.more or self.loading:
+            return
+        start = len(self.rows)
+        if self.matches is None:
+            # the page is read in the background and inserted by page_loaded
+            self.loading = True
+            self.tasks.run('page', roster, self.kind, self.last_key, PAGE_SIZE, self.order_by, self.descending,
+                           on_result=self.page_loaded, on_error=self.page_failed)
+            return
+        page = self.matches[start:start + PAGE_SIZE]
+        self.more = start + len(page) < len(self.matches)
+        self.insert_rows(page)
+
+    # Function to insert a page read from the database after the loaded rows
+    def page_loaded(self, page):
+        self.loading = False
+        if page:
+            self.last_key = row_key(self.kind, page[-1], self.order_by)
+        self.more = len(page) == PAGE_SIZE
+        self.insert_rows(page)
+
+    # Function to stop loading pages after an error (the next reload tries again)
+    def page_failed(self, error):
+        self.loading = False
+        self.more = False
+        self.tasks.show_error(error)
+
+    def insert_rows(self, page):
+        if page:
+            start = len(self.rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+            self.rows.extend(page)
+            self.endInsertRows()
+            self.version += 1
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        # Only the columns with a paging order can be sorted, not the list of related courses or
+        # students (nor the instructor of the courses)
+        if column >= len(self.columns) or self.columns[column] not in ROSTERS[self.kind]['page_keys']:
+            return
+        self.order_by = self.columns[column]
+        self.descending = order == Qt.DescendingOrder
+        if self.matches is not None:
+            keys = ROSTERS[self.kind]['page_keys'][self.order_by]
+            indexes = [self.columns.index(key) for key in keys]
+            self.matches.sort(key=lambda row: tuple((row[i] is not None, row[i]) for i in indexes),
+                              reverse=self.descending)
+        self.reload()
+
+    # Function to show every row of the roster, read page by page from the database
+    def show_all(self):
+        self.tasks.cancel('search')
+        self.matches = None
+        self.reload()
+
+    # Function to run a search (IncrementalSearch) in the background and show its matches
+    def show_search(self, searcher, query):
+        self.tasks.run('search', lambda: list(searcher.search(query)), on_result=self.show_matches)
+
+    # Function to drop the search being run, if any
+    def cancel_search(self, searcher):
+        searcher.cancel()
+        self.tasks.cancel('search')
+
+    # Function to show the rows matching a search (in the order of relevance until a column is sorted)
+    def show_matches(self, rows):
+        self.matches = list(rows)
+        self.reload()
+
+    # Function to apply a change of the change bus to the rows loaded so far. The changed
+    # rows are read in the background, one change after the other; `outdated` is emitted
+    # when the change can alter any row and the roster must be loaded again
+    def apply_change(self, change):
+        self.changes.append(change)
+        if len(self.changes) == 1:
+            self.read_change()
+
+    # Function to read the rows altered by the first change waiting
+    def read_change(self):
+        change = self.changes[0]
+        version = self.version
+        if self.matches is None:
+            args = (self.kind, list(self.rows), change, self.order_by, self.descending, not self.more)
+        else:
+            # the matches keep their order, changed rows are only updated or removed
+            args = (self.kind, list(self.matches), change)
+        self.tasks.run('change', roster_edits, *args, on_result=lambda edits: self.change_read(edits, version))
+
+    # Function to apply the edits of a change, unless the rows were changed while they were read
+    def change_read(self, edits, version):
+        if version != self.version:
+            self.read_change()
+            return
+        self.changes.popleft()
+        if edits is None:
+            self.outdated.emit()
+        else:
+            self.apply_edits(edits)
+        if self.changes:
+            self.read_change()
+
+    def apply_edits(self, edits):
+        self.version += 1
+        for edit in edits:
+            index = edit[1]
+            if self.matches is not None:
+                if edit[0] == 'update':
+                    self.matches[index] = edit[2]
+                else:
+                    del self.matches[index]
+                if index >= len(self.rows):
+                    continue
+            if edit[0] == 'update':
+                self.rows[index] = edit[2]
+                self.dataChanged.emit(self.index(index, 0), self.index(index, len(self.headers) - 1))
+            elif edit[0] == 'delete':
+                self.beginRemoveRows(QModelIndex(), index, index)
+                del self.rows[index]
+                self.endRemoveRows()
+            else:
+                self.beginInsertRows(QModelIndex(), index, index)
+                self.rows.insert(index, edit[2])
+                self.endInsertRows()
+
+    # Function to drop the loaded rows and load the first page again. The pages and the
+    # changes still being read are dropped, the new pages already hold every change
+    def reload(self):
+        self.tasks.cancel('page')
+        self.tasks.cancel('change')
+        self.changes.clear()
+        self.beginResetModel()
+        self.rows = []
+        self.last_key = None
+        self.more = True
+        self.loading = False
+        self.version += 1
+        self.endResetModel()
+        self.fetchMore()
@@ -1,15 +1,21 @@
-import sqlite3
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QLineEdit, QPushButton, QComboBox, QGridLayout, QDialog, QVBoxLayout
 )
 from PyQt5.QtGui import QFont
+from Classes.Database import get_connection
 from Classes.Person import Student
+from PyQtTabs.Changes import ComboOptions, subscribe_widget
+from PyQtTabs.ImportDialog import import_from_csv
+from PyQtTabs.Workers import TaskRunner
 
 
 class StudentTab(QWidget):
     def __init__(self):
         super().__init__()
 
+        # The database work runs on a thread pool, the results come back to the GUI thread
+        self.tasks = TaskRunner(self)
+
         # Layout for the tab
         layout = QGridLayout(self)
 
@@ -48,6 +54,11 @@ class StudentTab(QWidget):
         submit_button_student.clicked.connect(self.submit_form_student)
         layout.addWidget(submit_button_student, 6, 1)
 
+        # Import button for creating many students from a CSV file
+        import_button_student = QPushButton("Import CSV")
+        import_button_student.clicked.connect(lambda: import_from_csv("students", None, self))
+        layout.addWidget(import_button_student, 7, 1)
+
         # --------------------------------------------------------------------------------------------------------
 
         # THIS PART IS TO VIEW/EDIT/DELETE INFORMATION OF STUDENT IN DATABASE
@@ -65,7 +76,10 @@ class StudentTab(QWidget):
         edit_button.clicked.connect(self.edit_student)
         layout.addWidget(edit_button, 3, 4)
 
-        self.dropdown_refresh()
+        # The dropdown is filled once; after that only the students added, changed or deleted
+        # (published on the change bus by the models) are applied to it
+        self.emails = ComboOptions(self.selected_email, "No students in database", self.load_emails, self.tasks)
+        subscribe_widget(self, lambda change: self.emails.apply(change, 'email'), 'student')
 
     # THIS FUNCTION CREATES NEW STUDENT IN DATABASE
     def submit_form_student(self):
@@ -74,60 +88,48 @@ class StudentTab(QWidget):
         email = self.email_entry.text()
         studentID = int(self.ID_entry.text())
 
-        Student.create_student(name, age, email, studentID).save_to_db()
+        self.tasks.run(None, lambda: Student.create_student(name, age, email, studentID).save_to_db(),
+                       on_result=lambda _: self.student_submitted(name, age, email, studentID))
 
+    # THIS FUNCTION CLEARS THE FORM ONCE THE NEW STUDENT IS SAVED
+    def student_submitted(self, name, age, email, studentID):
         # Clear fields after submission
         self.name_entry.clear()
         self.age_entry.clear()
         self.email_entry.clear()
         self.ID_entry.clear()
-        self.dropdown_refresh()
 
         print(f"Student Submitted: {name}, {age}, {email}, {studentID}")
 
-    # THIS FUNCTION REFRESHES THE DROPDOWN MENU WITH STUDENT EMAIL
-    def dropdown_refresh(self):
-        conn = sqlite3.connect('school_management.db')
+    # THIS FUNCTION RETURNS THE EMAILS OF EVERY STUDENT SHOWN IN THE DROPDOWN MENU
+    def load_emails(self):
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute('SELECT email FROM students')
-        students = cursor.fetchall()
-        conn.close()
-
-        self.selected_email.clear()
-        students_email = [student[0] for student in students]
-        if students_email:
-            self.selected_email.addItems(students_email)
-        else:
-            self.selected_email.addItem("No students in database")
+        return [row[0] for row in cursor.fetchall()]
 
     # THIS CLASS ALLOWS STUDENTS TO MODIFY/DELETE THEIR INFORMATION
     class EditDialog(QDialog):
-        def __init__(self, student_ID, parent=None):
+        def __init__(self, student, parent=None):
             super().__init__(parent)
-            self.studentID = student_ID
+            self.studentID = student.studentID
+            self.tasks = TaskRunner(self)
 
             self.setWindowTitle("Edit Student")
             self.setFixedSize(300, 200)
 
-            conn = sqlite3.connect('school_management.db')
-            cursor = conn.cursor()
-
             layout = QGridLayout(self)
 
-            # Fetch existing student data
-            cursor.execute('SELECT name, age, email FROM students WHERE studentID = ?', (student_ID,))
-            student_data = cursor.fetchone()
-
             # Fields for editing
-            self.name_entry = QLineEdit(student_data[0])
+            self.name_entry = QLineEdit(student.name)
             layout.addWidget(QLabel("Name:"), 0, 0)
             layout.addWidget(self.name_entry, 0, 1)
 
-            self.age_entry = QLineEdit(str(student_data[1]))
+            self.age_entry = QLineEdit(str(student.age))
             layout.addWidget(QLabel("Age:"), 1, 0)
             layout.addWidget(self.age_entry, 1, 1)
 
-            self.email_entry = QLineEdit(student_data[2])
+            self.email_entry = QLineEdit(student.email)
             layout.addWidget(QLabel("Email:"), 2, 0)
             layout.addWidget(self.email_entry, 2, 1)
 
@@ -140,34 +142,20 @@ class StudentTab(QWidget):
             delete_button.clicked.connect(self.delete)
             layout.addWidget(delete_button, 3, 0)
 
-            conn.close()
+            # The buttons can't be pressed again while the change is being saved
+            for button in (modify_button, delete_button):
+                self.tasks.busy.connect(lambda busy, button=button: button.setEnabled(not busy))
 
         def modify(self):
-            conn = sqlite3.connect('school_management.db')
-            cursor = conn.cursor()
-
             name = self.name_entry.text()
             age = self.age_entry.text()
             email = self.email_entry.text()
 
-            cursor.execute('UPDATE students SET name = ?, age = ?, email = ? WHERE studentID = ?',
-                           (name, age, email, self.studentID))
-            conn.commit()
-            conn.close()
-
-            self.parent().dropdown_refresh()
-            self.accept()
+            self.tasks.run(None, Student.update_in_db, self.studentID, name, age, email,
+                           on_result=lambda _: self.accept())
 
         def delete(self):
-            conn = sqlite3.connect('school_management.db')
-            cursor = conn.cursor()
-
-            cursor.execute('DELETE FROM students WHERE studentID = ?', (self.studentID,))
-            conn.commit()
-            conn.close()
-
-            self.parent().dropdown_refresh()
-            self.accept()
+            self.tasks.run(None, Student.delete_from_db, self.studentID, on_result=lambda _: self.accept())
 
     # THIS FUNCTION OPENS THE EDIT WINDOW WHERE STUDENT CAN EDIT THEIR INFORMATION
     def edit_student(self):
@@ -175,12 +163,19 @@ class StudentTab(QWidget):
         if email == "No students in database":
             return
 
-        conn = sqlite3.connect('school_management.db')
+        # The student is read in the background, the window opens once it is found
+        self.tasks.run('edit', self.find_student, email, on_result=self.open_edit_dialog)
+
+    # THIS FUNCTION RETURNS THE STUDENT WITH AN EMAIL (None if there is none)
+    def find_student(self, email):
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute('SELECT studentID FROM students WHERE email = ?', (email,))
-        student_ID = cursor.fetchone()
-        conn.close()
+        row = cursor.fetchone()
+        return Student.get_by_id(row[0]) if row else None
 
-        if student_ID:
-            dialog = self.EditDialog(student_ID[0], self)
+    # THIS FUNCTION OPENS THE EDIT WINDOW OF THE STUDENT FOUND
+    def open_edit_dialog(self, student):
+        if student is not None:
+            dialog = self.EditDialog(student, self)
             dialog.exec_()
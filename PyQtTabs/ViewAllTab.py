@@ -1,10 +1,12 @@
-import sqlite3
 from PyQt5.QtWidgets import (
-    QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem
+    QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView
 )
+from PyQt5.QtCore import QTimer, Qt
 from PyQt5.QtGui import QFont
-from Classes.Course import Course
-from Classes.Person import Student, Instructor
+from Classes.Roster import ROSTERS
+from Classes.Search import DEBOUNCE_MS, IncrementalSearch
+from PyQtTabs.Changes import subscribe_widget
+from PyQtTabs.RosterTableModel import RosterTableModel
 
 
 class ViewAllTab(QWidget):
@@ -49,41 +51,24 @@ class ViewAllTab(QWidget):
             if child.widget():
                 child.widget().deleteLater()
 
-    # Function to view all instructors
-    def view_instructors(self):
-        self.clear_view()
+    # Function to run a search only once the user has stopped typing: every keystroke cancels
+    # the search being shown and restarts the timer, so a word runs one search instead of one per character
+    def debounce(self, search_var, cancel_search, update_table):
+        timer = QTimer(search_var)
+        timer.setSingleShot(True)
+        timer.setInterval(DEBOUNCE_MS)
+        timer.timeout.connect(lambda: update_table(search_var.text()))
 
-        # Search layout
-        search_layout = QHBoxLayout()
-        search_label = QLabel("Search:")
-        search_layout.addWidget(search_label)
-        search_var = QLineEdit()
-        search_layout.addWidget(search_var)
-        self.layout().addLayout(search_layout)
+        def schedule():
+            cancel_search()
+            timer.start()
 
-        # Tree to display instructors
-        tree = QTreeWidget()
-        tree.setHeaderLabels(["Name", "Age", "Email", "Instructor ID", "Assigned Courses"])
-        self.layout().addWidget(tree)
-
-        def update_treeview(search_query):
-            tree.clear()
-            instructors = Instructor.load_from_db()
-            courses = Course.load_from_db()
-            for instructor in instructors:
-                course_instructor = [course.courseName for course in courses if course.instructor == instructor.email]
-                courseInstructor = ", ".join(course_instructor) if course_instructor else "None"
-                if (search_query.lower() in instructor.name.lower() or
-                    search_query.lower() in instructor.email.lower() or
-                    search_query.lower() in courseInstructor.lower()):
-                    item = QTreeWidgetItem([instructor.name, str(instructor.age), instructor.email, str(instructor.instructorID), courseInstructor])
-                    tree.addTopLevelItem(item)
-
-        search_var.textChanged.connect(lambda: update_treeview(search_var.text()))
-        update_treeview("")
+        search_var.textChanged.connect(schedule)
 
-    # Function to view all students
-    def view_students(self):
+    # Function to show a roster with its search box. The table only loads the rows it
+    # displays (see RosterTableModel), and clicking a column header sorts the rows in SQL.
+    # The pages and the searches are read in the background, so typing never waits for the database
+    def view_roster(self, kind, headers):
         self.clear_view()
 
         # Search layout
@@ -94,73 +79,45 @@ class ViewAllTab(QWidget):
         search_layout.addWidget(search_var)
         self.layout().addLayout(search_layout)
 
-        # Tree to display students
-        tree = QTreeWidget()
-        tree.setHeaderLabels(["Name", "Age", "Email", "Student ID", "Registered Courses"])
-        self.layout().addWidget(tree)
-
-        def update_treeview(search_query):
-            tree.clear()
-            students = Student.load_from_db()
-            for student in students:
-                registered_courses = self.get_student_courses(student.email)
-                registered_courses_str = ", ".join(registered_courses) if registered_courses else "None"
-                if (search_query.lower() in student.name.lower() or
-                    search_query.lower() in student.email.lower() or
-                    search_query.lower() in registered_courses_str.lower()):
-                    item = QTreeWidgetItem([student.name, str(student.age), student.email, str(student.studentID), registered_courses_str])
-                    tree.addTopLevelItem(item)
-
-        search_var.textChanged.connect(lambda: update_treeview(search_var.text()))
-        update_treeview("")
+        # Table to display the roster
+        table = QTableView()
+        model = RosterTableModel(kind, headers, table)
+        table.setModel(model)
+        table.verticalHeader().hide()
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        table.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
+        table.setSortingEnabled(True)
+        self.layout().addWidget(table)
+
+        searcher = IncrementalSearch(kind)
+
+        def update_table(search_query):
+            # Without a search, rows are loaded page by page as the user scrolls
+            if not search_query:
+                searcher.reset()
+                model.show_all()
+                return
+            model.show_search(searcher, search_query)
+
+        self.debounce(search_var, lambda: model.cancel_search(searcher), update_table)
+
+        # The rows changed through the models are applied as they are published
+        def apply_change(change):
+            searcher.forget()
+            model.apply_change(change)
+
+        model.outdated.connect(lambda: update_table(search_var.text()))
+        subscribe_widget(table, apply_change, *ROSTERS[kind]['entities'])
+        update_table("")
 
-    # Function to view all courses
-    def view_courses(self):
-        self.clear_view()
+    # Function to view all instructors
+    def view_instructors(self):
+        self.view_roster("instructors", ["Name", "Age", "Email", "Instructor ID", "Assigned Courses"])
 
-        # Search layout
-        search_layout = QHBoxLayout()
-        search_label = QLabel("Search:")
-        search_layout.addWidget(search_label)
-        search_var = QLineEdit()
-        search_layout.addWidget(search_var)
-        self.layout().addLayout(search_layout)
+    # Function to view all students
+    def view_students(self):
+        self.view_roster("students", ["Name", "Age", "Email", "Student ID", "Registered Courses"])
 
-        # Tree to display courses
-        tree = QTreeWidget()
-        tree.setHeaderLabels(["Course Name", "Course ID", "Instructor", "Enrolled Students"])
-        self.layout().addWidget(tree)
-
-        def update_treeview(search_query):
-            tree.clear()
-            courses = Course.load_from_db()
-            for course in courses:
-                enrolled_students = course.get_students_for_course(course.courseID)
-                enrolled_students_str = ", ".join(enrolled_students) if enrolled_students else "None"
-                if (search_query.lower() in course.courseName.lower() or
-                    search_query.lower() in course.instructor.lower() or
-                    search_query.lower() in enrolled_students_str.lower()):
-                    item = QTreeWidgetItem([course.courseName, str(course.courseID), course.instructor, enrolled_students_str])
-                    tree.addTopLevelItem(item)
-
-        search_var.textChanged.connect(lambda: update_treeview(search_var.text()))
-        update_treeview("")
-
-    # Function to get courses registered by a student
-    def get_student_courses(self, email):
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT courseID FROM registrations WHERE studentEmail = ?', (email,))
-        course_ids = cursor.fetchall()
-        course_ids = [course_id[0] for course_id in course_ids]
-        if course_ids:
-            query = 'SELECT courseName FROM courses WHERE courseID IN ({})'.format(
-                ','.join('?' * len(course_ids))
-            )
-            cursor.execute(query, course_ids)
-            courses = cursor.fetchall()
-            course_names = [course[0] for course in courses]
-        else:
-            course_names = []
-        conn.close()
-        return course_names
+    # Function to view all courses
+    def view_courses(self):
+        self.view_roster("courses", ["Course Name", "Course ID", "Instructor", "Enrolled Students"])
@@ -0,0 +1,161 @@
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from PyQt5.QtWidgets import QMessageBox
+from Classes.Database import close_connections
+
+# Number of threads running the database work of the tabs
+MAX_WORKERS = 4
+
+# How long (in seconds) shutdown waits for a thread busy with a task before closing the others
+SHUTDOWN_TIMEOUT = 5
+
+# The threads running the model calls of the tabs. They live as long as the application, so
+# every thread keeps its own pooled connection from one task to the next
+EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="qt-worker")
+
+
+# Function to close the pooled connections of the worker threads and stop them, once at exit
+def shutdown(executor=EXECUTOR, workers=MAX_WORKERS):
+    # a connection can only be closed by its own thread: every worker takes one closing task
+    # and waits for the others at the barrier, so no thread takes two of them
+    barrier = threading.Barrier(workers)
+
+    def close():
+        try:
+            barrier.wait(SHUTDOWN_TIMEOUT)
+        except threading.BrokenBarrierError:
+            pass
+        close_connections()
+
+    for _ in range(workers):
+        executor.submit(close)
+    executor.shutdown(wait=True)
+
+
+# THIS OBJECT CARRIES THE OUTCOME OF A TASK BACK TO THE GUI THREAD
+class TaskSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+
+# THIS FUNCTION CALLS A MODEL FUNCTION ON A WORKER THREAD AND EMITS ITS OUTCOME
+def call(signals, function, *args):
+    """
+    One call of a model-layer function, run by the executor.
+
+    The result (or the exception raised) is emitted through `signals`, which live on the
+    GUI thread, so the slots connected to them run there.
+
+    Parameters:
+    ----------
+        signals (TaskSignals): The signals emitting the outcome.
+        function (callable): The function to call.
+        *args: The arguments of the call.
+    """
+    try:
+        result = function(*args)
+    except Exception as e:
+        signals.failed.emit(e)
+    else:
+        signals.finished.emit(result)
+
+
+# THIS CLASS RUNS THE DATABASE WORK OF A WIDGET OFF THE GUI THREAD
+class TaskRunner(QObject):
+    """
+    Runs the model calls of a widget on a thread pool and hands their results to
+    callbacks on the GUI thread, so a slow query or a locked database never freezes
+    the window.
+
+    Every task has a name: starting a task cancels the previous one of the same name,
+    whose result is then dropped (e.g. the courses of an email chosen before the current
+    one). Tasks without a name (writes) are never superseded. While a task is pending,
+    the widget shows a busy cursor and `busy` is emitted.
+
+    Parameters:
+    ----------
+        widget (QWidget): The widget the tasks work for, showing the busy cursor (optional).
+        executor (Executor): The pool running the tasks (default is `EXECUTOR`).
+    """
+    busy = pyqtSignal(bool)
+
+    def __init__(self, widget=None, executor=None):
+        super().__init__(widget)
+        self.widget = widget
+        self.executor = executor or EXECUTOR
+        # name -> token of the task whose result is still wanted
+        self.current = {}
+        # token -> (future, signals) of every task started and not finished yet; the signals
+        # are kept until their outcome is delivered
+        self.running = {}
+        self.tokens = itertools.count()
+        self.is_busy = False
+
+    # Function to run a function in the background and pass its result to a callback
+    def run(self, name, function, *args, on_result=None, on_error=None):
+        """
+        Runs a function on the pool.
+
+        Parameters:
+        ----------
+            name: The name of the task, which cancels the pending task of the same name
+                (None for a task that is never cancelled).
+            function (callable): The function to call (e.g. a model method).
+            *args: The arguments of the call.
+            on_result (callable): Called on the GUI thread with the result (optional).
+            on_error (callable): Called on the GUI thread with the exception raised
+                (default shows it in a message box).
+        """
+        token = next(self.tokens)
+        if name is None:
+            name = ('unnamed', token)
+        self._drop([name])
+        signals = TaskSignals()
+        signals.finished.connect(lambda result: self.done(name, token, on_result, result))
+        signals.failed.connect(lambda error: self.done(name, token, on_error or self.show_error, error))
+        self.current[name] = token
+        self.running[token] = (self.executor.submit(call, signals, function, *args), signals)
+        self.update_busy()
+
+    # Function to drop the result of a pending task (every pending task by default).
+    # A task that hasn't started yet doesn't run
+    def cancel(self, name=None):
+        self._drop(list(self.current) if name is None else [name])
+        self.update_busy()
+
+    def _drop(self, names):
+        for name in names:
+            token = self.current.pop(name, None)
+            if token is not None and self.running[token][0].cancel():
+                del self.running[token]
+
+    # Function called on the GUI thread when a task is over
+    def done(self, name, token, callback, value):
+        self.running.pop(token, None)
+        # the widget may have been closed while the task was running
+        if sip.isdeleted(self) or self.current.get(name) != token:
+            return
+        del self.current[name]
+        self.update_busy()
+        if callback is not None:
+            callback(value)
+
+    # Function to show the busy state while results are awaited
+    def update_busy(self):
+        busy = bool(self.current)
+        if busy == self.is_busy:
+            return
+        self.is_busy = busy
+        if self.widget is not None:
+            if busy:
+                self.widget.setCursor(Qt.BusyCursor)
+            else:
+                self.widget.unsetCursor()
+        self.busy.emit(busy)
+
+    # Function to show the error raised by a task
+    def show_error(self, error):
+        QMessageBox.warning(self.widget, "Error", str(error))
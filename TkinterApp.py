@@ -4,66 +4,9 @@ from TkinterTabs import InstructorTab
 from TkinterTabs import CourseTab  
 from TkinterTabs import ViewAllTab  
 from TkinterTabs import RegisterTab  
-import sqlite3
+from Classes.Schema import initialize_database
 
-# THIS FUNCTIONS CREATE THE SQLite DATABASE USED IN OUR SCHOOL MANAGEMENT SYSTEM
-def initialize_database():
-    """
-    Initializes the SQLite database for the School Management System.
-
-    This function creates four tables in the database:
-    - students: Stores information about students, including their name, age, email, and studentID.
-    - instructors: Stores information about instructors, including their name, age, email, and instructorID.
-    - courses: Stores information about courses, including courseID, courseName, and instructor.
-    - registrations: Stores the registration details of students in various courses.
-
-    The function also checks whether the tables exist before creating them.
-    """
-    
-    conn = sqlite3.connect('school_management.db')
-    cursor = conn.cursor()
-
-    # create ctudents table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS students (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            age INTEGER,
-            email TEXT UNIQUE,
-            studentID INTEGER UNIQUE
-        )
-    ''')
-    # create cnstructors table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS instructors (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            age INTEGER,
-            email TEXT UNIQUE,
-            instructorID INTEGER UNIQUE
-        )
-    ''')
-    # create courses table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS courses (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            courseID INTEGER UNIQUE,
-            courseName TEXT NOT NULL,
-            instructor TEXT
-        )
-    ''')
-    # create registrations 
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS registrations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            studentEmail TEXT,
-            courseID INTEGER NULL,
-            FOREIGN KEY (studentEmail) REFERENCES students(email),
-            FOREIGN KEY (courseID) REFERENCES courses(courseID)
-        )
-    ''')
-    conn.commit()
-    conn.close()
+# CREATE/UPGRADE THE SQLite DATABASE USED IN OUR SCHOOL MANAGEMENT SYSTEM
 initialize_database()
 
 # create the main window
@@ -0,0 +1,130 @@
+import threading
+from Classes.Events import DELETE, INSERT, RELOAD, UPDATE, subscribe, unsubscribe
+from TkinterTabs.Workers import call_soon, start_polling
+
+# THIS FUNCTION CALLS A FUNCTION WITH THE CHANGES OF SOME ENTITIES WHILE A WIDGET EXISTS
+def subscribe_widget(widget, callback, *entities):
+    """
+    Subscribes a widget to the change bus of the models.
+
+    The callback always runs on the Tk thread: the changes published on it are delivered
+    right away, the ones published by background threads are queued and delivered by the
+    `after()` poll of `Workers.call_soon`. The subscription ends when the widget is destroyed.
+
+    Parameters:
+    ----------
+        widget (tk.Widget): The widget showing the data.
+        callback (callable): The function called with each `Events.Change`.
+        *entities (str): The entities to receive the changes of (default is every entity).
+    """
+    alive = {'value': True}
+
+    def deliver(change):
+        if threading.current_thread() is threading.main_thread():
+            callback(change)
+        else:
+            call_soon(lambda change: alive['value'] and callback(change), change)
+
+    def destroyed(event):
+        if event.widget is widget:
+            alive['value'] = False
+            unsubscribe(deliver)
+
+    subscribe(deliver, *entities)
+    widget.bind("<Destroy>", destroyed, add="+")
+    start_polling(widget)
+
+# THIS CLASS KEEPS THE ENTRIES OF AN OPTION MENU UP TO DATE ONE VALUE AT A TIME
+class OptionList:
+    """
+    The values of a dropdown (tk.OptionMenu), changed one entry at a time.
+
+    Parameters:
+    ----------
+        option_menu (tk.OptionMenu): The dropdown.
+        variable (tk.StringVar): The variable set when a value is picked.
+        placeholder (str): The entry shown when there are no values.
+        load (callable): A function returning every value, used on a `RELOAD` (optional).
+        tasks (Workers.TaskRunner): Runs `load` off the Tk thread (default is None, `load` is called directly).
+    """
+    def __init__(self, option_menu, variable, placeholder, load=None, tasks=None):
+        self.menu = option_menu["menu"]
+        self.variable = variable
+        self.placeholder = placeholder
+        self.load = load
+        self.tasks = tasks
+        self.values = []
+        self.set_values([])
+        self.reload()
+
+    # THIS METHOD READS EVERY VALUE AGAIN WITH THE LOAD FUNCTION
+    def reload(self):
+        if self.load is None:
+            return
+        if self.tasks is None:
+            self.set_values(self.load())
+        else:
+            self.tasks.run(self, self.load, on_result=self.set_values)
+
+    # THIS METHOD REPLACES EVERY VALUE OF THE DROPDOWN
+    def set_values(self, values):
+        self.values = list(values)
+        self.menu.delete(0, "end")
+        for value in self.values:
+            self._add_entry(value)
+        if not self.values:
+            self._add_entry(self.placeholder)
+
+    def _add_entry(self, value):
+        self.menu.add_command(label=value, command=lambda value=value: self.variable.set(value))
+
+    # THIS METHOD ADDS A VALUE AT THE END OF THE DROPDOWN
+    def add(self, value):
+        if value in self.values:
+            return
+        if not self.values:
+            self.menu.delete(0, "end")
+        self.values.append(value)
+        self._add_entry(value)
+
+    # THIS METHOD REMOVES A VALUE FROM THE DROPDOWN
+    def remove(self, value):
+        if value not in self.values:
+            return
+        index = self.values.index(value)
+        del self.values[index]
+        self.menu.delete(index)
+        if not self.values:
+            self._add_entry(self.placeholder)
+        if self.variable.get() == str(value):
+            self.variable.set("")
+
+    # THIS METHOD RENAMES A VALUE OF THE DROPDOWN
+    def replace(self, old, new):
+        if old not in self.values:
+            self.add(new)
+            return
+        index = self.values.index(old)
+        self.values[index] = new
+        self.menu.entryconfigure(index, label=new, command=lambda value=new: self.variable.set(value))
+        if self.variable.get() == str(old):
+            self.variable.set(new)
+
+    # THIS METHOD APPLIES A CHANGE OF THE CHANGE BUS TO THE DROPDOWN
+    def apply(self, change, column):
+        """
+        Applies a change of the change bus to the dropdown.
+
+        Parameters:
+        ----------
+            change (Events.Change): The change published by the models.
+            column (str): The column of the changed rows listed in the dropdown (e.g. 'email').
+        """
+        if change.op == RELOAD:
+            self.reload()
+        elif change.op == INSERT:
+            self.add(change.new[column])
+        elif change.op == DELETE:
+            self.remove(change.old[column])
+        elif change.op == UPDATE and change.old[column] != change.new[column]:
+            self.replace(change.old[column], change.new[column])
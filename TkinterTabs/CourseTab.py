@@ -1,8 +1,11 @@
-import sqlite3
 import tkinter as tk
 from tkinter import font
+from Classes.Database import get_connection
 from Classes.Course import Course
 from Classes.Person import Student, Instructor
+from TkinterTabs.Changes import OptionList, subscribe_widget
+from TkinterTabs.ImportDialog import import_from_csv
+from TkinterTabs.Workers import TaskRunner
 
 def create_course_tab(notebook):
     """
@@ -17,6 +20,8 @@ def create_course_tab(notebook):
     """
     course_tab = tk.Frame(notebook)
     notebook.add(course_tab, text="Course")
+    # the database work of the tab runs on background threads (see Workers.TaskRunner)
+    tasks = TaskRunner(course_tab)
 
     # THIS PART IS FOR CREATING NEW COURSES IN DATABASE
     bold_font = font.Font(size=14, weight="bold")
@@ -45,15 +50,22 @@ def create_course_tab(notebook):
         courseName = course_entry.get()
         courseID = int(ID_entry.get())
         #Course.create_course(courseID, courseName).save_to_file()
-        Course.create_course(courseID,courseName).save_to_db()
+        tasks.run(None, lambda: Course.create_course(courseID, courseName).save_to_db(),
+                  on_result=lambda _: course_submitted(courseName, courseID))
+
+    # THIS FUNCTION CLEARS THE FORM ONCE THE NEW COURSE IS SAVED
+    def course_submitted(courseName, courseID):
         course_entry.delete(0, tk.END)
         ID_entry.delete(0, tk.END)
-        dropdown_refresh()
         print(f"Course Submitted: {courseName}, {courseID}")
     
     submit_button_course = tk.Button(course_tab, text="Create", command=submit_form_course)
     submit_button_course.grid(row=3, column=1, columnspan=2, pady=10)
 
+    # import many courses at once from a CSV file
+    import_button_course = tk.Button(course_tab, text="Import CSV", command=lambda: import_from_csv(course_tab, "courses"))
+    import_button_course.grid(row=4, column=1, columnspan=2, pady=10)
+
 # --------------------------------------------------------------------------------------------------------
 
     # THIS PART IS TO VIEW/EDIT/DELETE INFORMATION OF COURSE IN DATABASE
@@ -64,29 +76,23 @@ def create_course_tab(notebook):
     selected_ID = tk.StringVar(value="")
     
     course_id_dropdown = tk.OptionMenu(course_tab, selected_ID, "No course in database")
+    course_id_dropdown.config(width=21)
+    course_id_dropdown.grid(row=2, column=4, padx=20, pady=5, sticky="W")
 
-    # THIS FUNCTION REFRESHES THE DROPDOWN MENY WITH COURSE ID
-    def dropdown_refresh():
+    # THIS FUNCTION RETURNS THE IDS OF EVERY COURSE IN THE DATABASE
+    def load_course_ids():
         """
-        Refreshes the dropdown menu with the latest list of course IDs.
-
-        This function retrieves the IDs of all courses from the database and updates the 
-        dropdown menu with the latest data. If no courses are found, a placeholder message 
-        is displayed.
+        Returns the IDs of all courses in the database, listed in the dropdown menu.
         """
-        conn = sqlite3.connect('school_management.db')
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute('SELECT courseID FROM courses')
-        courses = cursor.fetchall()
-        conn.close()
-        courses_ID = [course[0] for course in courses]
-        if courses_ID:
-            courses_dropdown = tk.OptionMenu(course_tab, selected_ID, *courses_ID)
-        else:
-            courses_dropdown = tk.OptionMenu(course_tab, selected_ID, "No courses in database")
-        courses_dropdown.config(width=21)
-        courses_dropdown.grid(row=2, column=4, padx=20, pady=5, sticky="W")
-    dropdown_refresh()
+        return [row[0] for row in cursor.fetchall()]
+
+    # the dropdown is filled once; after that only the courses added, changed or deleted
+    # (published on the change bus by the models) are applied to it
+    course_ids = OptionList(course_id_dropdown, selected_ID, "No courses in database", load_course_ids, tasks)
+    subscribe_widget(course_tab, lambda change: course_ids.apply(change, 'courseID'), 'course')
 
     # THIS CLASS ALLOWS COURSE INFORMATION MODIFICATION/DELETION 
     class EditDialog(tk.Toplevel):
@@ -100,29 +106,32 @@ def create_course_tab(notebook):
         Parameters:
         ----------
             parent (tk.Widget): The parent widget that opens the dialog.
-            course_ID (int): The unique ID of the course whose information is being edited.
+            course (Course): The course whose information is being edited.
             selected_ID_var (tk.StringVar): A Tkinter StringVar used to hold the selected course's ID from the dropdown.
             dropdown_menu (tk.OptionMenu): The dropdown menu displaying the list of course IDs.
         """
-        def __init__(self, parent, course_ID, selected_ID_var, dropdown_menu):
+        def __init__(self, parent, course, selected_ID_var, dropdown_menu):
             super().__init__(parent)
-            self.course_ID = course_ID
+            self.course_ID = course.courseID
             self.selected_ID_var = selected_ID_var 
             self.dropdown_menu = dropdown_menu  
-            
-            conn = sqlite3.connect('school_management.db')
-            cursor = conn.cursor()
+            # the buttons can't be pressed again while the change is being saved
+            self.tasks = TaskRunner(self, on_busy=self.set_busy)
             self.title("Edit Course")
             tk.Label(self, text="Name:").grid(row=0, column=0, padx=10, pady=10)
             self.name_entry = tk.Entry(self)
             self.name_entry.grid(row=0, column=1, padx=10, pady=10)
-            cursor.execute('SELECT courseName FROM courses WHERE courseID = ?', (course_ID,))
-            existing_name = cursor.fetchone()
-            self.name_entry.insert(0, existing_name)            
+            self.name_entry.insert(0, course.courseName)            
             modify_button = tk.Button(self, text="Save", command=self.modify)
             modify_button.grid(row=3, column=1, padx=10, pady=10)
             delete_button = tk.Button(self, text="Delete", command=self.delete)
             delete_button.grid(row=3, column=0, padx=10, pady=10)
+            self.buttons = (modify_button, delete_button)
+
+        # THIS METHOD DISABLES THE BUTTONS WHILE A CHANGE IS BEING SAVED
+        def set_busy(self, busy):
+            for button in self.buttons:
+                button.configure(state="disabled" if busy else "normal")
         
         def modify(self):
             """
@@ -132,20 +141,10 @@ def create_course_tab(notebook):
             dropdown menu is updated, and the dialog is closed.
             """
             courseID = self.course_ID 
-            conn = sqlite3.connect('school_management.db')
-            cursor = conn.cursor()
             if isinstance(courseID, tuple):
                 courseID = courseID[0]
-            if self.name_entry.get():
-                cursor.execute('''
-                UPDATE courses
-                SET courseName = ?
-                WHERE courseID = ?
-                ''', (self.name_entry.get(), courseID))
-            conn.commit()
-            conn.close()
-            self.update_dropdown()
-            self.destroy()
+            self.tasks.run(None, Course.update_in_db, courseID, self.name_entry.get(),
+                           on_result=lambda _: self.saved())
         
         # THIS METHOD DELETES EXISTING COURSE FROM THE FILE
         def delete(self):
@@ -157,22 +156,20 @@ def create_course_tab(notebook):
             """
             courseID = self.course_ID
             #self.student.delete_from_file()
-            Course.delete_from_db(courseID,)  
-            self.update_dropdown() 
+            self.tasks.run(None, Course.delete_from_db, courseID, on_result=lambda _: self.saved())
+
+        # THIS METHOD CLOSES THE DIALOG ONCE THE CHANGE IS SAVED
+        def saved(self):
+            self.update_dropdown()
             self.destroy()
 
         # THIS METHOD UPDATES DROPDOWN MENU AFTER CHANGES OCCUR
         def update_dropdown(self):
             """
-            Updates the course ID dropdown menu.
-
-            This method clears the current selection in the dropdown menu and refreshes it 
-            with the updated list of course IDs after modifying or deleting a course.
+            Clears the selection of the course dropdown menu after modifying or deleting
+            a course. The entries themselves are updated from the change bus.
             """
             self.selected_ID_var.set("")
-            menu = self.dropdown_menu["menu"]
-            menu.delete(0, "end")
-            dropdown_refresh()
 
     # THIS FUNCTIONS OPENS THE EDIT WINDOW WHERE STUDENT CAN EDIT HIS INFORMATION
     def edit_course():
@@ -184,7 +181,15 @@ def create_course_tab(notebook):
         course's information.
         """
         course_ID = selected_ID.get()
-        EditDialog(None, course_ID, selected_ID, course_id_dropdown)
+        # the dropdown holds the IDs as text
+        if course_ID.isdigit():
+            # the course is read in the background, the window opens once it is found
+            tasks.run('edit', Course.get_by_id, int(course_ID), on_result=open_edit_dialog)
+
+    # THIS FUNCTION OPENS THE EDIT WINDOW OF THE COURSE FOUND
+    def open_edit_dialog(course):
+        if course is not None:
+            EditDialog(None, course, selected_ID, course_id_dropdown)
     
     edit_button = tk.Button(course_tab, text="View Information", command=edit_course)
     edit_button.grid(row=3, column=4, pady=10)
@@ -0,0 +1,87 @@
+import threading
+import tkinter as tk
+from tkinter import filedialog
+from Classes.BulkImport import ImportReport, import_csv
+
+# THIS CLASS RUNS A CSV IMPORT IN THE BACKGROUND AND SHOWS ITS PROGRESS
+class ImportDialog(tk.Toplevel):
+    """
+    A dialog window that imports a CSV file into the database without freezing the UI.
+
+    The import runs on a background thread; the dialog polls its report with `after()`
+    to show the progress, and its Cancel button stops the import after the current batch.
+
+    Parameters:
+    ----------
+        parent (tk.Widget): The parent widget that opens the dialog.
+        kind (str): The table to import into ('students', 'instructors', 'courses' or 'registrations').
+        path (str): The path of the CSV file to import.
+        on_done (callable): A function called once the import has finished (optional).
+    """
+    def __init__(self, parent, kind, path, on_done=None):
+        super().__init__(parent)
+        self.title(f"Import {kind}")
+        self.on_done = on_done
+        self.report = ImportReport(kind)
+        self.cancel_event = threading.Event()
+        self.error = None
+
+        self.status_label = tk.Label(self, text="Starting import...", width=50, anchor="w")
+        self.status_label.grid(row=0, column=0, padx=10, pady=10)
+        self.rejects_list = tk.Listbox(self, width=60, height=10)
+        self.rejects_list.grid(row=1, column=0, padx=10, pady=5)
+        self.cancel_button = tk.Button(self, text="Cancel", command=self.cancel)
+        self.cancel_button.grid(row=2, column=0, padx=10, pady=10)
+
+        self.thread = threading.Thread(target=self.run, args=(kind, path), daemon=True)
+        self.thread.start()
+        self.after(100, self.poll)
+
+    # THIS METHOD RUNS THE IMPORT ON THE BACKGROUND THREAD
+    def run(self, kind, path):
+        try:
+            import_csv(kind, path, cancel=self.cancel_event, report=self.report)
+        except Exception as e:
+            self.error = e
+            self.report.done = True
+
+    # THIS METHOD REFRESHES THE PROGRESS UNTIL THE IMPORT IS DONE
+    def poll(self):
+        """
+        Shows the current progress of the import and reschedules itself until the import is done.
+        """
+        report = self.report
+        self.status_label.config(text=f"{report.processed} rows processed, {report.inserted} inserted, "
+                                      f"{len(report.rejects)} rejected")
+        if not report.done:
+            self.after(100, self.poll)
+            return
+        if self.error is not None:
+            self.status_label.config(text=f"Import failed: {self.error}")
+        elif report.cancelled:
+            self.status_label.config(text=self.status_label.cget("text") + " (cancelled)")
+        for line, reason in report.rejects:
+            self.rejects_list.insert("end", f"line {line}: {reason}")
+        self.cancel_button.config(text="Close", command=self.destroy)
+        if self.on_done is not None:
+            self.on_done()
+
+    # THIS METHOD STOPS THE IMPORT AFTER THE CURRENT BATCH
+    def cancel(self):
+        self.cancel_event.set()
+
+# THIS FUNCTION ASKS FOR A CSV FILE AND IMPORTS IT
+def import_from_csv(parent, kind, on_done=None):
+    """
+    Asks the user for a CSV file and imports it into the database in the background.
+
+    Parameters:
+    ----------
+        parent (tk.Widget): The parent widget that opens the dialog.
+        kind (str): The table to import into ('students', 'instructors', 'courses' or 'registrations').
+        on_done (callable): A function called once the import has finished (optional).
+    """
+    path = filedialog.askopenfilename(parent=parent, title=f"Import {kind}",
+                                      filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+    if path:
+        ImportDialog(parent, kind, path, on_done)
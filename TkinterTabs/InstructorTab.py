@@ -1,7 +1,10 @@
-import sqlite3
 import tkinter as tk
 from tkinter import font
+from Classes.Database import get_connection
 from Classes.Person import Instructor
+from TkinterTabs.Changes import OptionList, subscribe_widget
+from TkinterTabs.ImportDialog import import_from_csv
+from TkinterTabs.Workers import TaskRunner
 
 def create_instructor_tab(notebook):
     """
@@ -15,6 +18,8 @@ def create_instructor_tab(notebook):
     """
     instructor_tab = tk.Frame(notebook)
     notebook.add(instructor_tab, text="Instructor")
+    # the database work of the tab runs on background threads (see Workers.TaskRunner)
+    tasks = TaskRunner(instructor_tab)
 
     # THIS PART IS FOR CREATING NEW INSTRUCTORS IN DATABASE
     bold_font = font.Font(size=14, weight="bold")
@@ -53,17 +58,24 @@ def create_instructor_tab(notebook):
         email = email_entry.get()
         instructorID = int(ID_entry.get())
         #Instructor.create_instructor(name, age, email, studentID).save_to_file()  
-        Instructor.create_instructor(name, age, email, instructorID).save_to_db()
+        tasks.run(None, lambda: Instructor.create_instructor(name, age, email, instructorID).save_to_db(),
+                  on_result=lambda _: instructor_submitted(name, age, email, instructorID))
+
+    # THIS FUNCTION CLEARS THE FORM ONCE THE NEW INSTRUCTOR IS SAVED
+    def instructor_submitted(name, age, email, instructorID):
         name_entry.delete(0, tk.END)
         age_entry.delete(0, tk.END)
         email_entry.delete(0, tk.END)
         ID_entry.delete(0, tk.END)
-        dropdown_refresh() 
         print(f"Instructor Submitted: {name}, {age}, {email}, {instructorID}")
     
     submit_button_instructor = tk.Button(instructor_tab, text="Create", command=submit_form_instructor)
     submit_button_instructor.grid(row=6, column=1, columnspan=2, pady=10)
 
+    # import many instructors at once from a CSV file
+    import_button_instructor = tk.Button(instructor_tab, text="Import CSV", command=lambda: import_from_csv(instructor_tab, "instructors"))
+    import_button_instructor.grid(row=7, column=1, columnspan=2, pady=10)
+
 # --------------------------------------------------------------------------------------------------------
 
     # THIS PART IS TO VIEW/EDIT/DELETE INFORMATION OF INSTRUCTOR IN DATABASE
@@ -74,29 +86,23 @@ def create_instructor_tab(notebook):
     selected_email = tk.StringVar(value="")
 
     instructors_dropdown = tk.OptionMenu(instructor_tab, selected_email, "No instructor in database")
+    instructors_dropdown.config(width=21)
+    instructors_dropdown.grid(row=2, column=4, padx=20, pady=5, sticky="W")
 
-    # THIS FUNCTION REFRESHES THE DROPDOWN MENY WITH INSTRUCTOR EMAIL
-    def dropdown_refresh():
+    # THIS FUNCTION RETURNS THE EMAILS OF EVERY INSTRUCTOR IN THE DATABASE
+    def load_emails():
         """
-        Refreshes the dropdown menu with the latest list of instructor emails.
-
-        This function retrieves the email addresses of all instructors from the database and 
-        updates the dropdown menu with the latest data. If no instructors are found, a placeholder 
-        message is displayed.
+        Returns the email addresses of all instructors in the database, listed in the dropdown menu.
         """
-        conn = sqlite3.connect('school_management.db')
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute('SELECT email FROM instructors')
-        instructors = cursor.fetchall()
-        conn.close()
-        instructors_email = [instructor[0] for instructor in instructors]
-        if instructors_email:
-            instructors_dropdown = tk.OptionMenu(instructor_tab, selected_email, *instructors_email)
-        else:
-            instructors_dropdown = tk.OptionMenu(instructor_tab, selected_email, "No instructors in database")
-        instructors_dropdown.config(width=21)
-        instructors_dropdown.grid(row=2, column=4, padx=20, pady=5, sticky="W")
-    dropdown_refresh()
+        return [row[0] for row in cursor.fetchall()]
+
+    # the dropdown is filled once; after that only the instructors added, changed or deleted
+    # (published on the change bus by the models) are applied to it
+    instructor_emails = OptionList(instructors_dropdown, selected_email, "No instructors in database", load_emails, tasks)
+    subscribe_widget(instructor_tab, lambda change: instructor_emails.apply(change, 'email'), 'instructor')
 
     # THIS CLASS ALLOWS STUDENTS TO MODIFY/DELETE THEIR INFORMATIONS
     class EditDialog(tk.Toplevel):
@@ -110,42 +116,41 @@ def create_instructor_tab(notebook):
         Parameters:
         ----------
             parent (tk.Widget): The parent widget that opens the dialog.
-            instructor_ID (int): The unique ID of the instructor whose information is being edited.
+            instructor (Instructor): The instructor whose information is being edited.
             selected_email_var (tk.StringVar): A Tkinter StringVar used to hold the selected instructor's email from the dropdown.
             instructors_dropdown (tk.OptionMenu): The dropdown menu displaying the list of instructor emails.
         """
-        def __init__(self, parent, instructor_ID, selected_email_var, instructors_dropdown):
+        def __init__(self, parent, instructor, selected_email_var, instructors_dropdown):
             super().__init__(parent)
             self.dropdown_menu = instructors_dropdown
             self.selected_email_var = selected_email_var
-            self.instructorID = instructor_ID
-            
-            conn = sqlite3.connect('school_management.db')
-            cursor = conn.cursor()
+            self.instructorID = instructor.instructorID
+            # the buttons can't be pressed again while the change is being saved
+            self.tasks = TaskRunner(self, on_busy=self.set_busy)
             self.title("Edit Instructor")
             tk.Label(self, text="Name:").grid(row=0, column=0, padx=10, pady=10)
             self.name_entry = tk.Entry(self)
             self.name_entry.grid(row=0, column=1, padx=10, pady=10)
-            cursor.execute('SELECT name FROM instructors WHERE instructorID = ?', (instructor_ID))
-            existing_name = cursor.fetchone()
-            self.name_entry.insert(0, existing_name)
+            self.name_entry.insert(0, instructor.name)
             tk.Label(self, text="Age:").grid(row=1, column=0, padx=10, pady=10)
             self.age_entry = tk.Entry(self)
             self.age_entry.grid(row=1, column=1, padx=10, pady=10)
-            cursor.execute('SELECT age FROM instructors WHERE instructorID = ?', (instructor_ID))
-            existing_age = cursor.fetchone()
-            self.age_entry.insert(0, existing_age)
+            self.age_entry.insert(0, instructor.age)
             tk.Label(self, text="Email:").grid(row=2, column=0, padx=10, pady=10)
             self.email_entry = tk.Entry(self)
             self.email_entry.grid(row=2, column=1, padx=10, pady=10)
-            cursor.execute('SELECT email FROM instructors WHERE instructorID = ?', (instructor_ID))
-            existing_email = cursor.fetchone()
-            self.email_entry.insert(0, existing_email)
+            self.email_entry.insert(0, instructor.email)
 
             modify_button = tk.Button(self, text="Save", command=self.modify)
             modify_button.grid(row=3, column=1, padx=10, pady=10)
             delete_button = tk.Button(self, text="Delete", command=self.delete)
             delete_button.grid(row=3, column=0, padx=10, pady=10)
+            self.buttons = (modify_button, delete_button)
+
+        # THIS METHOD DISABLES THE BUTTONS WHILE A CHANGE IS BEING SAVED
+        def set_busy(self, busy):
+            for button in self.buttons:
+                button.configure(state="disabled" if busy else "normal")
 
         # THIS METHOD EDITS/KEEPS THE INFORMATION OF THE INSTRUCTOR
         def modify(self):
@@ -158,39 +163,10 @@ def create_instructor_tab(notebook):
             dialog is closed.
             """
             instructorID = self.instructorID  
-            conn = sqlite3.connect('school_management.db')
-            cursor = conn.cursor()
-
             if isinstance(instructorID, tuple):
                 instructorID = instructorID[0]
-            if self.name_entry.get():
-                cursor.execute('''
-                UPDATE instructors
-                SET name = ?
-                WHERE instructorID = ?
-                ''', (self.name_entry.get(), instructorID))
-            if self.age_entry.get():
-                cursor.execute('''
-                UPDATE instructors
-                SET age = ?
-                WHERE instructorID = ?
-                ''', (self.age_entry.get(), instructorID))
-            if self.email_entry.get():
-                # check that the new email isn't already taken by another student
-                cursor.execute('SELECT email FROM instructors WHERE email = ? AND instructorID != ?', (self.email_entry.get(), instructorID))
-                existing_email = cursor.fetchone()
-                if existing_email:
-                    conn.close()
-                    raise ValueError("Instructor email already taken")
-                cursor.execute('''
-                UPDATE instructors
-                SET email = ?
-                WHERE instructorID = ?
-                ''', (self.email_entry.get(), instructorID))
-            conn.commit()
-            conn.close()
-            self.update_dropdown()
-            self.destroy()
+            self.tasks.run(None, Instructor.update_in_db, instructorID, self.name_entry.get(), self.age_entry.get(),
+                           self.email_entry.get(), on_result=lambda _: self.saved())
 
         # THIS METHOD DELETES EXISTING INSTRUCTOR FROM THE DATABASE
         def delete(self):
@@ -202,22 +178,20 @@ def create_instructor_tab(notebook):
             """
             #self.instructor.delete_from_file()
             instructorID = self.instructorID
-            Instructor.delete_from_db(instructorID)  
-            self.update_dropdown() 
+            self.tasks.run(None, Instructor.delete_from_db, instructorID, on_result=lambda _: self.saved())
+
+        # THIS METHOD CLOSES THE DIALOG ONCE THE CHANGE IS SAVED
+        def saved(self):
+            self.update_dropdown()
             self.destroy()
 
         # THIS METHOD UPDATES DROPDOWN MENU AFTER CHANGES OCCUR
         def update_dropdown(self):
             """
-            Updates the instructor email dropdown menu.
-
-            This method clears the current selection in the dropdown menu and refreshes it 
-            with the updated list of instructor emails after modifying or deleting an instructor.
+            Clears the selection of the instructor dropdown menu after modifying or deleting
+            an instructor. The entries themselves are updated from the change bus.
             """
             self.selected_email_var.set("")
-            menu = self.dropdown_menu["menu"]
-            menu.delete(0, "end")
-            dropdown_refresh()
 
     # THIS FUNCTIONS OPENS THE EDIT WINDOW WHERE STUDENT CAN EDIT HIS INFORMATION
     def edit_instructor():
@@ -228,12 +202,21 @@ def create_instructor_tab(notebook):
         dropdown menu and opens the `EditDialog` to allow the user to view and edit the 
         instructor's information.
         """
-        conn = sqlite3.connect('school_management.db')
+        # the instructor is read in the background, the window opens once it is found
+        tasks.run('edit', find_instructor, selected_email.get(), on_result=open_edit_dialog)
+
+    # THIS FUNCTION RETURNS THE INSTRUCTOR WITH AN EMAIL (None if there is none)
+    def find_instructor(email):
+        conn = get_connection()
         cursor = conn.cursor()
-        email = selected_email.get()
         cursor.execute('SELECT instructorID FROM instructors WHERE email = ?', (email,))
-        instructor_ID = cursor.fetchone()
-        EditDialog(None, instructor_ID, selected_email, instructors_dropdown)
+        row = cursor.fetchone()
+        return Instructor.get_by_id(row[0]) if row else None
+
+    # THIS FUNCTION OPENS THE EDIT WINDOW OF THE INSTRUCTOR FOUND
+    def open_edit_dialog(instructor):
+        if instructor is not None:
+            EditDialog(None, instructor, selected_email, instructors_dropdown)
 
     edit_button = tk.Button(instructor_tab, text="View Information", command=edit_instructor)
     edit_button.grid(row=3, column=4, pady=10)
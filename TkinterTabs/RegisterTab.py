@@ -1,8 +1,11 @@
-import sqlite3
 import tkinter as tk
 from tkinter import font
 from Classes.Course import Course
+from Classes.Events import affects_courses_of, apply_to_list
 from Classes.Person import Student, Instructor
+from TkinterTabs.Changes import OptionList, subscribe_widget
+from TkinterTabs.ImportDialog import import_from_csv
+from TkinterTabs.Workers import TaskRunner
 
 def create_register_tab(notebook):
     """
@@ -17,12 +20,35 @@ def create_register_tab(notebook):
     """
     register_tab = tk.Frame(notebook)
     notebook.add(register_tab, text="Register/Assign")
+    # the database work of the tab runs on background threads (see Workers.TaskRunner)
+    tasks = TaskRunner(register_tab)
 
     # THIS PART IS FOR REGISTERING/ASSIGNING COURSES TO STUDENTS/INSTRUCTORS
     bold_font = font.Font(size=14, weight="bold")
     course_level_label = tk.Label(register_tab, text="Register/Assign Course", font=bold_font)
     course_level_label.grid(row=0, column=0, padx=20, pady=5)
 
+    # THIS FUNCTION RETURNS THE EMAILS OF EVERY STUDENT OR INSTRUCTOR
+    def load_people(role):
+        model = Student if role == "Student" else Instructor
+        return [person.email for person in model.iter_from_db()]
+
+    # the emails of both roles are read once (in the background), then kept up to date from
+    # the change bus, so switching the role doesn't read the database again
+    people = {"Student": [], "Instructor": []}
+
+    # THIS FUNCTION READS THE EMAILS OF A ROLE IN THE BACKGROUND
+    def reload_people(role):
+        tasks.run(("people", role), load_people, role, on_result=lambda emails: people_loaded(role, emails))
+
+    # THIS FUNCTION SHOWS THE EMAILS OF A ROLE READ BY reload_people
+    def people_loaded(role, emails):
+        people[role] = emails
+        if role_var.get() == role:
+            register_emails.set_values(emails)
+        if role_var_unregistered.get() == role:
+            unregister_emails.set_values(emails)
+
     # THIS FUNCTION UPDATE THE DROPDOWN BUTTON BASED ON ROLE TYPE
     def update_dropdown():
         """
@@ -31,23 +57,13 @@ def create_register_tab(notebook):
         This function populates the dropdown menu with either student or instructor email addresses 
         depending on the role (student or instructor) selected by the user.
         """
+        tasks.cancel("register courses")
         selected_name.set("") 
         selected_course.set("") 
         selected_role = role_var.get()
-        menu = student_dropdown["menu"]
-        menu.delete(0, "end")
-        # if it's a student, register course
-        if selected_role == "Student":
-            students = Student.load_from_db()
-            students_email = [student.email for student in students]
-            for email in students_email:
-                menu.add_command(label=email, command=lambda value=email: selected_name.set(value))
-        # if it's an instructor, assign course
-        elif selected_role == "Instructor":
-            instructors = Instructor.load_from_db()
-            instructors_email = [instructor.email for instructor in instructors]
-            for email in instructors_email:
-                menu.add_command(label=email, command=lambda value=email: selected_name.set(value))
+        # if it's a student, register course; if it's an instructor, assign course
+        register_emails.placeholder = f"No {selected_role.lower()}s available"
+        register_emails.set_values(people[selected_role])
 
     role_var = tk.StringVar(value="Student")  
     course_level_label = tk.Label(register_tab, text="Select your role")
@@ -62,65 +78,31 @@ def create_register_tab(notebook):
     selected_name = tk.StringVar(value="")
 
     # default values in dropdown
-    students = Student.load_from_db()
-    students_email = [student.email for student in students]
-    if students_email:
-        student_dropdown = tk.OptionMenu(register_tab, selected_name, *students_email)
-    else:
-        student_dropdown = tk.OptionMenu(register_tab, selected_name, "No students available")
+    student_dropdown = tk.OptionMenu(register_tab, selected_name, "No students available")
     student_dropdown.config(width=21)
     student_dropdown.grid(row=4, column=0, columnspan = 2, padx=20, pady=5)
+    register_emails = OptionList(student_dropdown, selected_name, "No students available",
+                                 lambda: people[role_var.get()])
 
-    # THIS FUNCTIONS RETURNS THE COURSEID OF THE COURSES THAT THE STUDENT IS TAKING
-    def get_student_courses(email):
+    # THIS FUNCTION RETURNS THE LABELS OF SOME COURSES MAPPED TO THEIR IDS
+    def course_labels(courses):
         """
-        Retrieves the course IDs of courses that a student is currently registered for.
-
-        This function queries the database to get all course IDs associated with a specific student.
+        Returns the labels shown in a course dropdown, mapped to the IDs of the courses.
 
         Parameters:
         ----------
-            email (str): The email address of the student.
+            courses (list of tuple): The (courseID, courseName) of the courses.
 
         Returns:
         -------
-            list of int: A list of course IDs that the student is registered for.
-        """
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT courseID FROM registrations WHERE studentEmail = ?
-        ''', (email,))
-        course_ids = cursor.fetchall()  
-        course_ids = [course_id[0] for course_id in course_ids]  
-        conn.close()
-        return course_ids
-    
-    # THIS FUNCTIONS RETURNS THE COURSEID OF THE COURSES THAT THE INSTRUCTOR IS TAKING
-    def get_instructor_courses(email):
+            dict: Every "courseID - courseName" label mapped to its course ID.
         """
-        Retrieves the course IDs of courses assigned to a specific instructor.
+        return {f"{course_id} - {course_name}": course_id for course_id, course_name in courses}
 
-        This function queries the database to get all course IDs associated with a specific instructor.
+    # the courses shown in the course dropdowns, by label
+    register_courses = {}
+    unregister_courses = {}
 
-        Parameters:
-        ----------
-            email (str): The email address of the instructor.
-
-        Returns:
-        -------
-            list of int: A list of course IDs that the instructor is assigned to.
-        """
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT courseID FROM courses WHERE instructor = ?
-        ''', (email,))
-        course_ids = cursor.fetchall()  
-        course_ids = [course_id[0] for course_id in course_ids]  
-        conn.close()
-        return course_ids      
-        
     # THIS FUNCTIONS RETURNS COURSES THE STUDENT/INSTRUCTOR CAN REGISTER/ASSIGN
     def submit_email():
         """
@@ -129,47 +111,29 @@ def create_register_tab(notebook):
         This function updates the dropdown menu to display only the courses that a student or instructor 
         has not yet registered for (if student) or been assigned to (if instructor).
 
-        It fetches all course IDs from the database and filters out the courses that the selected student 
-        or instructor has already registered for or been assigned to.
+        The database returns only the courses that the selected student or instructor hasn't registered
+        for or been assigned to yet (see `Course.available_courses_for`).
 
         Returns:
         -------
             None
         """
         selected_course.set("") 
-        roleVar = role_var.get()
-        unregistered_courses = []
-        email = selected_name.get()
-        courses = Course.load_from_db()  
-        course_ID = [course.courseID for course in courses]  
-        
-        if roleVar == "Student":
-            registered_courses = get_student_courses(email)
-            for course in course_ID:
-                if course not in registered_courses:
-                    unregistered_courses.append(course)
-            if unregistered_courses:
-                # show only courses unregistered to the student
-                course_dropdown = tk.OptionMenu(register_tab, selected_course, *unregistered_courses)
-            else:
-                course_dropdown = tk.OptionMenu(register_tab, selected_course, "No courses available")
-            course_dropdown.config(width=21)
-            course_dropdown.grid(row=6, column=0, columnspan=2, padx=20, pady=5)
-        
-        elif roleVar == "Instructor":
-            registered_courses = get_instructor_courses(email)
-            for course in course_ID:
-                if course not in registered_courses:
-                    unregistered_courses.append(course)
-            if unregistered_courses:
-                # show only courses unassigned to the instructor
-                course_dropdown = tk.OptionMenu(register_tab, selected_course, *unregistered_courses)
-            else:
-                course_dropdown = tk.OptionMenu(register_tab, selected_course, "No courses available")
-            course_dropdown.config(width=21)
-            course_dropdown.grid(row=6, column=0, columnspan=2, padx=20, pady=5)
-
-        return
+        # the courses are read in the background and shown once they arrive
+        tasks.run("register courses", Course.available_courses_for, selected_name.get(), role_var.get(),
+                  on_result=show_unregistered_courses)
+
+    # THIS FUNCTION SHOWS THE COURSES THE STUDENT/INSTRUCTOR CAN REGISTER/ASSIGN
+    def show_unregistered_courses(unregistered_courses):
+        register_courses.clear()
+        register_courses.update(course_labels(unregistered_courses))
+        if register_courses:
+            # show only courses unregistered to the student or unassigned to the instructor
+            course_dropdown = tk.OptionMenu(register_tab, selected_course, *register_courses)
+        else:
+            course_dropdown = tk.OptionMenu(register_tab, selected_course, "No courses available")
+        course_dropdown.config(width=21)
+        course_dropdown.grid(row=6, column=0, columnspan=2, padx=20, pady=5)
 
     submit__email = tk.Button(register_tab, text="Choose", command=submit_email)
     submit__email.grid(row=4, column=1, pady=10)
@@ -195,31 +159,95 @@ def create_register_tab(notebook):
         """
         roleVar = role_var.get()
         email = selected_name.get()
-        course_ID = selected_course.get()
+        course_ID = register_courses.get(selected_course.get())
+        if course_ID is None:
+            return
 
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
         if roleVar == "Student":
-            cursor.execute('''
-                INSERT INTO registrations (studentEmail, courseID)
-                VALUES (?,?)
-            ''', (email, course_ID))
-        elif roleVar == "Instructor":
-            cursor.execute('''
-                UPDATE courses
-                SET instructor = ?
-                WHERE courseID = ?  
-            ''', (email, course_ID))
-
-        conn.commit()
-        conn.close()
+            tasks.run(None, Course.register_student, course_ID, email, on_result=lambda _: registration_done())
+        if roleVar == "Instructor":
+            tasks.run(None, Course.assign_instructor, course_ID, email, on_result=lambda _: registration_done())
+
+    # THIS FUNCTION CLEARS THE REGISTRATION FORM ONCE THE REGISTRATION IS SAVED
+    def registration_done():
+        tasks.cancel("register courses")
         selected_name.set("") 
         selected_course.set("") 
-        return
 
     submit_registration_course = tk.Button(register_tab, text="Register", command=submit_course_registration)
     submit_registration_course.grid(row=6, column=1, columnspan=2, pady=10)
 
+    # register many students at once from a CSV file
+    import_registration_button = tk.Button(register_tab, text="Import CSV", command=lambda: import_from_csv(register_tab, "registrations"))
+    import_registration_button.grid(row=7, column=1, columnspan=2, pady=10)
+
+    # THIS CLASS REGISTERS MANY STUDENTS TO MANY COURSES AT ONCE
+    class BatchDialog(tk.Toplevel):
+        """
+        A dialog window that registers every selected student to every selected course.
+
+        Both lists allow selecting many items (shift/ctrl click). The registrations are
+        saved in one transaction (see `Course.register_students`) and the dialog shows how
+        many were added and how many already existed.
+
+        Parameters:
+        ----------
+            parent (tk.Widget): The parent widget that opens the dialog.
+            emails (list of str): The emails of the students.
+        """
+        def __init__(self, parent, emails):
+            super().__init__(parent)
+            self.title("Register Many Students")
+            # the button can't be pressed again while the registrations are being saved
+            self.tasks = TaskRunner(self, on_busy=self.set_busy)
+            tk.Label(self, text="Students").grid(row=0, column=0, padx=10, pady=5)
+            self.students_list = tk.Listbox(self, selectmode=tk.EXTENDED, exportselection=False, width=30, height=15)
+            self.students_list.grid(row=1, column=0, padx=10, pady=5)
+            self.students_list.insert("end", *emails)
+            tk.Label(self, text="Courses").grid(row=0, column=1, padx=10, pady=5)
+            self.courses_list = tk.Listbox(self, selectmode=tk.EXTENDED, exportselection=False, width=30, height=15)
+            self.courses_list.grid(row=1, column=1, padx=10, pady=5)
+            self.course_ids = []
+            self.status_label = tk.Label(self, text="Select the students and the courses to register them to")
+            self.status_label.grid(row=2, column=0, columnspan=2, padx=10, pady=5)
+            self.register_button = tk.Button(self, text="Register", command=self.register)
+            self.register_button.grid(row=3, column=1, padx=10, pady=10)
+            self.tasks.run("courses", self.load_courses, on_result=self.show_courses)
+
+        # THIS METHOD DISABLES THE BUTTON WHILE THE REGISTRATIONS ARE BEING SAVED
+        def set_busy(self, busy):
+            self.register_button.configure(state="disabled" if busy else "normal")
+
+        # THIS METHOD RETURNS THE ID AND NAME OF EVERY COURSE
+        def load_courses(self):
+            return [(course.courseID, course.courseName) for course in Course.iter_from_db()]
+
+        # THIS METHOD SHOWS THE COURSES READ BY load_courses
+        def show_courses(self, courses):
+            self.course_ids = [course_id for course_id, _ in courses]
+            self.courses_list.insert("end", *course_labels(courses))
+
+        # THIS METHOD REGISTERS THE SELECTED STUDENTS TO THE SELECTED COURSES
+        def register(self):
+            emails = [self.students_list.get(index) for index in self.students_list.curselection()]
+            course_ids = [self.course_ids[index] for index in self.courses_list.curselection()]
+            if not emails or not course_ids:
+                self.status_label.config(text="Select at least one student and one course")
+                return
+            self.tasks.run(None, Course.register_students, course_ids, emails, on_result=self.registered)
+
+        # THIS METHOD SHOWS HOW MANY REGISTRATIONS WERE ADDED
+        def registered(self, count):
+            self.status_label.config(text=f"{count.registered} registrations added, "
+                                          f"{count.skipped} already registered")
+            self.students_list.selection_clear(0, "end")
+            self.courses_list.selection_clear(0, "end")
+
+    # register many students to many courses at once
+    batch_registration_button = tk.Button(register_tab, text="Register Many",
+                                          command=lambda: BatchDialog(register_tab, people["Student"]))
+    batch_registration_button.grid(row=7, column=0, pady=10)
+
 # --------------------------------------------------------------------------------------------------------
 
     # THIS PART IS FOR UNREGISTERING/UNASSIGNING COURSES TO STUDENTS/INSTRUCTORS
@@ -235,23 +263,13 @@ def create_register_tab(notebook):
         depending on the role selected by the user. The emails correspond to users who are already 
         registered for or assigned to courses.
         """
+        tasks.cancel("unregister courses")
         selected_name_unregistered.set("")  
         selected_course_unregistered.set("")  
         selected_role = role_var_unregistered.get()
-        menu = student_dropdown_unregistered["menu"]
-        menu.delete(0, "end")
-        # if it's a student, unregister course
-        if selected_role == "Student":
-            students = Student.load_from_db()
-            students_email = [student.email for student in students]
-            for email in students_email:
-                menu.add_command(label=email, command=lambda value=email: selected_name_unregistered.set(value))
-        # if it's an instructor, unassign course
-        elif selected_role == "Instructor":
-            instructors = Instructor.load_from_db()
-            instructors_email = [instructor.email for instructor in instructors]
-            for email in instructors_email:
-                menu.add_command(label=email, command=lambda value=email: selected_name_unregistered.set(value))
+        # if it's a student, unregister course; if it's an instructor, unassign course
+        unregister_emails.placeholder = f"No {selected_role.lower()}s available"
+        unregister_emails.set_values(people[selected_role])
 
     role_var_unregistered = tk.StringVar(value="Student")  
     course_unregisterRole_label = tk.Label(register_tab, text="Select your role")
@@ -266,14 +284,11 @@ def create_register_tab(notebook):
     selected_name_unregistered = tk.StringVar(value="")
 
     # default values in dropdown
-    students = Student.load_from_db()
-    students_email_unregistered = [student.email for student in students]
-    if students_email_unregistered:
-        student_dropdown_unregistered = tk.OptionMenu(register_tab, selected_name_unregistered, *students_email_unregistered)
-    else:
-        student_dropdown_unregistered = tk.OptionMenu(register_tab, selected_name_unregistered, "No students available")
+    student_dropdown_unregistered = tk.OptionMenu(register_tab, selected_name_unregistered, "No students available")
     student_dropdown_unregistered.config(width=21)
     student_dropdown_unregistered.grid(row=4, column=4, columnspan = 2, padx=20, pady=5)
+    unregister_emails = OptionList(student_dropdown_unregistered, selected_name_unregistered, "No students available",
+                                   lambda: people[role_var_unregistered.get()])
 
     # THIS FUNCTIONS RETURNS COURSES THE STUDENT/INSTRUCTOR CAN UNREGISTER/UNASSIGN
     def submit_email_unregister():
@@ -288,39 +303,21 @@ def create_register_tab(notebook):
             None
         """
         selected_course_unregistered.set("")  
-        roleVar = role_var_unregistered.get()
-        unregisteredCourses = []
-        email = selected_name_unregistered.get()
-        courses = Course.load_from_db()  
-        course_ID = [course.courseID for course in courses]  
-        
-        if roleVar == "Student":
-            registered_courses = get_student_courses(email)
-            for course in course_ID:
-                if course in registered_courses:
-                    unregisteredCourses.append(course)
-            if unregisteredCourses:
-                # show only courses registered by the student
-                course_dropdown_unregistered = tk.OptionMenu(register_tab, selected_course_unregistered, *unregisteredCourses)
-            else:
-                course_dropdown_unregistered = tk.OptionMenu(register_tab, selected_course_unregistered, "No courses available")
-            course_dropdown_unregistered.config(width=21)
-            course_dropdown_unregistered.grid(row=6, column=4, columnspan = 2, padx=20, pady=5)
-        
-        elif roleVar == "Instructor":
-            registered_courses = get_instructor_courses(email)
-            for course in course_ID:
-                if course in registered_courses:
-                    unregisteredCourses.append(course)
-            if unregisteredCourses:
-                # show only courses assigned to the instructor
-                course_dropdown_unregistered = tk.OptionMenu(register_tab, selected_course_unregistered, *unregisteredCourses)
-            else:
-                course_dropdown_unregistered = tk.OptionMenu(register_tab, selected_course_unregistered, "No courses available")
-            course_dropdown_unregistered.config(width=21)
-            course_dropdown_unregistered.grid(row=6, column=4, columnspan = 2, padx=20, pady=5)
-
-        return
+        # the courses are read in the background and shown once they arrive
+        tasks.run("unregister courses", Course.registered_courses_for, selected_name_unregistered.get(),
+                  role_var_unregistered.get(), on_result=show_registered_courses)
+
+    # THIS FUNCTION SHOWS THE COURSES THE STUDENT/INSTRUCTOR CAN UNREGISTER/UNASSIGN
+    def show_registered_courses(registered_courses):
+        unregister_courses.clear()
+        unregister_courses.update(course_labels(registered_courses))
+        if unregister_courses:
+            # show only courses registered by the student or assigned to the instructor
+            course_dropdown_unregistered = tk.OptionMenu(register_tab, selected_course_unregistered, *unregister_courses)
+        else:
+            course_dropdown_unregistered = tk.OptionMenu(register_tab, selected_course_unregistered, "No courses available")
+        course_dropdown_unregistered.config(width=21)
+        course_dropdown_unregistered.grid(row=6, column=4, columnspan = 2, padx=20, pady=5)
 
     submit__email = tk.Button(register_tab, text="Choose", command=submit_email_unregister)
     submit__email.grid(row=4, column=5, pady=10)
@@ -346,32 +343,63 @@ def create_register_tab(notebook):
         """
         roleVar = role_var_unregistered.get()
         email = selected_name_unregistered.get()
-        course_ID = selected_course_unregistered.get()
+        course_ID = unregister_courses.get(selected_course_unregistered.get())
+        if course_ID is None:
+            return
 
-        conn = sqlite3.connect('school_management.db')
-        cursor = conn.cursor()
         if roleVar == "Student":
-            cursor.execute('''
-                DELETE FROM registrations
-                WHERE studentEmail = ? AND courseID = ?
-            ''', (email, course_ID))
-        elif roleVar == "Instructor":
-            cursor.execute('''
-                UPDATE courses
-                SET instructor = ?
-                WHERE courseID = ?  
-            ''', ("", course_ID))
-
-        conn.commit()
-        conn.close()
+            tasks.run(None, Course.unregister_student, course_ID, email, on_result=lambda _: unregistration_done())
+        if roleVar == "Instructor":
+            tasks.run(None, Course.assign_instructor, course_ID, "", on_result=lambda _: unregistration_done())
 
+    # THIS FUNCTION CLEARS THE UNREGISTRATION FORM ONCE THE CHANGE IS SAVED
+    def unregistration_done():
+        tasks.cancel("unregister courses")
         selected_name_unregistered.set("")  
         selected_course_unregistered.set("")  
-        return 
 
     submit_unregistration_course = tk.Button(register_tab, text="Unregister", command=submit_course_unregistration)
     submit_unregistration_course.grid(row=6, column=5, columnspan=2, pady=10)
 
+    # THIS FUNCTION APPLIES THE STUDENTS/INSTRUCTORS ADDED, CHANGED OR DELETED TO THE EMAIL DROPDOWNS
+    def people_changed(change):
+        """
+        Applies a change of a student or instructor (published on the change bus) to the
+        emails of its role and to the email dropdowns showing that role.
+
+        Parameters:
+        ----------
+            change (Events.Change): The change published by the models.
+        """
+        role = "Student" if change.entity == "student" else "Instructor"
+        if not apply_to_list(people[role], change, 'email'):
+            reload_people(role)
+            return
+        if role_var.get() == role:
+            register_emails.apply(change, 'email')
+        if role_var_unregistered.get() == role:
+            unregister_emails.apply(change, 'email')
+
+    # THIS FUNCTION READS AGAIN THE COURSES OF THE CHOSEN PEOPLE WHEN THEY CHANGE
+    def courses_changed(change):
+        """
+        Updates the course dropdowns when a change of a course or registration (published on
+        the change bus) alters the courses of the chosen student or instructor.
+
+        Parameters:
+        ----------
+            change (Events.Change): The change published by the models.
+        """
+        if selected_name.get() and affects_courses_of(change, selected_name.get()):
+            submit_email()
+        if selected_name_unregistered.get() and affects_courses_of(change, selected_name_unregistered.get()):
+            submit_email_unregister()
+
+    subscribe_widget(register_tab, people_changed, 'student', 'instructor')
+    subscribe_widget(register_tab, courses_changed, 'course', 'registration')
+    for role in people:
+        reload_people(role)
+
     '''# THIS FUNCTIONS REGISTERS A COURSE 
     def submit_course_registration():
         roleVar = role_var.get()
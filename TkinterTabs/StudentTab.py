@@ -1,7 +1,10 @@
-import sqlite3
 import tkinter as tk
 from tkinter import font
+from Classes.Database import get_connection
 from Classes.Person import Student
+from TkinterTabs.Changes import OptionList, subscribe_widget
+from TkinterTabs.ImportDialog import import_from_csv
+from TkinterTabs.Workers import TaskRunner
 
 def create_student_tab(notebook):
     """
@@ -16,6 +19,8 @@ def create_student_tab(notebook):
     """
     student_tab = tk.Frame(notebook)
     notebook.add(student_tab, text="Student")
+    # the database work of the tab runs on background threads (see Workers.TaskRunner)
+    tasks = TaskRunner(student_tab)
 
     # THIS PART IS FOR CREATING NEW STUDENTS IN DATABASE
     bold_font = font.Font(size=14, weight="bold")
@@ -55,17 +60,24 @@ def create_student_tab(notebook):
         email = email_entry.get()
         studentID = int(ID_entry.get())
         #Student.create_student(name, age, email, studentID).save_to_file()  
-        Student.create_student(name, age, email, studentID).save_to_db()  
+        tasks.run(None, lambda: Student.create_student(name, age, email, studentID).save_to_db(),
+                  on_result=lambda _: student_submitted(name, age, email, studentID))
+
+    # THIS FUNCTION CLEARS THE FORM ONCE THE NEW STUDENT IS SAVED
+    def student_submitted(name, age, email, studentID):
         name_entry.delete(0, tk.END)
         age_entry.delete(0, tk.END)
         email_entry.delete(0, tk.END)
         ID_entry.delete(0, tk.END)
-        dropdown_refresh()      
         print(f"Student Submitted: {name}, {age}, {email}, {studentID}")
     
     submit_button_student = tk.Button(student_tab, text="Create", command=submit_form_student)
     submit_button_student.grid(row=6, column=1, columnspan=2, pady=10)
 
+    # import many students at once from a CSV file
+    import_button_student = tk.Button(student_tab, text="Import CSV", command=lambda: import_from_csv(student_tab, "students"))
+    import_button_student.grid(row=7, column=1, columnspan=2, pady=10)
+
 # --------------------------------------------------------------------------------------------------------
 
     # THIS PART IS TO VIEW/EDIT/DELETE INFORMATION OF STUDENT IN DATABASE
@@ -76,29 +88,23 @@ def create_student_tab(notebook):
     selected_email = tk.StringVar(value="")
     
     students_dropdown = tk.OptionMenu(student_tab, selected_email, "No students in database")
+    students_dropdown.config(width=21)
+    students_dropdown.grid(row=2, column=4, padx=20, pady=5, sticky="W")
 
-    # THIS FUNCTION REFRESHES THE DROPDOWN MENY WITH STUDENT EMAIL
-    def dropdown_refresh():
+    # THIS FUNCTION RETURNS THE EMAILS OF EVERY STUDENT IN THE DATABASE
+    def load_emails():
         """
-        Refreshes the dropdown menu with the latest list of students' emails.
-
-        This function retrieves the email addresses of all students from the database and 
-        updates the dropdown menu with the latest data. If no students are found, a placeholder 
-        message is displayed.
+        Returns the email addresses of all students in the database, listed in the dropdown menu.
         """
-        conn = sqlite3.connect('school_management.db')
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute('SELECT email FROM students')
-        students = cursor.fetchall()
-        conn.close()
-        students_email = [student[0] for student in students]
-        if students_email:
-            students_dropdown = tk.OptionMenu(student_tab, selected_email, *students_email)
-        else:
-            students_dropdown = tk.OptionMenu(student_tab, selected_email, "No students in database")
-        students_dropdown.config(width=21)
-        students_dropdown.grid(row=2, column=4, padx=20, pady=5, sticky="W")
-    dropdown_refresh()
+        return [row[0] for row in cursor.fetchall()]
+
+    # the dropdown is filled once; after that only the students added, changed or deleted
+    # (published on the change bus by the models) are applied to it
+    student_emails = OptionList(students_dropdown, selected_email, "No students in database", load_emails, tasks)
+    subscribe_widget(student_tab, lambda change: student_emails.apply(change, 'email'), 'student')
     
     # THIS CLASS ALLOWS STUDENTS TO MODIFY/DELETE THEIR INFORMATIONS
     class EditDialog(tk.Toplevel):
@@ -112,42 +118,41 @@ def create_student_tab(notebook):
         Parameters:
         ----------
             parent (tk.Widget): The parent widget that opens the dialog.
-            student_ID (int): The unique ID of the student whose information is being edited.
+            student (Student): The student whose information is being edited.
             selected_email_var (tk.StringVar): A Tkinter StringVar used to hold the selected student's email from the dropdown.
             students_dropdown (tk.OptionMenu): The dropdown menu displaying the list of student emails.
         """
-        def __init__(self, parent, student_ID, selected_email_var, students_dropdown):
+        def __init__(self, parent, student, selected_email_var, students_dropdown):
             super().__init__(parent)
             self.dropdown_menu = students_dropdown
             self.selected_email_var = selected_email_var
-            self.studentID = student_ID
-            
-            conn = sqlite3.connect('school_management.db')
-            cursor = conn.cursor()
+            self.studentID = student.studentID
+            # the buttons can't be pressed again while the change is being saved
+            self.tasks = TaskRunner(self, on_busy=self.set_busy)
             self.title("Edit Student")
             tk.Label(self, text="Name:").grid(row=0, column=0, padx=10, pady=10)
             self.name_entry = tk.Entry(self)
             self.name_entry.grid(row=0, column=1, padx=10, pady=10)
-            cursor.execute('SELECT name FROM students WHERE studentID = ?', (student_ID))
-            existing_name = cursor.fetchone()
-            self.name_entry.insert(0, existing_name)
+            self.name_entry.insert(0, student.name)
             tk.Label(self, text="Age:").grid(row=1, column=0, padx=10, pady=10)
             self.age_entry = tk.Entry(self)
             self.age_entry.grid(row=1, column=1, padx=10, pady=10)
-            cursor.execute('SELECT age FROM students WHERE studentID = ?', (student_ID))
-            existing_age = cursor.fetchone()
-            self.age_entry.insert(0, existing_age)
+            self.age_entry.insert(0, student.age)
             tk.Label(self, text="Email:").grid(row=2, column=0, padx=10, pady=10)
             self.email_entry = tk.Entry(self)
             self.email_entry.grid(row=2, column=1, padx=10, pady=10)
-            cursor.execute('SELECT email FROM students WHERE studentID = ?', (student_ID))
-            existing_email = cursor.fetchone()
-            self.email_entry.insert(0, existing_email)
+            self.email_entry.insert(0, student.email)
 
             modify_button = tk.Button(self, text="Save", command=self.modify)
             modify_button.grid(row=3, column=1, padx=10, pady=10)
             delete_button = tk.Button(self, text="Delete", command=self.delete)
             delete_button.grid(row=3, column=0, padx=10, pady=10)
+            self.buttons = (modify_button, delete_button)
+
+        # THIS METHOD DISABLES THE BUTTONS WHILE A CHANGE IS BEING SAVED
+        def set_busy(self, busy):
+            for button in self.buttons:
+                button.configure(state="disabled" if busy else "normal")
         
         # THIS METHOD EDITS/KEEPS THE INFORMATION OF THE STUDENT
         def modify(self):
@@ -160,38 +165,10 @@ def create_student_tab(notebook):
             updated, and the dialog is closed.
             """
             studentID = self.studentID 
-            conn = sqlite3.connect('school_management.db')
-            cursor = conn.cursor()
             if isinstance(studentID, tuple):
                 studentID = studentID[0]
-            if self.name_entry.get():
-                cursor.execute('''
-                UPDATE students
-                SET name = ?
-                WHERE studentID = ?
-                ''', (self.name_entry.get(), studentID))
-            if self.age_entry.get():
-                cursor.execute('''
-                UPDATE students
-                SET age = ?
-                WHERE studentID = ?
-                ''', (self.age_entry.get(), studentID))
-            if self.email_entry.get():
-                # check that the new email isn't already taken by another student
-                cursor.execute('SELECT email FROM students WHERE email = ? AND studentID != ?', (self.email_entry.get(), studentID))
-                existing_email = cursor.fetchone()
-                if existing_email:
-                    conn.close()
-                    raise ValueError("Student email already taken")
-                cursor.execute('''
-                UPDATE students
-                SET email = ?
-                WHERE studentID = ?
-                ''', (self.email_entry.get(), studentID))
-            conn.commit()
-            conn.close()
-            self.update_dropdown()
-            self.destroy()
+            self.tasks.run(None, Student.update_in_db, studentID, self.name_entry.get(), self.age_entry.get(),
+                           self.email_entry.get(), on_result=lambda _: self.saved())
 
         # THIS METHOD DELETES EXISTING STUDENT FROM THE FILE
         def delete(self):
@@ -203,22 +180,20 @@ def create_student_tab(notebook):
             """
             studentID = self.studentID
             #self.student.delete_from_file()
-            Student.delete_from_db(studentID)  
-            self.update_dropdown() 
+            self.tasks.run(None, Student.delete_from_db, studentID, on_result=lambda _: self.saved())
+
+        # THIS METHOD CLOSES THE DIALOG ONCE THE CHANGE IS SAVED
+        def saved(self):
+            self.update_dropdown()
             self.destroy()
 
         # THIS METHOD UPDATES DROPDOWN MENU AFTER CHANGES OCCUR
         def update_dropdown(self):
             """
-            Updates the student email dropdown menu.
-
-            This method clears the current selection in the dropdown menu and refreshes it 
-            with the updated list of student emails after modifying or deleting a student.
+            Clears the selection of the student dropdown menu after modifying or deleting
+            a student. The entries themselves are updated from the change bus.
             """
             self.selected_email_var.set("")
-            menu = self.dropdown_menu["menu"]
-            menu.delete(0, "end")
-            dropdown_refresh()
 
     # THIS FUNCTIONS OPENS THE EDIT WINDOW WHERE STUDENT CAN EDIT HIS INFORMATION
     def edit_student():
@@ -229,12 +204,21 @@ def create_student_tab(notebook):
         dropdown menu and opens the `EditDialog` to allow the user to view and edit the 
         student's information.
         """
-        conn = sqlite3.connect('school_management.db')
+        # the student is read in the background, the window opens once it is found
+        tasks.run('edit', find_student, selected_email.get(), on_result=open_edit_dialog)
+
+    # THIS FUNCTION RETURNS THE STUDENT WITH AN EMAIL (None if there is none)
+    def find_student(email):
+        conn = get_connection()
         cursor = conn.cursor()
-        email = selected_email.get()
         cursor.execute('SELECT studentID FROM students WHERE email = ?', (email,))
-        student_ID = cursor.fetchone()
-        EditDialog(None, student_ID, selected_email, students_dropdown)
+        row = cursor.fetchone()
+        return Student.get_by_id(row[0]) if row else None
+
+    # THIS FUNCTION OPENS THE EDIT WINDOW OF THE STUDENT FOUND
+    def open_edit_dialog(student):
+        if student is not None:
+            EditDialog(None, student, selected_email, students_dropdown)
 
     edit_button = tk.Button(student_tab, text="View Information", command=edit_student)
     edit_button.grid(row=3, column=4, pady=10)
@@ -1,9 +1,21 @@
-import sqlite3
 import tkinter as tk
 from tkinter import ttk
 from tkinter import font
-from Classes.Course import Course
-from Classes.Person import Student, Instructor
+from collections import deque
+from itertools import islice
+from Classes.Roster import ROSTERS, iter_roster_pages, roster_edits
+from Classes.Search import DEBOUNCE_MS, IncrementalSearch
+from TkinterTabs.Changes import subscribe_widget
+from TkinterTabs.Workers import STREAM_EXECUTOR, TaskRunner
+
+# NUMBER OF ROWS READ FROM THE DATABASE PER QUERY WHEN SCROLLING THROUGH A TABLE
+PAGE_SIZE = 100
+
+# MAXIMUM NUMBER OF ROWS INSERTED IN A TREEVIEW PER CALLBACK OF THE EVENT LOOP
+CHUNK_SIZE = 200
+
+# NUMBER OF ROWS INSERTED AHEAD OF THE SCROLLED POSITION
+RENDER_AHEAD = 300
 
 def create_viewall_tab(notebook):
     """
@@ -37,6 +49,227 @@ def create_viewall_tab(notebook):
     viewall_tab.grid_columnconfigure(1, weight=1)  
     viewall_tab.grid_columnconfigure(2, weight=1)  
 
+# THIS FUNCTION RETURNS THE VALUES SHOWN IN THE TREEVIEW FOR A ROSTER ROW
+def row_values(row):
+    """
+    Returns the values shown for a roster row, with "None" when there are no related courses or students
+    and an empty cell for a NULL value (e.g. a course without instructor).
+    """
+    return tuple("" if value is None else value for value in row[:-1]) + (row[-1] or "None",)
+
+# THIS CLASS FILLS A TREEVIEW IN SMALL BATCHES WITHOUT FREEZING THE WINDOW
+class TreeviewFiller:
+    """
+    Fills a treeview from a stream of rows without blocking the Tk event loop.
+
+    The stream is read `CHUNK_SIZE` rows at a time on a background thread (always the
+    same one, see `Workers.STREAM_EXECUTOR`), and the rows read are inserted at most
+    `CHUNK_SIZE` at a time from callbacks scheduled with `after()`, so the window keeps
+    responding while a large table is read and shown. Only the rows up to the scrolled
+    position plus `RENDER_AHEAD` are turned into treeview items; the next ones are
+    inserted when the view is scrolled close to the last one. Showing a new stream
+    (e.g. a new search) aborts the one being read and inserted. The rows a change of
+    the change bus alters are read in the background as well and applied to the rows
+    read so far with `apply_change`, without reading the stream again.
+
+    Parameters:
+    ----------
+        tree (ttk.Treeview): The treeview to fill.
+        on_outdated (callable): Called when a change can alter any row and the stream
+            must be shown again (optional).
+    """
+    def __init__(self, tree, on_outdated=None):
+        self.tree = tree
+        self.on_outdated = on_outdated
+        self.tasks = TaskRunner(tree, executor=STREAM_EXECUTOR)
+        self.reading = False
+        # changes waiting to be applied, one at a time, and a counter of the edits of the rows
+        self.changes = deque()
+        self.version = 0
+        self.source = None
+        self.order_by = None
+        self.items = []
+        self.rows = []
+        self.pending = deque()
+        self.prefetch = False
+        self.inserted = 0
+        self.wanted = 0
+        self.after_id = None
+        tree.configure(yscrollcommand=self.on_scroll)
+        tree.bind("<Destroy>", lambda event: self.cancel(), add="+")
+
+    # THIS METHOD REPLACES THE ROWS OF THE TREEVIEW WITH A NEW STREAM
+    def show(self, rows, prefetch=False, order_by=None):
+        """
+        Empties the treeview and starts filling it with a new stream of rows.
+
+        Parameters:
+        ----------
+            rows (iterable of tuple): The values of the rows to show.
+            prefetch (bool): Whether to read the whole stream even past the rows shown
+                (e.g. so a search is complete and can be narrowed) (default is False).
+            order_by (str): The column the rows are ordered by (default is None, the order of a search).
+        """
+        self.cancel()
+        # the chunk and the changes still being read belong to the previous stream
+        self.tasks.cancel()
+        self.reading = False
+        self.changes.clear()
+        self.version += 1
+        self.tree.delete(*self.tree.get_children())
+        self.items = []
+        self.rows = []
+        self.source = iter(rows)
+        self.order_by = order_by
+        self.prefetch = prefetch
+        self.inserted = 0
+        self.wanted = RENDER_AHEAD
+        self.schedule()
+
+    # THIS METHOD STOPS READING AND INSERTING THE CURRENT STREAM
+    def cancel(self):
+        """
+        Stops filling the treeview; the rows already inserted stay.
+        """
+        if self.after_id is not None:
+            self.tree.after_cancel(self.after_id)
+            self.after_id = None
+        self.source = None
+        self.pending.clear()
+
+    def schedule(self):
+        if self.after_id is None:
+            self.after_id = self.tree.after(1, self.step)
+
+    # THIS METHOD STARTS READING ONE BATCH OF ROWS AND INSERTS ONE BATCH OF THE ROWS READ
+    def step(self):
+        self.after_id = None
+        missing = self.wanted - self.inserted
+        if self.source is not None and not self.reading and (self.prefetch or len(self.pending) < missing):
+            self.reading = True
+            source = self.source
+            self.tasks.run('read', lambda: list(islice(source, CHUNK_SIZE)), on_result=self.chunk_read)
+        for _ in range(min(CHUNK_SIZE, missing, len(self.pending))):
+            row = self.pending.popleft()
+            self.items.append(self.tree.insert("", "end", values=row))
+            self.rows.append(row)
+            self.inserted += 1
+        if self.pending and self.inserted < self.wanted:
+            self.schedule()
+
+    # THIS METHOD QUEUES A BATCH OF ROWS READ IN THE BACKGROUND FOR INSERTION
+    def chunk_read(self, rows):
+        self.reading = False
+        self.pending.extend(rows)
+        self.version += 1
+        if len(rows) < CHUNK_SIZE:
+            self.source = None
+        if ((self.source is not None and (self.prefetch or len(self.pending) < self.wanted - self.inserted))
+                or (self.pending and self.inserted < self.wanted)):
+            self.schedule()
+
+    # THIS METHOD APPLIES A CHANGE OF THE CHANGE BUS TO THE ROWS READ SO FAR
+    def apply_change(self, kind, change):
+        """
+        Updates, removes or inserts the rows of a roster a change altered, both among the
+        treeview items and the rows read but not inserted yet (see `Roster.roster_edits`).
+
+        The changed rows are read in the background, one change after the other, and read
+        again if the rows were changed meanwhile. `on_outdated` is called instead when the
+        change can alter any row and the roster must be shown again.
+
+        Parameters:
+        ----------
+            kind (str): The roster shown ('students', 'instructors' or 'courses').
+            change (Events.Change): The change published by the models.
+        """
+        self.changes.append((kind, change))
+        if len(self.changes) == 1:
+            self.read_change()
+
+    # THIS METHOD READS THE ROWS ALTERED BY THE FIRST CHANGE WAITING
+    def read_change(self):
+        kind, change = self.changes[0]
+        version = self.version
+        self.tasks.run('change', roster_edits, kind, self.rows + list(self.pending), change, self.order_by,
+                       False, self.source is None, on_result=lambda edits: self.change_read(edits, version))
+
+    # THIS METHOD APPLIES THE EDITS OF A CHANGE, UNLESS THE ROWS CHANGED WHILE THEY WERE READ
+    def change_read(self, edits, version):
+        if version != self.version:
+            self.read_change()
+            return
+        self.changes.popleft()
+        if edits is None:
+            if self.on_outdated is not None:
+                self.on_outdated()
+        else:
+            self.apply_edits(edits)
+        if self.changes:
+            self.read_change()
+
+    def apply_edits(self, edits):
+        self.version += 1
+        for edit in edits:
+            index = edit[1]
+            values = row_values(edit[2]) if len(edit) > 2 else None
+            # the rows past the last item are still waiting to be inserted
+            if index > len(self.items) or (index == len(self.items) and (self.pending or edit[0] != 'insert')):
+                index -= len(self.items)
+                if edit[0] == 'update':
+                    self.pending[index] = values
+                elif edit[0] == 'delete':
+                    del self.pending[index]
+                else:
+                    self.pending.insert(index, values)
+            elif edit[0] == 'update':
+                self.tree.item(self.items[index], values=values)
+                self.rows[index] = values
+            elif edit[0] == 'delete':
+                self.tree.delete(self.items.pop(index))
+                del self.rows[index]
+                self.inserted -= 1
+            else:
+                self.items.insert(index, self.tree.insert("", index, values=values))
+                self.rows.insert(index, values)
+                self.inserted += 1
+
+    # THIS METHOD INSERTS MORE ROWS WHEN THE VIEW IS SCROLLED CLOSE TO THE LAST ONE
+    def on_scroll(self, first, last):
+        if float(last) >= 0.9 and (self.pending or self.source is not None):
+            self.wanted = max(self.wanted, self.inserted + RENDER_AHEAD)
+            self.schedule()
+
+# THIS FUNCTION RUNS A SEARCH ONLY ONCE THE USER HAS STOPPED TYPING
+def debounce_search(widget, search_var, searcher, update_treeview):
+    """
+    Makes a search box run its search only once the user has stopped typing.
+
+    Every keystroke cancels the search still being shown and reschedules the new one
+    `DEBOUNCE_MS` milliseconds later, so typing a word runs one search instead of one
+    per character.
+
+    Parameters:
+    ----------
+        widget (tk.Widget): The widget used to schedule the search.
+        search_var (tk.StringVar): The variable of the search box.
+        searcher (IncrementalSearch): The search of the view, cancelled on every keystroke.
+        update_treeview (callable): The function filling the treeview for a query.
+    """
+    pending = {'after': None}
+
+    def run():
+        pending['after'] = None
+        update_treeview(search_var.get())
+
+    def schedule(*args):
+        searcher.cancel()
+        if pending['after'] is not None:
+            widget.after_cancel(pending['after'])
+        pending['after'] = widget.after(DEBOUNCE_MS, run)
+
+    search_var.trace("w", schedule)
+
 # THIS FUNCTION ALLOWS USER TO VIEW ALL INSTRUCTORS
 def view_instructors(viewall_tab):
     """
@@ -69,58 +302,25 @@ def view_instructors(viewall_tab):
     tree.column("instructorID", width=100)
     tree.column("assigned_courses", width=150)
     tree.grid(row=2, column=0, columnspan=3, padx=20, pady=20, sticky='nsew')
+    searcher = IncrementalSearch("instructors")
+    filler = TreeviewFiller(tree, on_outdated=lambda: update_treeview(search_var.get()))
     def update_treeview(search_query):
-        tree.delete(*tree.get_children()) 
-        instructors = Instructor.load_from_db() 
-        courses = Course.load_from_db() 
-        for instructor in instructors:
-            course_instructor = []
-            for course in courses:
-                if course.instructor == instructor.email:
-                    course_instructor.append(course.courseName)  
-            courseInstructor = ", ".join(course_instructor) if course_instructor else "None"
-            if (search_query.lower() in instructor.name.lower() or
-                search_query.lower() in instructor.email.lower() or
-                search_query.lower() in courseInstructor.lower()):
-                tree.insert("", "end", values=(instructor.name, instructor.age, instructor.email, instructor.instructorID, courseInstructor))
-    search_var.trace("w", lambda name, index, mode: update_treeview(search_var.get()))
+        # without a search, rows are read page by page as the user scrolls
+        if not search_query:
+            searcher.reset()
+            filler.show(map(row_values, iter_roster_pages("instructors", "name", page_size=PAGE_SIZE)), order_by="name")
+            return
+        # matches come from the full-text index, best match first; the whole result is
+        # read so the next keystroke can narrow it
+        filler.show(map(row_values, searcher.search(search_query)), prefetch=True)
+    debounce_search(viewall_tab, search_var, searcher, update_treeview)
+    # the rows changed through the models are applied as they are published
+    def apply_change(change):
+        searcher.forget()
+        filler.apply_change("instructors", change)
+    subscribe_widget(tree, apply_change, *ROSTERS["instructors"]["entities"])
     update_treeview("")
 
-# THIS FUNCTIONS RETURNS THE NAME OF THE COURSES THAT THE STUDENT IS TAKING
-def get_student_courses(email):
-    """
-    Retrieves the names of the courses a student is registered for.
-
-    This function queries the database to get all course IDs associated with a specific student,
-    and then fetches the corresponding course names.
-
-    Parameters:
-    ----------
-        email (str): The email address of the student.
-
-    Returns:
-    -------
-        list of str: A list of course names the student is registered for.
-    """
-    conn = sqlite3.connect('school_management.db')
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT courseID FROM registrations WHERE studentEmail = ?
-    ''', (email,))
-    course_ids = cursor.fetchall()  
-    course_ids = [course_id[0] for course_id in course_ids]  
-    if course_ids:
-        query = 'SELECT courseName FROM courses WHERE courseID IN ({})'.format(
-        ','.join('?' * len(course_ids))
-        )
-        cursor.execute(query, course_ids)
-        courses = cursor.fetchall()
-        course_names = [course[0] for course in courses] 
-    else:
-        course_names = [] 
-    conn.close()
-    return course_names
-
 # THIS FUNCTION ALLOWS USER TO VIEW ALL STUDENTS
 def view_students(viewall_tab):
     """
@@ -153,17 +353,23 @@ def view_students(viewall_tab):
     tree.column("studentID", width=100)
     tree.column("registered_courses", width=150)
     tree.grid(row=2, column=0, columnspan=3, padx=20, pady=20, sticky='nsew')
+    searcher = IncrementalSearch("students")
+    filler = TreeviewFiller(tree, on_outdated=lambda: update_treeview(search_var.get()))
     def update_treeview(search_query):
-        tree.delete(*tree.get_children()) 
-        students = Student.load_from_db()  
-        for student in students:
-            registered_courses = get_student_courses(student.email)  
-            registered_courses_str = ", ".join(registered_courses) if registered_courses else "None"  
-            if (search_query.lower() in student.name.lower() or
-                search_query.lower() in student.email.lower() or
-                search_query.lower() in registered_courses_str.lower()):
-                tree.insert("", "end", values=(student.name, student.age, student.email, student.studentID, registered_courses_str))
-    search_var.trace("w", lambda name, index, mode: update_treeview(search_var.get()))
+        # without a search, rows are read page by page as the user scrolls
+        if not search_query:
+            searcher.reset()
+            filler.show(map(row_values, iter_roster_pages("students", "name", page_size=PAGE_SIZE)), order_by="name")
+            return
+        # matches come from the full-text index, best match first; the whole result is
+        # read so the next keystroke can narrow it
+        filler.show(map(row_values, searcher.search(search_query)), prefetch=True)
+    debounce_search(viewall_tab, search_var, searcher, update_treeview)
+    # the rows changed through the models are applied as they are published
+    def apply_change(change):
+        searcher.forget()
+        filler.apply_change("students", change)
+    subscribe_widget(tree, apply_change, *ROSTERS["students"]["entities"])
     update_treeview("")
 
 # THIS FUNCTION ALLOWS USER TO VIEW ALL COURSES
@@ -196,16 +402,22 @@ def view_courses(viewall_tab):
     tree.column("instructor", width=150)
     tree.column("enrolled_students", width=150)
     tree.grid(row=2, column=0, columnspan=3, padx=20, pady=20, sticky='nsew')
+    searcher = IncrementalSearch("courses")
+    filler = TreeviewFiller(tree, on_outdated=lambda: update_treeview(search_var.get()))
     def update_treeview(search_query):
-        tree.delete(*tree.get_children())  
-        courses = Course.load_from_db() 
-        for course in courses:
-            enrolled_students = course.get_students_for_course(course.courseID) 
-            enrolled_students_str = ", ".join(enrolled_students) if enrolled_students else "None"  
-            if (search_query.lower() in course.courseName.lower() or
-                search_query.lower() in course.instructor.lower() or
-                search_query.lower() in enrolled_students_str.lower()):
-                tree.insert("", "end", values=(course.courseName, course.courseID, course.instructor, enrolled_students_str))
-    search_var.trace("w", lambda name, index, mode: update_treeview(search_var.get()))
+        # without a search, rows are read page by page as the user scrolls
+        if not search_query:
+            searcher.reset()
+            filler.show(map(row_values, iter_roster_pages("courses", "courseName", page_size=PAGE_SIZE)), order_by="courseName")
+            return
+        # matches come from the full-text index, best match first; the whole result is
+        # read so the next keystroke can narrow it
+        filler.show(map(row_values, searcher.search(search_query)), prefetch=True)
+    debounce_search(viewall_tab, search_var, searcher, update_treeview)
+    # the rows changed through the models are applied as they are published
+    def apply_change(change):
+        searcher.forget()
+        filler.apply_change("courses", change)
+    subscribe_widget(tree, apply_change, *ROSTERS["courses"]["entities"])
     update_treeview("")
 
@@ -0,0 +1,162 @@
+import itertools
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+
+# HOW OFTEN (IN MILLISECONDS) THE RESULTS OF THE BACKGROUND THREADS ARE DELIVERED TO THE TK THREAD
+POLL_MS = 100
+
+# NUMBER OF THREADS RUNNING THE DATABASE WORK OF THE TABS
+MAX_WORKERS = 4
+
+# the threads running the model calls of the tabs (every thread keeps its own pooled connection)
+EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="tk-worker")
+
+# a stream of rows (e.g. a roster read with a cursor kept open) must always be read by the same
+# thread, so the View All tables read their streams on this single thread
+STREAM_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tk-stream")
+
+# functions queued by background threads, called on the Tk thread
+_pending = queue.SimpleQueue()
+_polling = {'widget': None}
+
+# THIS FUNCTION CALLS THE FUNCTIONS QUEUED BY BACKGROUND THREADS
+def _poll(widget):
+    # the next poll is scheduled first, so a failing callback doesn't stop the polling
+    widget.after(POLL_MS, _poll, widget)
+    while True:
+        try:
+            callback, args = _pending.get_nowait()
+        except queue.Empty:
+            break
+        callback(*args)
+
+# THIS FUNCTION STARTS DELIVERING THE RESULTS OF THE BACKGROUND THREADS
+def start_polling(widget):
+    """
+    Starts the `after()` poll delivering the functions queued with `call_soon`, once for
+    the whole application.
+
+    Parameters:
+    ----------
+        widget (tk.Widget): A widget of the application, whose toplevel window runs the poll.
+    """
+    if _polling['widget'] is None:
+        _polling['widget'] = widget.winfo_toplevel()
+        _poll(_polling['widget'])
+
+# THIS FUNCTION QUEUES A FUNCTION TO BE CALLED ON THE TK THREAD
+def call_soon(callback, *args):
+    """
+    Queues a function to be called on the Tk thread by the next poll. Tk widgets can
+    only be used from the Tk thread, so background threads hand their results over
+    with this function. It can be called from any thread.
+
+    Parameters:
+    ----------
+        callback (callable): The function to call.
+        *args: The arguments of the call.
+    """
+    _pending.put((callback, args))
+
+# THIS CLASS RUNS THE DATABASE WORK OF A TAB OFF THE TK THREAD
+class TaskRunner:
+    """
+    Runs the model calls of a tab on a thread pool and hands their results to callbacks
+    on the Tk thread (through `call_soon`), so a slow query or a locked database never
+    blocks the redraws of the window.
+
+    Every task has a name: starting a task cancels the previous one of the same name,
+    whose result is then dropped (e.g. the courses of an email chosen before the current
+    one). Tasks without a name (writes) are never superseded. While a task is pending,
+    the widget shows a busy cursor.
+
+    Parameters:
+    ----------
+        widget (tk.Widget): The widget the tasks work for; the results are dropped once it is destroyed.
+        on_busy (callable): Called with True when the first task starts and False when the
+            last one is over (optional).
+        executor (concurrent.futures.Executor): The threads running the tasks (default is `EXECUTOR`).
+    """
+    def __init__(self, widget, on_busy=None, executor=None):
+        self.widget = widget
+        self.on_busy = on_busy
+        self.executor = executor or EXECUTOR
+        # name -> (token, future) of the task whose result is still wanted
+        self.current = {}
+        self.tokens = itertools.count()
+        self.busy = False
+        start_polling(widget)
+
+    # THIS METHOD RUNS A FUNCTION IN THE BACKGROUND AND PASSES ITS RESULT TO A CALLBACK
+    def run(self, name, function, *args, on_result=None, on_error=None):
+        """
+        Runs a function on the thread pool.
+
+        Parameters:
+        ----------
+            name: The name of the task, which cancels the pending task of the same name
+                (None for a task that is never cancelled).
+            function (callable): The function to call (e.g. a model method).
+            *args: The arguments of the call.
+            on_result (callable): Called on the Tk thread with the result (optional).
+            on_error (callable): Called on the Tk thread with the exception raised
+                (default shows it in a message box).
+        """
+        token = next(self.tokens)
+        if name is None:
+            name = ('unnamed', token)
+        self._drop([name])
+        future = self.executor.submit(function, *args)
+        self.current[name] = (token, future)
+        self.update_busy()
+        future.add_done_callback(lambda future: call_soon(self.done, name, token, future, on_result, on_error))
+
+    # THIS METHOD DROPS THE RESULT OF A PENDING TASK (EVERY PENDING TASK BY DEFAULT)
+    def cancel(self, name=None):
+        """
+        Drops the result of a pending task; a task that hasn't started yet doesn't run.
+
+        Parameters:
+        ----------
+            name: The name of the task (default is None, every task).
+        """
+        self._drop(list(self.current) if name is None else [name])
+        self.update_busy()
+
+    def _drop(self, names):
+        for name in names:
+            task = self.current.pop(name, None)
+            if task is not None:
+                task[1].cancel()
+
+    # THIS METHOD HANDS THE OUTCOME OF A TASK TO ITS CALLBACK, ON THE TK THREAD
+    def done(self, name, token, future, on_result, on_error):
+        task = self.current.get(name)
+        if task is None or task[0] != token:
+            return
+        del self.current[name]
+        # the window may have been closed while the task was running
+        if not self.widget.winfo_exists():
+            return
+        self.update_busy()
+        error = future.exception()
+        if error is not None:
+            (on_error or self.show_error)(error)
+        elif on_result is not None:
+            on_result(future.result())
+
+    # THIS METHOD SHOWS THE BUSY STATE WHILE RESULTS ARE AWAITED
+    def update_busy(self):
+        busy = bool(self.current)
+        if busy == self.busy:
+            return
+        self.busy = busy
+        if self.widget.winfo_exists():
+            self.widget.configure(cursor="watch" if busy else "")
+        if self.on_busy is not None:
+            self.on_busy(busy)
+
+    # THIS METHOD SHOWS THE ERROR RAISED BY A TASK
+    def show_error(self, error):
+        messagebox.showerror("Error", str(error), parent=self.widget)
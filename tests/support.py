@@ -0,0 +1,38 @@
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from Classes import Database
+from Classes.Course import Course
+from Classes.Person import Instructor, Student
+from Classes.Schema import initialize_database
+
+# THIS CLASS RUNS EVERY TEST ON A NEW DATABASE IN A TEMPORARY DIRECTORY
+class DatabaseTestCase(unittest.TestCase):
+    """
+    Test case pointing `Database.DATABASE` to a new, migrated database for every test, with
+    empty entity caches, and putting everything back afterwards.
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.previous_database = Database.DATABASE
+        Database.DATABASE = os.path.join(self.directory, "test.db")
+        for model in (Student, Instructor, Course):
+            model.cache.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_database()
+
+    def tearDown(self):
+        Database.close_connections()
+        for model in (Student, Instructor, Course):
+            model.cache.clear()
+        Database.DATABASE = self.previous_database
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    # THIS METHOD RUNS A MODEL CALL WITHOUT ITS "... saved to the database." OUTPUT
+    def quietly(self, function, *args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return function(*args, **kwargs)
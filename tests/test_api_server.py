@@ -0,0 +1,113 @@
+import http.client
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+from urllib.parse import quote
+
+import ApiServer
+from Classes.Course import Course
+from Classes.Person import Instructor
+from tests.support import DatabaseTestCase
+
+# THESE TESTS CALL THE API OF A SERVER RUNNING ON A TEMPORARY DATABASE
+class ApiServerTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.quietly(Instructor.create_instructor, "Ann", 40, "ann@mail.aub.edu", 1)
+        for courseID in range(1, 6):
+            Course.create_course(courseID, f"Course {courseID}", "ann@mail.aub.edu" if courseID % 2 else None)
+        quiet = mock.patch.object(ApiServer.ApiHandler, 'log_message')
+        quiet.start()
+        self.addCleanup(quiet.stop)
+        self.server = ApiServer.ApiServer(('127.0.0.1', 0), workers=2)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = http.client.HTTPConnection('127.0.0.1', self.server.server_port)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def request(self, method, path, body=None):
+        self.client.request(method, path, body=None if body is None else json.dumps(body),
+                            headers={'Content-Type': 'application/json'})
+        response = self.client.getresponse()
+        return response.status, json.loads(response.read())
+
+    def get(self, path):
+        return self.request('GET', path)
+
+    def test_invalid_after_is_a_bad_request(self):
+        for after in ('abc', '5', '{"a": 1}', '[1, 2]', '[[1]]', '[]'):
+            status, body = self.get(f'/courses?after={quote(after)}')
+            self.assertEqual(status, 400, after)
+            self.assertIn('after', body['error'])
+        self.assertEqual(self.get(f'/courses?order_by=courseName&after={quote("[1]")}')[0], 400)
+        # the courses have no keyset order by instructor
+        self.assertEqual(self.get('/courses?order_by=instructor')[0], 400)
+        self.assertEqual(self.get(f'/registrations?after={quote("[1, 2]")}')[0], 400)
+
+    def test_next_keys_page_through_every_course(self):
+        for order_by in ('courseID', 'courseName'):
+            ids, path = [], f'/courses?limit=2&order_by={order_by}'
+            while path:
+                status, page = self.get(path)
+                self.assertEqual(status, 200)
+                ids.extend(course['courseID'] for course in page['items'])
+                path = page['next'] and f'/courses?limit=2&order_by={order_by}&after={quote(json.dumps(page["next"]))}'
+            self.assertEqual(sorted(ids), [1, 2, 3, 4, 5], order_by)
+
+    def test_unknown_instructor_leaves_the_course_unchanged(self):
+        status, body = self.request('PATCH', '/courses/1', {'courseName': "Algebra", 'instructor': "nobody@mail.aub.edu"})
+        self.assertEqual((status, body['error']), (404, "Instructor email not found"))
+        self.assertEqual(self.get('/courses/1')[1], {'courseID': 1, 'courseName': "Course 1", 'instructor': "ann@mail.aub.edu"})
+        status, body = self.request('PATCH', '/courses/1', {'courseName': "Algebra", 'instructor': None})
+        self.assertEqual((status, body), (200, {'courseID': 1, 'courseName': "Algebra", 'instructor': None}))
+
+
+# THESE TESTS CHECK THAT A SERVER ACCEPTS NO MORE CONNECTIONS THAN IT HAS FREE WORKERS
+class ApiBackpressureTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        quiet = mock.patch.object(ApiServer.ApiHandler, 'log_message')
+        quiet.start()
+        self.addCleanup(quiet.stop)
+        self.server = ApiServer.ApiServer(('127.0.0.1', 0), workers=1)
+        self.accepted = []
+        get_request = self.server.get_request
+        self.server.get_request = lambda: self.accepted.append(get_request()) or self.accepted[-1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.server_close()
+        super().tearDown()
+
+    def get(self, client):
+        client.request('GET', '/courses')
+        response = client.getresponse()
+        response.read()
+        return response.status
+
+    def test_extra_client_waits_in_the_listen_queue(self):
+        kept_alive = http.client.HTTPConnection('127.0.0.1', self.server.server_port)
+        self.assertEqual(self.get(kept_alive), 200)
+        waiting = http.client.HTTPConnection('127.0.0.1', self.server.server_port, timeout=10)
+        waiting.connect()
+        time.sleep(3 * ApiServer.ACCEPT_POLL)
+        # the only worker serves the kept-alive connection: the second one isn't accepted yet
+        self.assertEqual(len(self.accepted), 1)
+        kept_alive.close()
+        self.assertEqual(self.get(waiting), 200)
+        self.assertEqual(len(self.accepted), 2)
+        # a connection left open doesn't keep the server from shutting down
+        start = time.monotonic()
+        self.server.shutdown()
+        self.assertLess(time.monotonic() - start, 3 * ApiServer.ACCEPT_POLL)
+        waiting.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
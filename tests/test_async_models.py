@@ -0,0 +1,85 @@
+import asyncio
+import contextlib
+import gc
+import threading
+import unittest
+import warnings
+
+from Classes import AsyncModels
+from Classes.AsyncModels import AsyncCourses, AsyncStudents, DatabaseExecutor
+from Classes.Course import Course
+from Classes.Person import Student
+from tests.support import DatabaseTestCase
+
+# THESE TESTS ITERATE ASYNCHRONOUSLY WHILE CALLING THE FACADE INSIDE THE LOOPS
+class AsyncIterationTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(1, 31):
+            self.quietly(Student.create_student, f"Student {i}", 20, f"s{i}@mail.aub.edu", i)
+        Course.create_course(1, "Math")
+        self.executor = AsyncModels.executor
+        AsyncModels.executor = DatabaseExecutor(max_concurrency=2)
+
+    def tearDown(self):
+        AsyncModels.executor.shutdown()
+        AsyncModels.executor = self.executor
+        super().tearDown()
+
+    def test_as_many_iterations_as_slots_with_nested_calls(self):
+        async def consume():
+            count = 0
+            async for student in AsyncStudents.iterate(batch_size=5):
+                # a call of the facade made while the iteration is running
+                self.assertIsNotNone(await AsyncCourses.get(1))
+                count += 1
+            return count
+
+        async def main():
+            # more iterations than slots, each one waiting on a nested call
+            return await asyncio.wait_for(asyncio.gather(*(consume() for _ in range(4))), 20)
+
+        self.assertEqual(asyncio.run(main()), [30] * 4)
+
+    # THIS METHOD RUNS A LOOP LEAVING AN ITERATION EARLY, FAILING ON WHAT ITS STREAM THREAD LEAVES BEHIND
+    def run_stopped_early(self, main):
+        errors = []
+        excepthook = threading.excepthook
+        threading.excepthook = errors.append
+        try:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                result = asyncio.run(main())
+                for thread in threading.enumerate():
+                    if thread.name == "async-db-stream":
+                        thread.join(5)
+                        self.assertFalse(thread.is_alive())
+                # a coroutine sent to the closed loop is only reported when it is collected
+                gc.collect()
+        finally:
+            threading.excepthook = excepthook
+        self.assertEqual([repr(error.exc_value) for error in errors], [])
+        self.assertEqual([str(warning.message) for warning in caught], [])
+        return result
+
+    def test_iteration_stopped_early(self):
+        async def main():
+            async for student in AsyncStudents.iterate(batch_size=5):
+                if student.studentID == 7:
+                    break
+            return await asyncio.wait_for(AsyncStudents.get(30), 5)
+
+        self.assertEqual(self.run_stopped_early(main).studentID, 30)
+
+    def test_iteration_closed_early(self):
+        async def main():
+            async with contextlib.aclosing(AsyncStudents.iterate(batch_size=5)) as students:
+                async for student in students:
+                    if student.studentID == 7:
+                        break
+            return await asyncio.wait_for(AsyncStudents.get(30), 5)
+
+        self.assertEqual(self.run_stopped_early(main).studentID, 30)
+
+if __name__ == '__main__':
+    unittest.main()
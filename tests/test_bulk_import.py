@@ -0,0 +1,46 @@
+import threading
+import unittest
+from unittest import mock
+
+from Classes import BulkImport
+from Classes.Database import close_connections
+from Classes.Person import Student
+from tests.support import DatabaseTestCase
+
+# THESE TESTS IMPORT ROWS WHILE ANOTHER DESK CREATES ONE OF THEM
+class ConcurrentImportTest(DatabaseTestCase):
+    def rows(self, ids):
+        return [(line, {'name': f"Student {i}", 'age': "20", 'email': f"s{i}@mail.aub.edu", 'studentID': str(i)})
+                for line, i in enumerate(ids, 2)]
+
+    def test_student_created_during_a_batch(self):
+        errors = []
+
+        def create():
+            try:
+                self.quietly(Student.create_student, "Desk", 30, "desk@mail.aub.edu", 3)
+            except ValueError as e:
+                errors.append(str(e))
+            finally:
+                close_connections()
+
+        desk = threading.Thread(target=create)
+        filter_batch = BulkImport._filter_batch
+
+        def filter_then_create(*args):
+            rows = filter_batch(*args)
+            # another desk creates a student of the batch after it was checked
+            desk.start()
+            desk.join(0.5)
+            return rows
+
+        with mock.patch.object(BulkImport, '_filter_batch', filter_then_create):
+            report = BulkImport.import_rows('students', self.rows(range(1, 6)), profile=None)
+        desk.join(10)
+        # the batch keeps the write lock from the checks on: the desk waits for it and is refused
+        self.assertEqual((report.inserted, report.rejects), (5, []))
+        self.assertEqual(errors, ["Student ID already taken"])
+
+
+if __name__ == '__main__':
+    unittest.main()
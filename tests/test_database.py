@@ -0,0 +1,39 @@
+import contextlib
+import io
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from Classes import Database
+from Classes.Schema import MIGRATIONS, initialize_database, schema_version
+
+# THESE TESTS CHECK THAT THE APPS START UNDER THE READ-ONLY PROFILE
+class ReadOnlyProfileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "test.db")
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.addCleanup(Database.set_profile, Database.PROFILE)
+        Database.set_profile('read-only')
+
+    def initialize(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_database(self.path)
+
+    def test_migrations_run_before_the_profile_refuses_writes(self):
+        self.initialize()
+        self.assertEqual(schema_version(self.path), MIGRATIONS[-1][0])
+        # the pooled connection of the apps still refuses every write
+        with self.assertRaises(sqlite3.OperationalError):
+            with Database.connection(self.path) as conn:
+                conn.execute("INSERT INTO students (name, age, email, studentID) VALUES ('A', 20, 'a@mail.aub.edu', 1)")
+        # an up-to-date database doesn't need a connection accepting writes
+        opened = Database.connection_stats()['opened']
+        self.initialize()
+        self.assertEqual(Database.connection_stats()['opened'], opened)
+
+
+if __name__ == '__main__':
+    unittest.main()
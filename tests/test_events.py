@@ -0,0 +1,40 @@
+import unittest
+
+from Classes.Course import Course
+from Classes.Events import affects_courses_of, subscribe, unsubscribe
+from Classes.Person import Instructor, Student
+from tests.support import DatabaseTestCase
+
+# THESE TESTS CHECK WHICH COURSE CHANGES MAKE THE REGISTER TABS READ THE COURSES OF A PERSON AGAIN
+class AffectsCoursesOfTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.quietly(Student.create_student, "John", 20, "john@mail.aub.edu", 1)
+        self.quietly(Instructor.create_instructor, "Jane", 40, "jane@mail.aub.edu", 1)
+        self.quietly(Instructor.create_instructor, "Jim", 45, "jim@mail.aub.edu", 2)
+        Course.create_course(10, "Math")
+        Course.register_student(10, "john@mail.aub.edu")
+        self.changes = []
+        subscribe(self.changes.append, 'course')
+        self.addCleanup(unsubscribe, self.changes.append)
+
+    def test_rename_affects_every_person(self):
+        # the Register dropdowns show "ID - name": a new name must replace the old label
+        self.quietly(Course.update_in_db, 10, "Algebra")
+        [change] = self.changes
+        for email in ("john@mail.aub.edu", "jane@mail.aub.edu", "jim@mail.aub.edu"):
+            self.assertTrue(affects_courses_of(change, email), email)
+
+    def test_new_instructor_affects_only_the_instructors(self):
+        Course.assign_instructor(10, "jane@mail.aub.edu")
+        Course.assign_instructor(10, "jim@mail.aub.edu")
+        self.assertTrue(affects_courses_of(self.changes[0], "jane@mail.aub.edu"))
+        self.assertFalse(affects_courses_of(self.changes[0], "jim@mail.aub.edu"))
+        self.assertTrue(affects_courses_of(self.changes[1], "jane@mail.aub.edu"))
+        self.assertTrue(affects_courses_of(self.changes[1], "jim@mail.aub.edu"))
+        for change in self.changes:
+            self.assertFalse(affects_courses_of(change, "john@mail.aub.edu"))
+
+
+if __name__ == '__main__':
+    unittest.main()
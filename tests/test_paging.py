@@ -0,0 +1,49 @@
+import unittest
+
+from Classes import Database, Roster
+from Classes.Course import Course
+from Classes.Person import Instructor, Student
+from tests.support import DatabaseTestCase
+
+# THESE TESTS CHECK THAT EVERY PAGE IS AN INDEX SEEK, NOT A SORT OF THE WHOLE TABLE
+class PagingPlanTest(DatabaseTestCase):
+    # THIS METHOD RETURNS THE QUERY PLAN OF THE QUERIES RUN TO READ THE PAGE AFTER A KEY
+    def plan_of_page(self, model, order_by, descending):
+        key = tuple(0 if column in ('age', 'studentID', 'instructorID', 'courseID') else ''
+                    for column in model.PAGE_KEYS[order_by])
+        conn = Database.get_connection()
+        queries = []
+        conn.set_trace_callback(queries.append)
+        try:
+            model.page_after(key, 10, order_by, descending)
+        finally:
+            conn.set_trace_callback(None)
+        # the traced queries hold their values
+        return [step[3] for query in queries if query.lstrip().startswith('SELECT')
+                for step in conn.execute('EXPLAIN QUERY PLAN ' + query)]
+
+    def assert_pages_are_seeks(self, model):
+        for order_by in model.PAGE_KEYS:
+            for descending in (False, True):
+                plan = self.plan_of_page(model, order_by, descending)
+                self.assertTrue(plan and all(step.startswith('SEARCH') for step in plan), (order_by, plan))
+
+    def test_students_pages_are_seeks(self):
+        self.assert_pages_are_seeks(Student)
+
+    def test_instructors_pages_are_seeks(self):
+        self.assert_pages_are_seeks(Instructor)
+
+    def test_courses_pages_are_seeks(self):
+        self.assert_pages_are_seeks(Course)
+
+    def test_courses_have_no_order_by_instructor(self):
+        # no index of the courses holds the email of their instructor
+        with self.assertRaises(ValueError):
+            Course.page_after(None, 10, 'instructor')
+        with self.assertRaises(ValueError):
+            Roster.roster('courses', None, 10, 'instructor')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from Classes.Course import Course
+from Classes.Person import Student
+from Classes.Search import IncrementalSearch, search_roster
+from tests.support import DatabaseTestCase
+
+# THESE TESTS CHECK THAT A NARROWED SEARCH FINDS THE SAME ROWS AS A NEW ONE
+class IncrementalSearchTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.quietly(Student.create_student, "John", 20, "john@mail.aub.edu", 1)
+        self.quietly(Student.create_student, "José Smith", 21, "jose_smith@mail.aub.edu", 2)
+        self.quietly(Student.create_student, "Joanna", 22, "joanna@mail.aub.edu", 3)
+        Course.create_course(10, "Math")
+        Course.register_student(10, "john@mail.aub.edu")
+
+    def assert_narrowing_is_fresh(self, kind, queries):
+        searcher = IncrementalSearch(kind)
+        for query in queries:
+            narrowed = list(searcher.search(query))
+            self.assertEqual(narrowed, list(search_roster(kind, query)), query)
+
+    def test_new_term_narrows_like_the_index(self):
+        self.assert_narrowing_is_fresh('students', ["jo", "jo ", "jo math"])
+        searcher = IncrementalSearch('students')
+        list(searcher.search("jo"))
+        self.assertEqual(list(searcher.search("jo math")), [])
+
+    def test_tokenizer_rules_are_the_index_ones(self):
+        # the index folds diacritics and splits words at "_", unlike a \w+ match
+        self.assert_narrowing_is_fresh('students', ["j", "jo", "jos", "jose", "jose s", "jose sm"])
+        self.assert_narrowing_is_fresh('students', ["s", "sm", "smi", "smith"])
+        self.assert_narrowing_is_fresh('courses', ["m", "ma", "math", "math jo"])
+
+
+if __name__ == '__main__':
+    unittest.main()